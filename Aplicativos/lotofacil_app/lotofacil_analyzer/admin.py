@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SorteioLotofacil, ApostaGerada
+from .models import SorteioLotofacil, ApostaGerada, Tarefa
 
 @admin.register(SorteioLotofacil)
 class SorteioLotofacilAdmin(admin.ModelAdmin):
@@ -13,3 +13,10 @@ class ApostaGeradaAdmin(admin.ModelAdmin):
     search_fields = ('usuario__username', 'data_geracao')
     list_filter = ('data_geracao', 'usuario')
     ordering = ('-data_geracao',)  # Ordena por data de geração (mais recente primeiro)
+
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo', 'status', 'progresso', 'usuario', 'criada_em')
+    list_filter = ('status', 'tipo')
+    ordering = ('-criada_em',)
@@ -0,0 +1,9 @@
+# lotofacil_analyzer/analyzers/__init__.py
+from .registry import REGISTRO, ExecutorAnalisadores, registrar
+from .frequency import AnalisadorFrequencia
+from .gap import AnalisadorAtraso
+from .combinations import AnalisadorCombinacoes
+from .seasonality import AnalisadorSazonalidade
+from .geography import AnalisadorGeografico
+from .similarity import AnalisadorSimilaridade
+from .randomness import AnalisadorAleatoriedade
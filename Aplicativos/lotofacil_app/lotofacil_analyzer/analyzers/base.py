@@ -1,12 +1,16 @@
 # lotofacil_analyzer/analyzers/base.py
 from abc import ABC, abstractmethod
 import pandas as pd
+from ..data.jogos import obter_jogo
 from ..models import AnaliseEstatistica  # Remova SorteioLotofacil se não for usado
 
 class AnalisadorBase(ABC):
     """Classe base para todos os analisadores de Lotofácil"""
-    
-    def __init__(self, df=None, arquivo_excel=None, ultimos_n=None):
+
+    # Chaves dos jogos suportados (None = qualquer jogo "K de N")
+    JOGOS = None
+
+    def __init__(self, df=None, arquivo_excel=None, ultimos_n=None, jogo=None):
         """
         Inicializa o analisador.
         
@@ -14,8 +18,15 @@ class AnalisadorBase(ABC):
             df (pd.DataFrame, optional): DataFrame com os dados dos sorteios.
             arquivo_excel (str, optional): Caminho para o arquivo Excel com os dados.
             ultimos_n (int, optional): Analisar apenas os últimos N sorteios.
+            jogo (Jogo | str, optional): Jogo dos sorteios (padrão: Lotofácil).
+
+        Raises:
+            ValueError: Se o analisador não suportar o jogo
         """
         self.nome = self.__class__.__name__
+        self.jogo = obter_jogo(jogo)
+        if not self.suporta_jogo(self.jogo):
+            raise ValueError(f"{self.nome} não suporta o jogo {self.jogo.nome}.")
         
         if df is None:
             if arquivo_excel:
@@ -33,10 +44,15 @@ class AnalisadorBase(ABC):
         
         self.resultados = {}
         
-        # Garantir que a coluna 'numeros' exista
+        # Garantir que a coluna 'numeros' exista sem alterar o DataFrame recebido
         if 'numeros' not in self.df.columns:
-            numeros_colunas = [f'Bola{i}' for i in range(1, 16)]
-            self.df['numeros'] = self.df[numeros_colunas].values.tolist()
+            numeros_colunas = self.jogo.colunas_bolas
+            self.df = self.df.assign(numeros=self.df[numeros_colunas].values.tolist())
+
+    @classmethod
+    def suporta_jogo(cls, jogo):
+        """Indica se o analisador pode analisar os sorteios de um jogo."""
+        return cls.JOGOS is None or obter_jogo(jogo).chave in cls.JOGOS
         
     def _carregar_excel(self, arquivo_excel):
         """
@@ -52,13 +68,13 @@ class AnalisadorBase(ABC):
         df = pd.read_excel(arquivo_excel)
         
         # Verifica se as colunas necessárias existem
-        colunas_necessarias = ['Concurso', 'Data Sorteio'] + [f'Bola{i}' for i in range(1, 16)]
+        colunas_necessarias = ['Concurso', 'Data Sorteio'] + self.jogo.colunas_bolas
         for coluna in colunas_necessarias:
             if coluna not in df.columns:
                 raise ValueError(f"Coluna '{coluna}' não encontrada no arquivo Excel.")
         
         # Converte as colunas de números em uma lista na coluna 'numeros'
-        df['numeros'] = df[[f'Bola{i}' for i in range(1, 16)]].values.tolist()
+        df['numeros'] = df[self.jogo.colunas_bolas].values.tolist()
         
         return df
     
@@ -1,12 +1,14 @@
 # lotofacil_analyzer/analyzers/combinations.py
 from .base import AnalisadorBase
+from .registry import registrar
 from itertools import combinations
 from collections import Counter
 import pandas as pd
 
+@registrar('combinacoes', extras={'probabilidades': 'calcular_probabilidades'})
 class AnalisadorCombinacoes(AnalisadorBase):
-    def __init__(self, df=None, arquivo_excel=None, ultimos_n=None):
-        super().__init__(df, arquivo_excel, ultimos_n)
+    def __init__(self, df=None, arquivo_excel=None, ultimos_n=None, jogo=None):
+        super().__init__(df, arquivo_excel, ultimos_n, jogo)
         
     def analisar(self, tamanhos_combinacoes=[2, 3, 4, 5]):
         """
@@ -1,8 +1,13 @@
 # lotofacil_analyzer/analyzers/frequency.py
 from .base import AnalisadorBase
+from .registry import registrar
+import logging
 import pandas as pd
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+@registrar('frequencia')
 class AnalisadorFrequencia(AnalisadorBase):
     """Analisador de frequência de números (análise 1)"""
     
@@ -12,13 +17,13 @@ class AnalisadorFrequencia(AnalisadorBase):
         if self.df is None or self.df.empty:
             return {"erro": "DataFrame vazio ou não carregado. Verifique os dados fornecidos."}
         
-        # Debug: Exibe informações sobre o DataFrame
-        print("Colunas do DataFrame:", self.df.columns)
-        print("Primeira linha do DataFrame:", self.df.iloc[0])
-        print("Números coletados na primeira linha:", self.df.iloc[0]['numeros'])
+        # Debug: informações sobre o DataFrame (só montadas se o nível DEBUG estiver ativo)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Colunas do DataFrame: %s", list(self.df.columns))
+            logger.debug("Números coletados na primeira linha: %s", self.df.iloc[0]['numeros'])
         
         # Inicializa contadores
-        frequencias = {i: 0 for i in range(1, 26)}
+        frequencias = {i: 0 for i in self.jogo.numeros}
         
         # Conta cada número em cada sorteio
         for _, row in self.df.iterrows():
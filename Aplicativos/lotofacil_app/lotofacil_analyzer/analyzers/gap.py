@@ -1,8 +1,13 @@
 # lotofacil_analyzer/analyzers/gap.py
 from .base import AnalisadorBase
+from .registry import registrar
+import logging
 import pandas as pd
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+@registrar('atraso')
 class AnalisadorAtraso(AnalisadorBase):
     """Analisador de atraso de números (análise 2)"""
     
@@ -12,22 +17,23 @@ class AnalisadorAtraso(AnalisadorBase):
         if self.df is None or self.df.empty:
             return {"erro": "DataFrame vazio ou não carregado. Verifique os dados fornecidos."}
         
-        # Debug: Exibe informações sobre o DataFrame
-        print("\n[DEBUG] Informações do DataFrame:")
-        print("Colunas disponíveis:", list(self.df.columns))
-        print("Total de sorteios:", len(self.df))
-        if not self.df.empty:
-            print("Primeira linha - Concurso:", self.df.iloc[0]['Concurso'])
-            print("Primeira linha - Números:", self.df.iloc[0]['numeros'])
+        # Debug: informações sobre o DataFrame (só montadas se o nível DEBUG estiver ativo)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Colunas disponíveis: %s", list(self.df.columns))
+            logger.debug("Total de sorteios: %d", len(self.df))
+            logger.debug(
+                "Primeira linha - Concurso: %s, números: %s",
+                self.df.iloc[0]['Concurso'], self.df.iloc[0]['numeros'],
+            )
         
         try:
             # Ordena os sorteios do mais recente para o mais antigo
             sorteios_ordenados = self.df.sort_values('Concurso', ascending=False)
             
             # Inicializa o dicionário de atrasos
-            atrasos_atuais = {i: 0 for i in range(1, 26)}
-            historico_atrasos = {i: [] for i in range(1, 26)}
-            ultimo_sorteio = {i: None for i in range(1, 26)}
+            atrasos_atuais = {i: 0 for i in self.jogo.numeros}
+            historico_atrasos = {i: [] for i in self.jogo.numeros}
+            ultimo_sorteio = {i: None for i in self.jogo.numeros}
             
             # Percorre os sorteios e calcula os atrasos
             for idx, row in sorteios_ordenados.iterrows():
@@ -35,12 +41,12 @@ class AnalisadorAtraso(AnalisadorBase):
                 numeros = row['numeros']
                 
                 # Verifica se 'numeros' é uma lista válida
-                if not isinstance(numeros, list) or len(numeros) != 15:
-                    print(f"[ERRO] Linha {idx} tem números inválidos: {numeros}")
+                if not isinstance(numeros, list) or len(numeros) != self.jogo.numeros_por_sorteio:
+                    logger.warning("Linha %s tem números inválidos: %s", idx, numeros)
                     continue
                 
                 # Atualiza o atraso para cada número
-                for num in range(1, 26):
+                for num in self.jogo.numeros:
                     if num in numeros:
                         # Se o número foi sorteado, registra o atraso atual e zera
                         if atrasos_atuais[num] > 0:
@@ -53,7 +59,7 @@ class AnalisadorAtraso(AnalisadorBase):
             
             # Calcula estatísticas dos atrasos históricos
             estatisticas_atrasos = {}
-            for num in range(1, 26):
+            for num in self.jogo.numeros:
                 if historico_atrasos[num]:
                     estatisticas_atrasos[num] = {
                         'media': float(np.mean(historico_atrasos[num])),
@@ -87,9 +93,9 @@ class AnalisadorAtraso(AnalisadorBase):
                 'total_sorteios': len(self.df)
             }
             
-            print("[DEBUG] Análise de atraso concluída com sucesso")
+            logger.debug("Análise de atraso concluída com sucesso")
             return self.resultados
             
         except Exception as e:
-            print(f"[ERRO CRÍTICO] Falha na análise de atraso: {str(e)}")
+            logger.exception("Falha na análise de atraso")
             return {"erro": f"Falha na análise: {str(e)}"}
\ No newline at end of file
@@ -0,0 +1,232 @@
+# lotofacil_analyzer/analyzers/geography.py
+from .base import AnalisadorBase
+from .registry import registrar
+from ..data.locais import (
+    ARRAYS_LOCAIS, COLUNA_GANHADORES, COLUNA_LOCAIS, COLUNA_RATEIO, calcular_locais,
+)
+from ..data.store import obter_armazem
+from ..memoria import CacheLimitado
+import hashlib
+import numpy as np
+import pandas as pd
+
+AGRUPAMENTOS = ('uf', 'cidade')
+
+# Colunas das somas acumuladas por local: premiações, ganhadores e prêmio estimados
+_PREMIACOES, _GANHADORES, _PREMIO = range(3)
+
+# Índices já montados, pela origem dos dados (poucas gerações vivas)
+_INDICES = CacheLimitado()
+
+
+class IndiceGeografico:
+    """
+    Somas acumuladas dos ganhadores por UF e cidade, para consultas por faixa de concursos.
+
+    Os locais de cada agrupamento são ordenados por (código, sorteio); a soma
+    de um código em uma faixa de sorteios é a diferença entre duas posições
+    das somas acumuladas, localizadas por busca binária. Nenhum texto é lido
+    na consulta.
+
+    O arquivo lista cada local uma vez por concurso, mesmo quando ali houve
+    mais de um ganhador, então os ganhadores do concurso são repartidos
+    igualmente entre os locais listados (``ganhadores_estimados``), e o prêmio
+    de cada local é essa parte vezes o rateio.
+    """
+
+    def __init__(self, concursos, locais):
+        """
+        Args:
+            concursos (np.ndarray): Concursos, em ordem crescente
+            locais (dict): Arrays de ``data.locais.calcular_locais``
+        """
+        self.concursos = np.asarray(concursos, dtype=np.int64)
+        self.ufs = [str(uf) for uf in locais['ufs']]
+        self.cidades = [str(cidade) for cidade in locais['cidades']]
+        ganhadores = np.asarray(locais['ganhadores'], dtype=np.float64)
+        rateios = np.nan_to_num(np.asarray(locais['rateios'], dtype=np.float64))
+        sorteio = np.asarray(locais['locais_sorteio'], dtype=np.int64)
+        self.uf = np.asarray(locais['locais_uf'], dtype=np.int64)
+        self.cidade = np.asarray(locais['locais_cidade'], dtype=np.int64)
+        self.sorteio = sorteio
+
+        quantidade = np.bincount(sorteio, minlength=len(self.concursos))
+        peso = ganhadores[sorteio] / quantidade[sorteio]
+        self.valores = np.column_stack([np.ones(len(sorteio)), peso, peso * rateios[sorteio]])
+
+        # Totais por sorteio: ganhadores, prêmio e ganhadores sem local informado
+        por_sorteio = np.column_stack([
+            ganhadores, ganhadores * rateios, np.where(quantidade == 0, ganhadores, 0),
+        ])
+        self.acumulado_sorteios = np.vstack([np.zeros((1, 3)), np.cumsum(por_sorteio, axis=0)])
+        self._grupos = {}
+
+    @classmethod
+    def obter(cls, chave, carregar):
+        """
+        Índice em cache para uma origem de dados.
+
+        Args:
+            chave (str): Identifica a origem (geração do armazém ou impressão do DataFrame)
+            carregar (callable): Retorna (concursos, locais) se o índice não estiver em cache
+        """
+        return _INDICES.obter(chave, lambda: cls(*carregar()))
+
+    def faixa(self, concurso_inicial=None, concurso_final=None):
+        """Posições [início, fim) dos sorteios da faixa de concursos (inclusiva)."""
+        concursos = self.concursos
+        inicio = 0 if concurso_inicial is None else np.searchsorted(concursos, concurso_inicial, 'left')
+        fim = (
+            len(concursos) if concurso_final is None
+            else np.searchsorted(concursos, concurso_final, 'right')
+        )
+        return int(inicio), int(max(inicio, fim))
+
+    def grupos(self, agrupamento):
+        """
+        Locais de um agrupamento ordenados por (código, sorteio), em cache.
+
+        Returns:
+            dict: ``codigos`` presentes, ``chave_ordenada`` (código << 32 |
+            sorteio) e ``acumulado`` dos valores nessa ordem, com uma linha
+            de zeros no início
+        """
+        if agrupamento not in self._grupos:
+            if agrupamento == 'uf':
+                codigos = self.uf
+            elif agrupamento == 'cidade':
+                codigos = self.cidade
+            else:
+                raise ValueError(
+                    f"Agrupamento desconhecido: {agrupamento} (disponíveis: {', '.join(AGRUPAMENTOS)})"
+                )
+            validos = np.flatnonzero(codigos >= 0)
+            ordem = validos[np.lexsort((self.sorteio[validos], codigos[validos]))]
+            self._grupos[agrupamento] = {
+                'codigos': np.unique(codigos[validos]),
+                'chave_ordenada': (codigos[ordem] << 32) + self.sorteio[ordem],
+                'acumulado': np.vstack([np.zeros((1, 3)), np.cumsum(self.valores[ordem], axis=0)]),
+            }
+        return self._grupos[agrupamento]
+
+    def somar(self, agrupamento, inicio, fim):
+        """
+        Soma os valores de cada código nas posições de sorteio [inicio, fim).
+
+        Returns:
+            tuple: (códigos, somas (códigos, 3)) só dos códigos com algum local na faixa
+        """
+        grupos = self.grupos(agrupamento)
+        base = grupos['codigos'] << 32
+        esquerda = np.searchsorted(grupos['chave_ordenada'], base + inicio, side='left')
+        direita = np.searchsorted(grupos['chave_ordenada'], base + fim, side='left')
+        somas = grupos['acumulado'][direita] - grupos['acumulado'][esquerda]
+        presentes = direita > esquerda
+        return grupos['codigos'][presentes], somas[presentes]
+
+    def totais(self, inicio, fim):
+        """Ganhadores, prêmio e ganhadores sem local das posições de sorteio [inicio, fim)."""
+        return self.acumulado_sorteios[fim] - self.acumulado_sorteios[inicio]
+
+
+@registrar('geografia')
+class AnalisadorGeografico(AnalisadorBase):
+    """Ganhadores de 15 acertos e prêmios por UF e por cidade, em qualquer faixa de concursos"""
+
+    JOGOS = ('lotofacil',)
+
+    def indice(self):
+        """
+        Índice geográfico dos sorteios (em cache entre instâncias).
+
+        Com a coluna ``Cidade / UF`` no DataFrame, os locais são explodidos a
+        partir dela; sem ela (DataFrame do armazém), vêm da tabela codificada
+        publicada com a geração, se os concursos forem os mesmos.
+
+        Returns:
+            IndiceGeografico | None: None se não houver locais para estes sorteios
+        """
+        df = self.df.sort_values('Concurso')
+        concursos = df['Concurso'].to_numpy(dtype=np.int64)
+
+        if COLUNA_LOCAIS in df.columns:
+            impressao = hashlib.blake2b(concursos.tobytes(), digest_size=16)
+            colunas = [c for c in (COLUNA_LOCAIS, COLUNA_GANHADORES, COLUNA_RATEIO) if c in df.columns]
+            for coluna in colunas:
+                impressao.update(pd.util.hash_pandas_object(df[coluna], index=False).to_numpy().tobytes())
+            return IndiceGeografico.obter(
+                f'df:{impressao.hexdigest()}', lambda: (concursos, calcular_locais(df)),
+            )
+
+        armazem = obter_armazem()
+        if not armazem.disponivel() or 'locais_sorteio' not in armazem.arrays:
+            return None
+        if not np.array_equal(armazem.arrays['concursos'], concursos):
+            return None
+        arrays = armazem.arrays
+        return IndiceGeografico.obter(
+            f'armazem:{armazem.diretorio}:{armazem.geracao}',
+            lambda: (concursos, {nome: arrays[nome] for nome in ARRAYS_LOCAIS}),
+        )
+
+    def analisar(self, concurso_inicial=None, concurso_final=None, limite=20):
+        """
+        Agrega os ganhadores por UF e cidade na faixa de concursos.
+
+        Args:
+            concurso_inicial, concurso_final (int, optional): Limites da faixa (inclusivos)
+            limite (int): Cidades listadas, das com mais ganhadores (0 para todas)
+
+        Returns:
+            dict: Resumo da faixa, UFs e cidades com premiações (concursos em
+            que o local aparece), ganhadores e prêmio estimados
+        """
+        if self.df is None or self.df.empty:
+            return {"erro": "DataFrame vazio ou não carregado. Verifique os dados fornecidos."}
+
+        indice = self.indice()
+        if indice is None:
+            return {"erro": "Locais dos ganhadores indisponíveis para estes sorteios."}
+
+        inicio, fim = indice.faixa(concurso_inicial, concurso_final)
+        ganhadores, premio, sem_local = indice.totais(inicio, fim)
+
+        ufs = []
+        for codigo, soma in zip(*indice.somar('uf', inicio, fim)):
+            ufs.append({
+                'uf': indice.ufs[codigo],
+                'premiacoes': int(soma[_PREMIACOES]),
+                'ganhadores_estimados': round(float(soma[_GANHADORES]), 2),
+                'premio_estimado': round(float(soma[_PREMIO]), 2),
+            })
+        ufs.sort(key=lambda x: (-x['ganhadores_estimados'], x['uf']))
+
+        codigos, somas = indice.somar('cidade', inicio, fim)
+        ordem = np.lexsort((codigos, -somas[:, _GANHADORES]))
+        if limite:
+            ordem = ordem[:limite]
+        cidades = []
+        for codigo, soma in zip(codigos[ordem], somas[ordem]):
+            rotulo = indice.cidades[codigo]
+            cidades.append({
+                'cidade': rotulo,
+                'uf': rotulo.rpartition('/')[2],
+                'premiacoes': int(soma[_PREMIACOES]),
+                'ganhadores_estimados': round(float(soma[_GANHADORES]), 2),
+                'premio_estimado': round(float(soma[_PREMIO]), 2),
+            })
+
+        self.resultados = {
+            'periodo': {
+                'concurso_inicial': int(indice.concursos[inicio]) if fim > inicio else None,
+                'concurso_final': int(indice.concursos[fim - 1]) if fim > inicio else None,
+                'sorteios': fim - inicio,
+                'ganhadores': int(ganhadores),
+                'premio_total': round(float(premio), 2),
+                'ganhadores_sem_local': int(sem_local),
+            },
+            'ufs': ufs,
+            'cidades': cidades,
+            'total_cidades': int(len(codigos)),
+        }
+        return self.resultados
@@ -0,0 +1,198 @@
+# lotofacil_analyzer/analyzers/randomness.py
+from .base import AnalisadorBase
+from .registry import registrar
+from ..data.bitmask import NUMEROS_POR_SORTEIO, TOTAL_NUMEROS, mascaras_do_df, matriz_incidencia
+from scipy import special, stats
+import numpy as np
+
+TESTES = ('qui_quadrado', 'sequencias', 'correlacao_serial')
+JANELAS_PADRAO = (100, 500)
+JANELA_MINIMA = 10
+
+# Cada número sai em um sorteio com probabilidade 15/25
+_P = NUMEROS_POR_SORTEIO / TOTAL_NUMEROS
+
+# Números em comum entre dois sorteios independentes (hipergeométrica)
+_MEDIA_COMUNS = NUMEROS_POR_SORTEIO * _P
+_VARIANCIA_COMUNS = (
+    NUMEROS_POR_SORTEIO * _P * (1 - _P)
+    * (TOTAL_NUMEROS - NUMEROS_POR_SORTEIO) / (TOTAL_NUMEROS - 1)
+)
+
+
+def _p_bilateral(z):
+    """p-valor bilateral da normal padrão; ``nan`` (variância nula) vira 1."""
+    return np.nan_to_num(special.erfc(np.abs(z) / np.sqrt(2)), nan=1.0)
+
+
+def _dividir(numerador, denominador):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominador > 0, numerador / np.where(denominador > 0, denominador, 1), np.nan)
+
+
+class SomasAcumuladas:
+    """
+    Somas acumuladas por número das estatísticas usadas nos testes.
+
+    Com elas, as contagens de qualquer janela [inicio, fim) saem de duas
+    leituras, e todas as janelas de um tamanho são testadas de uma vez.
+    """
+
+    def __init__(self, mascaras):
+        presente = matriz_incidencia(mascaras).astype(np.int32)
+        self.total = len(presente)
+        zeros = np.zeros((1, TOTAL_NUMEROS), dtype=np.int32)
+        # Linha t: soma dos sorteios [0, t)
+        self.presencas = np.vstack([zeros, np.cumsum(presente, axis=0, dtype=np.int32)])
+        # Linha t: soma dos pares consecutivos (s - 1, s) com 1 <= s <= t
+        self.trocas = np.vstack([
+            zeros, np.cumsum(presente[1:] != presente[:-1], axis=0, dtype=np.int32),
+        ])
+        self.seguidas = np.vstack([
+            zeros, np.cumsum(presente[1:] & presente[:-1], axis=0, dtype=np.int32),
+        ])
+
+    def janelas(self, tamanho, passo=1):
+        """
+        Contagens de todas as janelas de um tamanho, a última terminando no fim do histórico.
+
+        Returns:
+            tuple: (fins exclusivos, presenças, trocas e pares seguidos), as
+            três últimas com forma (janelas, 25)
+        """
+        fins = np.arange(self.total, tamanho - 1, -passo)[::-1]
+        inicios = fins - tamanho
+        return (
+            fins,
+            self.presencas[fins] - self.presencas[inicios],
+            self.trocas[fins - 1] - self.trocas[inicios],
+            self.seguidas[fins - 1] - self.seguidas[inicios],
+        )
+
+
+def testar_janelas(somas, tamanho, passo=1):
+    """
+    Testes de aleatoriedade em todas as janelas de um tamanho.
+
+    - Qui-quadrado: contagem de cada número contra ``tamanho * 15/25``; no
+      geral, com a correção da dependência entre números de um mesmo sorteio
+      (a soma das contagens é fixa), resultando em 24 graus de liberdade.
+    - Sequências (Wald-Wolfowitz): número de sequências de presença/ausência
+      de cada número, dado quantas vezes ele saiu; no geral, a soma sobre
+      os números.
+    - Correlação serial: autocorrelação de defasagem 1 da presença de cada
+      número; no geral, os números em comum entre sorteios seguidos contra a
+      média hipergeométrica (9).
+
+    Returns:
+        dict: ``fins`` (posição exclusiva de cada janela), ``geral`` {teste:
+        p-valores (janelas,)} e ``por_numero`` {teste: p-valores (janelas, 25)}
+    """
+    fins, contagem, trocas, seguidas = somas.janelas(tamanho, passo)
+    contagem = contagem.astype(np.float64)
+    esperado = tamanho * _P
+    variancia = tamanho * _P * (1 - _P)
+
+    desvio = contagem - esperado
+    qui_numero = _p_bilateral(desvio / np.sqrt(variancia))
+    estatistica = (desvio ** 2).sum(axis=1) / variancia * (TOTAL_NUMEROS - 1) / TOTAL_NUMEROS
+    qui_geral = stats.chi2.sf(estatistica, TOTAL_NUMEROS - 1)
+
+    sequencias = trocas + 1
+    uns, zeros = contagem, tamanho - contagem
+    produto = 2 * uns * zeros
+    media = produto / tamanho + 1
+    variancia_seq = produto * (produto - tamanho) / (tamanho ** 2 * (tamanho - 1))
+    seq_numero = _p_bilateral(_dividir(sequencias - media, np.sqrt(np.maximum(variancia_seq, 0))))
+    seq_geral = _p_bilateral(_dividir(
+        (sequencias - media).sum(axis=1), np.sqrt(np.maximum(variancia_seq, 0).sum(axis=1)),
+    ))
+
+    proporcao = contagem / tamanho
+    autocorrelacao = _dividir(seguidas / (tamanho - 1) - proporcao ** 2, proporcao * (1 - proporcao))
+    serial_numero = _p_bilateral(autocorrelacao * np.sqrt(tamanho))
+    comuns = seguidas.sum(axis=1)
+    pares = tamanho - 1
+    serial_geral = _p_bilateral((comuns - _MEDIA_COMUNS * pares) / np.sqrt(_VARIANCIA_COMUNS * pares))
+
+    return {
+        'fins': fins,
+        'geral': {
+            'qui_quadrado': qui_geral,
+            'sequencias': seq_geral,
+            'correlacao_serial': serial_geral,
+        },
+        'por_numero': {
+            'qui_quadrado': qui_numero,
+            'sequencias': seq_numero,
+            'correlacao_serial': serial_numero,
+        },
+    }
+
+
+@registrar('aleatoriedade')
+class AnalisadorAleatoriedade(AnalisadorBase):
+    """Bateria de testes de aleatoriedade em janelas deslizantes de tamanhos configuráveis"""
+
+    JOGOS = ('lotofacil',)
+
+    def analisar(self, janelas=JANELAS_PADRAO, passo=1, alfa=5, por_numero=0):
+        """
+        Testa as janelas deslizantes de cada tamanho.
+
+        Args:
+            janelas (int | list): Tamanhos das janelas, em sorteios
+            passo (int): Distância entre janelas consecutivas (1 = todas)
+            alfa (int): Nível de significância, em porcentagem
+            por_numero (int): Se 1, inclui as séries de p-valores de cada número
+
+        Returns:
+            dict: Por tamanho de janela, as séries de p-valores gerais (pelo
+            último concurso de cada janela), a fração de janelas rejeitadas em
+            cada teste e o resumo por número
+        """
+        if self.df is None or self.df.empty:
+            return {"erro": "DataFrame vazio ou não carregado. Verifique os dados fornecidos."}
+
+        janelas = [janelas] if isinstance(janelas, int) else list(janelas)
+        if passo < 1 or not 0 < alfa < 100:
+            return {"erro": "Parâmetros inválidos: passo deve ser positivo e alfa entre 0 e 100."}
+        df = self.df.sort_values('Concurso')
+        concursos = df['Concurso'].to_numpy()
+        validas = sorted({j for j in janelas if JANELA_MINIMA <= j <= len(df)})
+        if not validas:
+            return {"erro": f"Nenhuma janela entre {JANELA_MINIMA} e {len(df)} sorteios."}
+
+        somas = SomasAcumuladas(mascaras_do_df(df))
+        limite = alfa / 100
+        resultados = {}
+        for tamanho in validas:
+            teste = testar_janelas(somas, tamanho, passo)
+            resumo_numeros = {
+                num: {
+                    nome: {
+                        'rejeicoes': float((teste['por_numero'][nome][:, num - 1] < limite).mean()),
+                        'ultimo_p': round(float(teste['por_numero'][nome][-1, num - 1]), 6),
+                    }
+                    for nome in TESTES
+                }
+                for num in range(1, TOTAL_NUMEROS + 1)
+            }
+            resultados[tamanho] = {
+                'concursos': concursos[teste['fins'] - 1],
+                'geral': {nome: np.round(teste['geral'][nome], 6) for nome in TESTES},
+                'rejeicoes': {nome: float((teste['geral'][nome] < limite).mean()) for nome in TESTES},
+                'por_numero': resumo_numeros,
+            }
+            if por_numero:
+                resultados[tamanho]['series_por_numero'] = {
+                    nome: np.round(teste['por_numero'][nome], 6) for nome in TESTES
+                }
+
+        self.resultados = {
+            'alfa': limite,
+            'passo': passo,
+            'janelas_ignoradas': sorted(set(janelas) - set(validas)),
+            'janelas': resultados,
+        }
+        return self.resultados
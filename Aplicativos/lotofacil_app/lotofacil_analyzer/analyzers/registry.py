@@ -0,0 +1,201 @@
+# lotofacil_analyzer/analyzers/registry.py
+from ..data.jogos import LOTOFACIL, obter_jogo
+from .. import metrics
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import django
+import multiprocessing
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Chave do analisador -> (classe, {nome do extra: método})
+REGISTRO = {}
+
+COLUNAS_MATRIZ = ['Concurso'] + LOTOFACIL.colunas_bolas
+# Colunas levadas aos analisadores quando presentes, codificadas como int32
+# (datas em dias desde 1970-01-01, com ``SEM_DATA`` no lugar de NaT)
+COLUNAS_OPCIONAIS = ('data', 'especial')
+SEM_DATA = np.iinfo(np.int32).min
+
+
+def registrar(chave, extras=None):
+    """
+    Decorador que registra um analisador para execução pelo ``ExecutorAnalisadores``.
+
+    Args:
+        chave (str): Nome curto do analisador (ex.: 'frequencia')
+        extras (dict, optional): Resultados adicionais, no formato
+            {nome: método sem argumentos chamado após ``analisar``}
+    """
+    def decorador(classe):
+        REGISTRO[chave] = (classe, dict(extras or {}))
+        return classe
+    return decorador
+
+
+def _codificar_coluna(df, coluna):
+    if coluna == 'data':
+        dias = df['data'].to_numpy(dtype='datetime64[D]')
+        return np.where(np.isnat(dias), SEM_DATA, dias.astype(np.int64)).astype(np.int32)
+    return df[coluna].to_numpy(dtype=np.int32)
+
+
+def colunas_matriz(jogo=LOTOFACIL):
+    """Colunas fixas da matriz de sorteios de um jogo: concurso e ``Bola1..BolaK``."""
+    return ['Concurso'] + jogo.colunas_bolas
+
+
+def _df_da_matriz(matriz, colunas=COLUNAS_MATRIZ, jogo=LOTOFACIL):
+    """
+    Reconstrói o DataFrame mínimo esperado pelos analisadores.
+
+    O DataFrame é uma cópia (o bloco compartilhado é fechado ao fim da
+    execução) e inclui a coluna ``numeros`` com uma lista por sorteio, que os
+    analisadores por linha (frequência, atraso, combinações) ainda percorrem.
+    """
+    fixas = colunas_matriz(jogo)
+    base = len(fixas)
+    df = pd.DataFrame(matriz[:, :base], columns=fixas, copy=True)
+    df['numeros'] = matriz[:, 1:base].tolist()
+    for indice, coluna in enumerate(colunas[base:], base):
+        valores = matriz[:, indice]
+        if coluna == 'data':
+            datas = valores.astype('datetime64[D]')
+            datas[valores == SEM_DATA] = np.datetime64('NaT')
+            df['data'] = datas
+        else:
+            df[coluna] = valores.astype(bool)
+    return df
+
+
+def _executar_analisador(chave, nome_memoria, forma, dtype, colunas, parametros, jogo):
+    """
+    Executa um analisador registrado sobre a matriz em memória compartilhada.
+
+    Returns:
+        tuple: (chave, resultados, extras, duração em segundos)
+    """
+    # O pool compartilha o resource_tracker do processo que criou o bloco,
+    # então apenas o criador chama unlink()
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    try:
+        matriz = np.ndarray(forma, dtype=dtype, buffer=memoria.buf)
+        return _executar_local(chave, matriz, colunas, parametros, jogo)
+    finally:
+        memoria.close()
+
+
+def _executar_local(chave, matriz, colunas, parametros, jogo=LOTOFACIL):
+    """Executa um analisador registrado sobre uma matriz já carregada."""
+    classe, extras = REGISTRO[chave]
+    inicio = time.perf_counter()
+    analisador = classe(df=_df_da_matriz(matriz, colunas, jogo), jogo=jogo)
+    resultados = analisador.analisar(**parametros)
+    resultados_extras = {nome: getattr(analisador, metodo)() for nome, metodo in extras.items()}
+    return chave, resultados, resultados_extras, time.perf_counter() - inicio
+
+
+class ExecutorAnalisadores:
+    """
+    Executa analisadores registrados em paralelo sobre uma única matriz de sorteios.
+
+    A matriz (concurso + K bolas do jogo + colunas opcionais presentes no
+    DataFrame) é montada uma vez e colocada em memória compartilhada, de onde
+    cada processo do pool a lê sem serializá-la. Cada processo ainda monta o
+    próprio DataFrame a partir dela (``_df_da_matriz``): a memória compartilhada
+    evita a transferência, não a conversão por analisador.
+
+    As views assíncronas executam com ``processos=1`` dentro do pool de
+    ``pool.py``, sem memória compartilhada; o pool próprio do executor só é
+    criado quando ``processos`` é maior que 1.
+    """
+
+    def __init__(self, df, processos=None, jogo=None):
+        """
+        Inicializa o executor
+
+        Args:
+            df (pd.DataFrame): DataFrame no layout de ``base_dados.csv``
+            processos (int, optional): Processos do pool (padrão: núcleos)
+            jogo (Jogo | str, optional): Jogo dos sorteios (padrão: Lotofácil)
+        """
+        self.jogo = obter_jogo(jogo)
+        fixas = colunas_matriz(self.jogo)
+        opcionais = [coluna for coluna in COLUNAS_OPCIONAIS if coluna in df.columns]
+        self.colunas = tuple(fixas + opcionais)
+        self.matriz = np.column_stack(
+            [df[fixas].to_numpy(dtype=np.int32)]
+            + [_codificar_coluna(df, coluna) for coluna in opcionais]
+        ).astype(np.int32, copy=False)
+        self.matriz = np.ascontiguousarray(self.matriz)
+        self.processos = processos or os.cpu_count() or 1
+
+    def executar(self, chaves=None, parametros=None):
+        """
+        Executa os analisadores selecionados
+
+        Args:
+            chaves (list, optional): Analisadores a executar (padrão: todos os
+                registrados que suportam o jogo)
+            parametros (dict, optional): {chave: kwargs repassados a ``analisar``}
+
+        Returns:
+            dict: {chave: {'resultados', 'extras', 'duracao'}} e '_total' com a
+            duração total da execução
+        """
+        chaves = list(chaves or (
+            c for c, (classe, _) in REGISTRO.items() if classe.suporta_jogo(self.jogo)
+        ))
+        desconhecidas = [c for c in chaves if c not in REGISTRO]
+        if desconhecidas:
+            raise ValueError(f"Analisadores não registrados: {', '.join(desconhecidas)}")
+        sem_suporte = [c for c in chaves if not REGISTRO[c][0].suporta_jogo(self.jogo)]
+        if sem_suporte:
+            raise ValueError(f"Analisadores sem suporte a {self.jogo.nome}: {', '.join(sem_suporte)}")
+        parametros = parametros or {}
+
+        inicio = time.perf_counter()
+        if self.processos == 1 or len(chaves) == 1:
+            saidas = [
+                _executar_local(c, self.matriz, self.colunas, parametros.get(c, {}), self.jogo)
+                for c in chaves
+            ]
+        else:
+            saidas = self._executar_em_paralelo(chaves, parametros)
+
+        resultados = {
+            chave: {'resultados': res, 'extras': extras, 'duracao': duracao}
+            for chave, res, extras, duracao in saidas
+        }
+        # Duração medida onde o analisador rodou (talvez outro processo), registrada aqui
+        for chave, _, _, duracao in saidas:
+            metrics.registrar(f'analisador:{chave}', duracao, len(self.matriz))
+        resultados['_total'] = time.perf_counter() - inicio
+        return resultados
+
+    def _executar_em_paralelo(self, chaves, parametros):
+        """Publica a matriz em memória compartilhada e distribui os analisadores."""
+        memoria = shared_memory.SharedMemory(create=True, size=self.matriz.nbytes)
+        try:
+            np.ndarray(self.matriz.shape, dtype=self.matriz.dtype, buffer=memoria.buf)[:] = self.matriz
+            # spawn: o chamador pode ter outras threads, cujas travas um fork
+            # herdaria ocupadas. O inicializador é o próprio django.setup, que
+            # pode ser importado antes de os apps estarem carregados.
+            with ProcessPoolExecutor(
+                max_workers=min(self.processos, len(chaves)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            ) as executor:
+                futuros = [
+                    executor.submit(
+                        _executar_analisador, chave, memoria.name, self.matriz.shape,
+                        self.matriz.dtype.str, self.colunas, parametros.get(chave, {}), self.jogo,
+                    )
+                    for chave in chaves
+                ]
+                return [f.result() for f in futuros]
+        finally:
+            memoria.close()
+            memoria.unlink()
@@ -0,0 +1,268 @@
+# lotofacil_analyzer/analyzers/seasonality.py
+from .base import AnalisadorBase
+from .registry import registrar
+from ..data.bitmask import TOTAL_NUMEROS, mascaras_do_df, matriz_incidencia
+from ..data.datas import colunas_de_data
+from ..memoria import CacheLimitado
+import datetime
+import hashlib
+import numpy as np
+
+AGRUPAMENTOS = ('ano', 'mes', 'dia_semana', 'especial')
+DIAS_SEMANA = ('segunda', 'terça', 'quarta', 'quinta', 'sexta', 'sábado', 'domingo')
+
+# Colunas da matriz de valores por sorteio somada em cada grupo
+_FREQUENCIA = slice(0, TOTAL_NUMEROS)
+_ATRASO = slice(TOTAL_NUMEROS, 2 * TOTAL_NUMEROS)
+_REPETICOES = 2 * TOTAL_NUMEROS
+_SORTEIOS = 2 * TOTAL_NUMEROS + 1
+
+# Índices já montados, pela impressão digital dos dados (poucas gerações vivas)
+_INDICES = CacheLimitado()
+
+
+def _para_data(valor):
+    """
+    Converte um limite de período em ``datetime64[D]``.
+
+    Aceita ``date``, inteiros ``AAAAMMDD`` (como chegam pela API) e textos
+    ``aaaa-mm-dd`` ou ``dd/mm/aaaa``.
+
+    Raises:
+        ValueError: Se o valor não for uma data válida
+    """
+    if valor is None or isinstance(valor, np.datetime64):
+        return valor
+    if isinstance(valor, datetime.date):
+        return np.datetime64(valor, 'D')
+    if isinstance(valor, (int, np.integer)):
+        valor = str(valor)
+        valor = f'{valor[:4]}-{valor[4:6]}-{valor[6:]}'
+    elif '/' in valor:
+        valor = datetime.datetime.strptime(valor, '%d/%m/%Y').date().isoformat()
+    return np.datetime64(datetime.date.fromisoformat(valor), 'D')
+
+
+class IndiceTemporal:
+    """
+    Sorteios ordenados por data, com as fronteiras dos grupos pré-calculadas.
+
+    Para cada agrupamento os sorteios são ordenados por (grupo, data), então
+    cada grupo ocupa um bloco contíguo e, dentro dele, um período de datas é
+    um sub-bloco localizado por busca binária. As somas por grupo saem de um
+    único ``np.add.reduceat`` sobre os limites desses blocos.
+    """
+
+    def __init__(self, datas, mascaras, especiais):
+        """
+        Args:
+            datas (np.ndarray): ``datetime64[D]`` de cada sorteio, em ordem de concurso
+            mascaras (np.ndarray): Máscaras dos sorteios, na mesma ordem
+            especiais (np.ndarray): Marcação dos concursos especiais
+        """
+        datas = np.asarray(datas, dtype='datetime64[D]')
+        presente = matriz_incidencia(np.asarray(mascaras))
+        total = len(presente)
+
+        # Atraso de cada número sorteado: sorteios desde a aparição anterior
+        # (na primeira aparição, desde o início do histórico)
+        posicoes = np.arange(total)[:, np.newaxis]
+        ultima = np.maximum.accumulate(np.where(presente, posicoes, -1), axis=0)
+        anterior = np.vstack([np.full((1, TOTAL_NUMEROS), -1), ultima[:-1]])
+        atraso = np.where(presente, posicoes - anterior - 1, 0)
+
+        repeticoes = np.zeros(total, dtype=np.int32)
+        repeticoes[1:] = np.bitwise_count(mascaras[1:] & mascaras[:-1])
+
+        valores = np.empty((total, _SORTEIOS + 1), dtype=np.int32)
+        valores[:, _FREQUENCIA] = presente
+        valores[:, _ATRASO] = atraso
+        valores[:, _REPETICOES] = repeticoes
+        valores[:, _SORTEIOS] = 1
+
+        # Sorteios sem data ficam fora dos agrupamentos
+        validos = ~np.isnat(datas)
+        self.sem_data = int(total - validos.sum())
+        self.datas = datas[validos]
+        self.dias = self.datas.astype(np.int64)
+        self.datas_ordenadas = np.sort(self.datas)
+        self.especiais = np.asarray(especiais, dtype=bool)[validos]
+        self.valores = valores[validos]
+        self._grupos = {}
+
+    @classmethod
+    def obter(cls, concursos, datas, mascaras, especiais):
+        """Índice em cache para estes dados (calculado na primeira consulta)."""
+        impressao = hashlib.blake2b(digest_size=16)
+        for array in (concursos, datas.astype(np.int64), mascaras, especiais):
+            impressao.update(np.ascontiguousarray(array).tobytes())
+        return _INDICES.obter(impressao.hexdigest(), lambda: cls(datas, mascaras, especiais))
+
+    def _chaves(self, agrupamento):
+        if agrupamento == 'ano':
+            return self.datas.astype('datetime64[Y]').astype(np.int64) + 1970
+        if agrupamento == 'mes':
+            return self.datas.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        if agrupamento == 'dia_semana':
+            # 1970-01-01 foi uma quinta-feira; 0 = segunda
+            return (self.dias + 3) % 7
+        if agrupamento == 'especial':
+            return self.especiais.astype(np.int64)
+        raise ValueError(
+            f"Agrupamento desconhecido: {agrupamento} (disponíveis: {', '.join(AGRUPAMENTOS)})"
+        )
+
+    def periodo(self, inicio=None, fim=None):
+        """Datas ordenadas dos sorteios no período [inicio, fim] (uma fatia, sem cópia)."""
+        datas = self.datas_ordenadas
+        esquerda = 0 if inicio is None else np.searchsorted(datas, _para_data(inicio), 'left')
+        direita = len(datas) if fim is None else np.searchsorted(datas, _para_data(fim), 'right')
+        return self.datas_ordenadas[esquerda:direita]
+
+    def grupos(self, agrupamento):
+        """
+        Fronteiras (em cache) dos grupos de um agrupamento.
+
+        Returns:
+            dict: ``rotulos`` de cada grupo, ``chave_ordenada`` (grupo << 32 |
+            dia, para localizar períodos) e ``valores`` na ordem do agrupamento,
+            com uma linha de zeros no fim
+        """
+        if agrupamento not in self._grupos:
+            chaves = self._chaves(agrupamento)
+            ordem = np.lexsort((self.dias, chaves))
+            chaves = chaves[ordem]
+            inicios = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])[:len(chaves)]
+            grupo = np.repeat(np.arange(len(inicios)), np.diff(np.r_[inicios, len(chaves)]))
+            self._grupos[agrupamento] = {
+                'rotulos': chaves[inicios],
+                'chave_ordenada': (grupo.astype(np.int64) << 32) + self.dias[ordem],
+                'valores': np.vstack([self.valores[ordem], np.zeros((1, _SORTEIOS + 1), np.int32)]),
+            }
+        return self._grupos[agrupamento]
+
+    def somar(self, agrupamento, inicio=None, fim=None):
+        """
+        Soma os valores por sorteio de cada grupo, no período [inicio, fim].
+
+        Returns:
+            tuple: (rótulos dos grupos, somas (grupos, colunas) em int64)
+        """
+        grupos = self.grupos(agrupamento)
+        quantidade = len(grupos['rotulos'])
+        if not quantidade:
+            return grupos['rotulos'], np.zeros((0, _SORTEIOS + 1), dtype=np.int64)
+        base = np.arange(quantidade, dtype=np.int64) << 32
+        primeiro = np.iinfo(np.int32).min if inicio is None else _para_data(inicio).astype(np.int64)
+        ultimo = np.iinfo(np.int32).max if fim is None else _para_data(fim).astype(np.int64)
+
+        limites = np.empty(2 * quantidade, dtype=np.intp)
+        limites[0::2] = np.searchsorted(grupos['chave_ordenada'], base + primeiro, side='left')
+        limites[1::2] = np.searchsorted(grupos['chave_ordenada'], base + ultimo, side='right')
+
+        # Segmentos pares são [início, fim) de cada grupo; os ímpares são descartados
+        somas = np.add.reduceat(grupos['valores'], limites, axis=0, dtype=np.int64)[0::2]
+        somas[limites[0::2] >= limites[1::2]] = 0
+        return grupos['rotulos'], somas
+
+
+@registrar('sazonalidade')
+class AnalisadorSazonalidade(AnalisadorBase):
+    """Frequência, atraso e repetição agrupados por ano, mês, dia da semana e concurso especial"""
+
+    JOGOS = ('lotofacil',)
+
+    def indice(self):
+        """
+        Índice temporal dos sorteios do DataFrame.
+
+        Guardado na instância enquanto ``self.df`` não for trocado, e entre
+        instâncias pela impressão digital dos dados (que exige ordenar e
+        percorrer o DataFrame, por isso não é refeita a cada agrupamento).
+        """
+        if getattr(self, '_df_indice', None) is not self.df:
+            df = self.df.sort_values('Concurso')
+            datas, especiais = colunas_de_data(df)
+            self._indice = IndiceTemporal.obter(
+                df['Concurso'].to_numpy(dtype=np.int64), datas, mascaras_do_df(df), especiais,
+            )
+            self._df_indice = self.df
+        return self._indice
+
+    @staticmethod
+    def _rotulo(agrupamento, valor):
+        if agrupamento == 'dia_semana':
+            return DIAS_SEMANA[valor]
+        if agrupamento == 'especial':
+            return 'especial' if valor else 'regular'
+        return int(valor)
+
+    def agrupar(self, agrupamento, inicio=None, fim=None, indice=None):
+        """
+        Estatísticas de cada grupo de um agrupamento no período.
+
+        Args:
+            agrupamento (str): 'ano', 'mes', 'dia_semana' ou 'especial'
+            inicio, fim (optional): Limites do período (inclusivos); ``date``,
+                ``AAAAMMDD`` ou texto
+            indice (IndiceTemporal, optional): Índice já obtido (padrão: ``indice()``)
+
+        Returns:
+            list: Um dicionário por grupo com sorteios, frequência, percentual
+            e atraso médio por número, repetição média e mais frequentes
+        """
+        rotulos, somas = (indice or self.indice()).somar(agrupamento, inicio, fim)
+        grupos = []
+        for rotulo, soma in zip(rotulos, somas):
+            sorteios = int(soma[_SORTEIOS])
+            if not sorteios:
+                continue
+            frequencia = soma[_FREQUENCIA]
+            atraso = soma[_ATRASO]
+            contagem = {num: int(frequencia[num - 1]) for num in range(1, TOTAL_NUMEROS + 1)}
+            grupos.append({
+                'grupo': self._rotulo(agrupamento, rotulo),
+                'sorteios': sorteios,
+                'frequencia': contagem,
+                'percentuais': {num: c / sorteios * 100 for num, c in contagem.items()},
+                'atraso_medio': {
+                    num: float(atraso[num - 1] / frequencia[num - 1]) if frequencia[num - 1] else None
+                    for num in contagem
+                },
+                'repeticao_media': float(soma[_REPETICOES] / sorteios),
+                'mais_frequentes': sorted(contagem.items(), key=lambda x: x[1], reverse=True)[:5],
+            })
+        return grupos
+
+    def analisar(self, inicio=None, fim=None):
+        """
+        Agrupa os sorteios do período por ano, mês, dia da semana e concurso especial.
+
+        Args:
+            inicio, fim (optional): Limites do período (inclusivos); ``date``,
+                ``AAAAMMDD`` ou texto ``aaaa-mm-dd`` / ``dd/mm/aaaa``
+
+        Returns:
+            dict: Grupos de cada agrupamento e o resumo do período
+        """
+        if self.df is None or self.df.empty:
+            return {"erro": "DataFrame vazio ou não carregado. Verifique os dados fornecidos."}
+
+        try:
+            inicio, fim = _para_data(inicio), _para_data(fim)
+        except ValueError:
+            return {"erro": "Período inválido: use datas AAAAMMDD, aaaa-mm-dd ou dd/mm/aaaa."}
+
+        indice = self.indice()
+        datas = indice.periodo(inicio, fim)
+
+        self.resultados = {
+            'periodo': {
+                'inicio': str(datas[0]) if len(datas) else None,
+                'fim': str(datas[-1]) if len(datas) else None,
+                'sorteios': int(len(datas)),
+                'sem_data': indice.sem_data,
+            },
+            **{agrupamento: self.agrupar(agrupamento, inicio, fim, indice) for agrupamento in AGRUPAMENTOS},
+        }
+        return self.resultados
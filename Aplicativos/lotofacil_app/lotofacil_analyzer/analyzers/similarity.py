@@ -0,0 +1,233 @@
+# lotofacil_analyzer/analyzers/similarity.py
+from .base import AnalisadorBase
+from .registry import registrar
+from ..data.bitmask import NUMEROS_POR_SORTEIO, TOTAL_NUMEROS, mascaras_do_df, matriz_incidencia
+from ..memoria import CacheLimitado
+from math import comb
+import hashlib
+import numpy as np
+
+# Sorteios por lado do bloco de pares: um bloco ocupa BLOCO² bytes de
+# sobreposições (mais o AND em uint32), independente do tamanho do histórico
+BLOCO = 2048
+
+# Pares mais parecidos guardados no cálculo (``analisar`` devolve até este número)
+MAIORES_PARES = 100
+
+# Sobreposições já calculadas, pela impressão digital dos dados (poucas gerações vivas)
+_CALCULOS = CacheLimitado()
+
+
+def distribuicao_esperada():
+    """
+    Distribuição da sobreposição entre dois sorteios independentes (hipergeométrica).
+
+    Returns:
+        np.ndarray: Probabilidade de cada sobreposição, de 0 a 15
+    """
+    total = comb(TOTAL_NUMEROS, NUMEROS_POR_SORTEIO)
+    return np.array([
+        comb(NUMEROS_POR_SORTEIO, k) * comb(TOTAL_NUMEROS - NUMEROS_POR_SORTEIO, NUMEROS_POR_SORTEIO - k)
+        / total
+        for k in range(NUMEROS_POR_SORTEIO + 1)
+    ])
+
+
+def _maiores(candidatos, quantidade):
+    """Mantém os ``quantidade`` pares de maior sobreposição, desempatando pelos índices."""
+    sobreposicao, i, j = candidatos
+    ordem = np.lexsort((j, i, -sobreposicao))[:quantidade]
+    return sobreposicao[ordem], i[ordem], j[ordem]
+
+
+def _histograma(sobreposicao, faixas):
+    """
+    Contagem de cada valor de um bloco ``uint8`` (todos menores que ``faixas``).
+
+    Conta pares de bytes como ``uint16`` (um ``bincount`` com metade das
+    entradas) e separa as duas posições depois, o que é bem mais rápido que
+    um ``bincount`` direto dos bytes.
+    """
+    valores = sobreposicao.reshape(-1)
+    impar = len(valores) % 2
+    if impar:
+        valores = np.append(valores, np.uint8(0))
+    pares = np.bincount(valores.view(np.uint16), minlength=faixas << 8)[:faixas << 8]
+    pares = pares.reshape(faixas, 256)[:, :faixas]
+    contagem = pares.sum(axis=0) + pares.sum(axis=1)
+    contagem[0] -= impar
+    return contagem
+
+
+def calcular_sobreposicoes(mascaras, bloco=BLOCO, maiores=MAIORES_PARES):
+    """
+    Sobreposição (números em comum) de todos os pares de sorteios, em blocos.
+
+    Os pares são percorridos em blocos ``bloco x bloco`` do triângulo
+    superior; cada bloco é um popcount do AND entre duas fatias das
+    máscaras, e dele saem a contribuição ao histograma, os máximos por
+    sorteio e os candidatos a pares mais parecidos. A memória é limitada pelo
+    bloco, não pelo número de pares.
+
+    Args:
+        mascaras (np.ndarray): Máscaras dos sorteios
+        bloco (int): Sorteios por lado do bloco
+        maiores (int): Pares mais parecidos a manter
+
+    Returns:
+        dict: ``histograma`` (pares por sobreposição, 0 a 15), ``soma`` e
+        ``maxima`` por sorteio, ``mais_similar`` (índice do sorteio com a maior
+        sobreposição, o primeiro em empates) e ``pares`` (sobreposição, i, j)
+    """
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    total = len(mascaras)
+    faixas = NUMEROS_POR_SORTEIO + 1
+    histograma = np.zeros(faixas, dtype=np.int64)
+    maxima = np.full(total, -1, dtype=np.int16)
+    mais_similar = np.full(total, -1, dtype=np.int64)
+    pares = (np.zeros(0, np.int16), np.zeros(0, np.int64), np.zeros(0, np.int64))
+
+    def atualizar_maxima(indices, valores, sobreposicao, eixo, outros):
+        # argmax só nas linhas/colunas que superam o máximo atual (poucas após os primeiros blocos)
+        melhor = np.flatnonzero(valores > maxima[indices])
+        if not len(melhor):
+            return
+        recorte = sobreposicao[melhor] if eixo == 1 else sobreposicao[:, melhor]
+        maxima[indices[melhor]] = valores[melhor]
+        mais_similar[indices[melhor]] = outros[recorte.argmax(axis=eixo)]
+
+    for inicio_i in range(0, total, bloco):
+        linhas = np.arange(inicio_i, min(inicio_i + bloco, total))
+        for inicio_j in range(inicio_i, total, bloco):
+            colunas = np.arange(inicio_j, min(inicio_j + bloco, total))
+            sobreposicao = np.bitwise_count(mascaras[linhas, np.newaxis] & mascaras[colunas])
+            contagem = _histograma(sobreposicao, faixas)
+
+            if inicio_i == inicio_j:
+                # Bloco da diagonal: simétrico e com o próprio sorteio na diagonal
+                contagem = (contagem - _histograma(np.bitwise_count(mascaras[linhas]), faixas)) // 2
+                np.fill_diagonal(sobreposicao, 0)
+                histograma += contagem
+            else:
+                histograma += contagem
+                atualizar_maxima(colunas, sobreposicao.max(axis=0), sobreposicao, 0, linhas)
+            maximo_linhas = sobreposicao.max(axis=1)
+            atualizar_maxima(linhas, maximo_linhas, sobreposicao, 1, colunas)
+
+            # Candidatos: no mínimo a k-ésima maior sobreposição do bloco e do acumulado,
+            # procurados só nas linhas que alcançam esse limiar
+            acumulada = np.cumsum(contagem[::-1])[::-1]
+            limiar = int(np.flatnonzero(acumulada >= maiores)[-1]) if acumulada[0] >= maiores else 0
+            if len(pares[0]) >= maiores:
+                limiar = max(limiar, int(pares[0][-1]))
+            candidatas = np.flatnonzero(maximo_linhas >= max(limiar, 1))
+            i, j = np.nonzero(sobreposicao[candidatas] >= max(limiar, 1))
+            i = candidatas[i]
+            acima = linhas[i] < colunas[j]
+            i, j = i[acima], j[acima]
+            pares = _maiores((
+                np.concatenate([pares[0], sobreposicao[i, j].astype(np.int16)]),
+                np.concatenate([pares[1], linhas[i]]),
+                np.concatenate([pares[2], colunas[j]]),
+            ), maiores)
+
+    # A soma das sobreposições de um sorteio com todos os outros não precisa
+    # dos pares: é o produto da sua incidência pelas frequências dos números
+    incidencia = matriz_incidencia(mascaras).astype(np.int64)
+    soma = incidencia @ incidencia.sum(axis=0) - incidencia.sum(axis=1)
+
+    return {
+        'histograma': histograma,
+        'soma': soma,
+        'maxima': maxima,
+        'mais_similar': mais_similar,
+        'pares': pares,
+    }
+
+
+@registrar('similaridade')
+class AnalisadorSimilaridade(AnalisadorBase):
+    """Sobreposição entre todos os pares de sorteios: distribuição, pares mais parecidos e atípicos"""
+
+    JOGOS = ('lotofacil',)
+
+    def sobreposicoes(self):
+        """
+        Sobreposições dos sorteios do DataFrame (em cache entre instâncias).
+
+        Returns:
+            tuple: (concursos em ordem crescente, saída de ``calcular_sobreposicoes``)
+        """
+        df = self.df.sort_values('Concurso')
+        concursos = df['Concurso'].to_numpy(dtype=np.int64)
+        mascaras = mascaras_do_df(df)
+        impressao = hashlib.blake2b(digest_size=16)
+        impressao.update(concursos.tobytes())
+        impressao.update(np.ascontiguousarray(mascaras).tobytes())
+        return concursos, _CALCULOS.obter(impressao.hexdigest(), lambda: calcular_sobreposicoes(mascaras))
+
+    def analisar(self, pares=20, destaques=10):
+        """
+        Compara cada sorteio com todos os outros.
+
+        Args:
+            pares (int): Pares mais parecidos listados (até ``MAIORES_PARES``)
+            destaques (int): Sorteios atípicos listados em cada extremo
+
+        Returns:
+            dict: Histograma observado e esperado das sobreposições, pares mais
+            parecidos, sorteios atípicos (média de sobreposição mais alta e mais
+            baixa) e as estatísticas de cada sorteio
+        """
+        if self.df is None or self.df.empty:
+            return {"erro": "DataFrame vazio ou não carregado. Verifique os dados fornecidos."}
+        if len(self.df) < 2:
+            return {"erro": "São necessários pelo menos dois sorteios."}
+
+        concursos, calculo = self.sobreposicoes()
+        total = len(concursos)
+        total_pares = total * (total - 1) // 2
+        histograma = calculo['histograma']
+        esperado = distribuicao_esperada()
+        faixas = range(len(histograma))
+
+        media = calculo['soma'] / (total - 1)
+        media_geral = float((histograma * np.arange(len(histograma))).sum() / total_pares)
+        desvio = float(media.std())
+        escore = (media - media_geral) / desvio if desvio else np.zeros(total)
+        ordem = np.argsort(escore, kind='stable')
+
+        def destaque(indice):
+            return {
+                'concurso': int(concursos[indice]),
+                'media': round(float(media[indice]), 4),
+                'escore': round(float(escore[indice]), 3),
+                'maxima': int(calculo['maxima'][indice]),
+                'mais_similar': int(concursos[calculo['mais_similar'][indice]]),
+            }
+
+        sobreposicao, i, j = calculo['pares']
+        self.resultados = {
+            'sorteios': total,
+            'pares': total_pares,
+            'histograma': {k: int(histograma[k]) for k in faixas},
+            'percentuais': {k: histograma[k] / total_pares * 100 for k in faixas},
+            'esperado': {k: float(esperado[k] * 100) for k in faixas},
+            'media': media_geral,
+            'media_esperada': NUMEROS_POR_SORTEIO ** 2 / TOTAL_NUMEROS,
+            'mais_parecidos': [
+                {'concursos': [int(concursos[a]), int(concursos[b])], 'sobreposicao': int(s)}
+                for s, a, b in zip(sobreposicao[:pares], i[:pares], j[:pares])
+            ],
+            'atipicos': {
+                'mais_parecidos_com_o_historico': [destaque(k) for k in ordem[::-1][:destaques]],
+                'menos_parecidos_com_o_historico': [destaque(k) for k in ordem[:destaques]],
+            },
+            'por_sorteio': {
+                'concursos': concursos,
+                'media': np.round(media, 4),
+                'maxima': calculo['maxima'],
+                'mais_similar': concursos[calculo['mais_similar']],
+            },
+        }
+        return self.resultados
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class LotofacilAnalyserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lotofacil_analyzer'
+
+    def ready(self):
+        # Registra os receptores de sinais
+        from . import signals
+
+        # Pré-calcula as estatísticas sem bloquear o worker, se habilitado; só
+        # começa na primeira requisição, para não rodar em comandos e subprocessos
+        if getattr(settings, 'LOTOFACIL_AQUECER_NA_INICIALIZACAO', False):
+            from .warmup import aquecer_na_primeira_requisicao
+            aquecer_na_primeira_requisicao()
@@ -0,0 +1,3 @@
+# lotofacil_analyzer/benchmarks/__init__.py
+from .historico import gerar_historico, gravar_csv
+from .suite import TAMANHOS_PADRAO, comparar, executar_suite
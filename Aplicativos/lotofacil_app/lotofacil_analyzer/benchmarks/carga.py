@@ -0,0 +1,342 @@
+# lotofacil_analyzer/benchmarks/carga.py
+"""
+Gerador de carga para o aplicativo web.
+
+Threads disparam requisições contra um servidor local (``runserver``,
+gunicorn, uvicorn... ou um servidor WSGI iniciado aqui mesmo) seguindo uma
+mistura ponderada de endpoints, e o resultado é resumido por endpoint:
+vazão, percentis de latência e taxa de erros. Usa apenas a biblioteca padrão
+(``http.client`` com conexões persistentes), então funciona sem rede externa.
+"""
+
+from contextlib import contextmanager
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+import http.client
+import json
+import threading
+import time
+import numpy as np
+
+MISTURA_PADRAO = {
+    'home': 3,
+    'estatisticas': 2,
+    'resultados': 2,
+    'api_resultados': 2,
+    'api_estatisticas': 1,
+    'gerar': 1,
+    'conferir': 1,
+}
+PERCENTIS = (50, 90, 95, 99)
+
+
+class Cliente:
+    """Conexão HTTP persistente com cookies, uma por thread."""
+
+    def __init__(self, url, timeout=30):
+        partes = urlsplit(url)
+        self.host = partes.hostname
+        self.porta = partes.port or 80
+        self.prefixo = partes.path.rstrip('/')
+        self.timeout = timeout
+        self.cookies = {}
+        self.conexao = None
+
+    def _conectar(self):
+        self.conexao = http.client.HTTPConnection(self.host, self.porta, timeout=self.timeout)
+
+    def requisitar(self, metodo, caminho, corpo=None, cabecalhos=None):
+        """
+        Envia uma requisição e lê a resposta inteira.
+
+        Uma conexão derrubada pelo servidor (fim do keep-alive) é refeita uma vez.
+
+        Returns:
+            tuple: (status, corpo em bytes)
+        """
+        cabecalhos = dict(cabecalhos or {})
+        if self.cookies:
+            cabecalhos['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        for tentativa in range(2):
+            if self.conexao is None:
+                self._conectar()
+            try:
+                self.conexao.request(metodo, self.prefixo + caminho, body=corpo, headers=cabecalhos)
+                resposta = self.conexao.getresponse()
+                dados = resposta.read()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self.fechar()
+                if tentativa:
+                    raise
+        for valor in resposta.headers.get_all('Set-Cookie') or []:
+            for nome, morsel in SimpleCookie(valor).items():
+                self.cookies[nome] = morsel.value
+        if resposta.getheader('Connection', '').lower() == 'close':
+            self.fechar()
+        return resposta.status, dados
+
+    def formulario(self, caminho, campos):
+        """POST de formulário com o token CSRF do cookie."""
+        return self.requisitar('POST', caminho, urlencode(campos), {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'X-CSRFToken': self.cookies.get('csrftoken', ''),
+        })
+
+    def preparar(self, usuario=None, senha=None):
+        """Obtém o cookie CSRF e, se houver credenciais, inicia a sessão."""
+        self.requisitar('GET', '/usuarios/login/')
+        if usuario:
+            status, _ = self.formulario('/usuarios/login/', {
+                'username': usuario, 'password': senha or '',
+                'csrfmiddlewaretoken': self.cookies.get('csrftoken', ''),
+            })
+            if 'sessionid' not in self.cookies:
+                raise ValueError(f"Falha no login de {usuario!r} (status {status})")
+
+    def fechar(self):
+        if self.conexao is not None:
+            self.conexao.close()
+            self.conexao = None
+
+
+def _aposta(rng):
+    return sorted((rng.choice(25, 15, replace=False) + 1).tolist())
+
+
+def _home(cliente, rng, opcoes):
+    return cliente.requisitar('GET', '/')
+
+
+def _estatisticas(cliente, rng, opcoes):
+    return cliente.requisitar('GET', '/estatisticas/')
+
+
+def _resultados(cliente, rng, opcoes):
+    # Metade das páginas é a primeira; o resto continua de um concurso aleatório
+    antes = int(rng.integers(2, opcoes['ultimo_concurso'] + 2)) if rng.random() < 0.5 else None
+    return cliente.requisitar('GET', '/resultados/' + (f'?antes={antes}' if antes else ''))
+
+
+def _api_resultados(cliente, rng, opcoes):
+    return cliente.requisitar('GET', '/api/resultados/?tamanho=50')
+
+
+def _api_estatisticas(cliente, rng, opcoes):
+    return cliente.requisitar('GET', '/api/estatisticas/frequencia/')
+
+
+def _gerar(cliente, rng, opcoes):
+    # Cada cliente é uma sessão: com LOTOFACIL_TAREFAS_ABERTAS_POR_CLIENTE tarefas
+    # na fila (sem worker rodando), as próximas recebem 429
+    return cliente.formulario('/gerar-jogo-rapido/', {'quantidade': int(rng.integers(1, 11))})
+
+
+def _conferir(cliente, rng, opcoes):
+    apostas = [_aposta(rng) for _ in range(opcoes['apostas_conferencia'])]
+    return cliente.requisitar(
+        'POST', '/api/conferir/', json.dumps({'apostas': apostas}),
+        {'Content-Type': 'application/json'},
+    )
+
+
+ENDPOINTS = {
+    'home': _home,
+    'estatisticas': _estatisticas,
+    'resultados': _resultados,
+    'api_resultados': _api_resultados,
+    'api_estatisticas': _api_estatisticas,
+    'gerar': _gerar,
+    'conferir': _conferir,
+}
+
+
+def ler_mistura(texto):
+    """
+    Interpreta uma mistura no formato ``home=3,conferir=1``.
+
+    Raises:
+        ValueError: Se um endpoint for desconhecido ou um peso não for positivo
+    """
+    mistura = {}
+    for item in filter(None, texto.split(',')):
+        nome, _, peso = item.partition('=')
+        nome = nome.strip()
+        if nome not in ENDPOINTS:
+            raise ValueError(f"Endpoint desconhecido: {nome} (disponíveis: {', '.join(ENDPOINTS)})")
+        mistura[nome] = float(peso or 1)
+        if mistura[nome] <= 0:
+            raise ValueError(f"O peso de {nome} deve ser positivo")
+    if not mistura:
+        raise ValueError("A mistura não tem endpoints")
+    return mistura
+
+
+@contextmanager
+def servidor_local(porta=0):
+    """
+    Serve o projeto em um servidor WSGI com threads, em segundo plano.
+
+    Yields:
+        str: URL base do servidor
+    """
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    class _Silencioso(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadedWSGIServer(('127.0.0.1', porta), _Silencioso)
+    servidor.set_app(get_wsgi_application())
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{servidor.server_address[1]}'
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def resumir(amostras, decorrido):
+    """
+    Resume as amostras de um endpoint.
+
+    Args:
+        amostras (list): Tuplas (latência em segundos, status ou None em falha de conexão)
+        decorrido (float): Duração da medição, para a vazão
+
+    Returns:
+        dict: Requisições, vazão, erros, status e percentis de latência (ms)
+    """
+    latencias = np.array([latencia for latencia, _ in amostras]) * 1000
+    status = {}
+    erros = 0
+    for _, codigo in amostras:
+        chave = str(codigo) if codigo is not None else 'conexao'
+        status[chave] = status.get(chave, 0) + 1
+        erros += codigo is None or codigo >= 400
+    resumo = {
+        'requisicoes': len(amostras),
+        'vazao': round(len(amostras) / decorrido, 2) if decorrido else None,
+        'erros': erros,
+        'taxa_erros': round(erros / len(amostras), 4) if amostras else None,
+        'status': status,
+    }
+    if len(latencias):
+        resumo['latencia_ms'] = {
+            'media': round(float(latencias.mean()), 2),
+            **{f'p{p}': round(float(v), 2) for p, v in zip(PERCENTIS, np.percentile(latencias, PERCENTIS))},
+            'maximo': round(float(latencias.max()), 2),
+        }
+    return resumo
+
+
+def executar_carga(url, mistura=None, concorrencia=4, duracao=30, requisicoes=None,
+                   aquecimento=0, semente=0, usuario=None, senha=None,
+                   apostas_conferencia=100, timeout=30, ultimo_concurso=3000):
+    """
+    Dispara a carga e resume os resultados.
+
+    Args:
+        url (str): URL base do servidor (ex.: 'http://127.0.0.1:8000')
+        mistura (dict, optional): {endpoint: peso} (padrão: ``MISTURA_PADRAO``)
+        concorrencia (int): Threads, cada uma com a sua conexão
+        duracao (float): Segundos de medição (ignorado se ``requisicoes`` for dado)
+        requisicoes (int, optional): Total de requisições a disparar
+        aquecimento (int): Requisições por endpoint antes da medição (descartadas)
+        semente (int): Semente das escolhas de endpoint e das apostas
+        usuario (str, optional): Usuário para logar antes (as apostas geradas são salvas)
+        senha (str, optional): Senha do usuário
+        apostas_conferencia (int): Apostas por requisição de conferência
+        timeout (float): Timeout de cada requisição, em segundos
+        ultimo_concurso (int): Limite dos cursores aleatórios da página de resultados
+
+    Returns:
+        dict: Relatório serializável em JSON com o resumo por endpoint e o total
+    """
+    mistura = mistura or MISTURA_PADRAO
+    nomes = list(mistura)
+    pesos = np.array([mistura[n] for n in nomes], dtype=float)
+    pesos /= pesos.sum()
+    opcoes = {'apostas_conferencia': apostas_conferencia, 'ultimo_concurso': ultimo_concurso}
+
+    amostras = {nome: [] for nome in nomes}
+    falhas = []
+    lock = threading.Lock()
+    restantes = [requisicoes]
+    marcos = {}
+
+    def iniciar():
+        # Executado uma vez, quando todas as threads terminaram a preparação
+        marcos['inicio'] = time.perf_counter()
+        marcos['limite'] = marcos['inicio'] + duracao
+
+    pronto = threading.Barrier(concorrencia, action=iniciar)
+
+    def proxima():
+        with lock:
+            if restantes[0] is None:
+                return time.perf_counter() < marcos['limite']
+            if restantes[0] <= 0:
+                return False
+            restantes[0] -= 1
+            return True
+
+    def trabalhador(indice):
+        rng = np.random.default_rng([semente, indice])
+        cliente = Cliente(url, timeout)
+        locais = {nome: [] for nome in nomes}
+        try:
+            try:
+                cliente.preparar(usuario, senha)
+                # Uma thread só aquece os caches de cada endpoint
+                if indice == 0:
+                    for nome in nomes:
+                        for _ in range(aquecimento):
+                            ENDPOINTS[nome](cliente, rng, opcoes)
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                cliente.fechar()
+                with lock:
+                    falhas.append(f"thread {indice}: {e!r}")
+            finally:
+                pronto.wait()
+            while proxima():
+                nome = nomes[rng.choice(len(nomes), p=pesos)]
+                inicio = time.perf_counter()
+                try:
+                    status, _ = ENDPOINTS[nome](cliente, rng, opcoes)
+                except (OSError, http.client.HTTPException):
+                    status = None
+                    cliente.fechar()
+                locais[nome].append((time.perf_counter() - inicio, status))
+        finally:
+            cliente.fechar()
+            with lock:
+                for nome, lista in locais.items():
+                    amostras[nome].extend(lista)
+
+    threads = [threading.Thread(target=trabalhador, args=(i,)) for i in range(concorrencia)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    decorrido = time.perf_counter() - marcos['inicio']
+
+    return {
+        'url': url,
+        'parametros': {
+            'mistura': mistura,
+            'concorrencia': concorrencia,
+            'duracao': duracao if requisicoes is None else None,
+            'requisicoes': requisicoes,
+            'aquecimento': aquecimento,
+            'semente': semente,
+            'autenticado': bool(usuario),
+            'apostas_conferencia': apostas_conferencia,
+        },
+        'decorrido': round(decorrido, 3),
+        'falhas_preparacao': falhas,
+        'endpoints': {nome: resumir(amostras[nome], decorrido) for nome in nomes},
+        'total': resumir([a for lista in amostras.values() for a in lista], decorrido),
+    }
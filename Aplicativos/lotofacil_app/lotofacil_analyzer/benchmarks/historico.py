@@ -0,0 +1,99 @@
+# lotofacil_analyzer/benchmarks/historico.py
+"""
+Históricos sintéticos no layout de ``base_dados.csv``.
+
+Os sorteios são uniformes e as demais colunas têm valores plausíveis, de modo
+que o importador e os analisadores percorrem o mesmo caminho do arquivo real.
+"""
+
+from ..data.bitmask import COLUNAS_BOLAS, NUMEROS_POR_SORTEIO, TOTAL_NUMEROS
+import datetime
+import numpy as np
+import pandas as pd
+
+COLUNAS = (
+    ['Concurso', 'Data Sorteio'] + COLUNAS_BOLAS + [
+        'Ganhadores 15 acertos', 'Cidade / UF', 'Rateio 15 acertos',
+        'Ganhadores 14 acertos', 'Rateio 14 acertos',
+        'Ganhadores 13 acertos', 'Rateio 13 acertos',
+        'Ganhadores 12 acertos', 'Rateio 12 acertos',
+        'Ganhadores 11 acertos', 'Rateio 11 acertos',
+        'Acumulado 15 acertos', 'Arrecadacao Total', 'Estimativa Prêmio',
+        'Acumulado sorteio especial Lotofácil da Independência', 'Observação',
+    ]
+)
+
+DATA_INICIAL = datetime.date(2003, 9, 29)
+# As datas avançam um dia por sorteio e recomeçam após este intervalo, para
+# que históricos de milhões de sorteios continuem dentro do calendário do pandas
+DIAS_CALENDARIO = 60_000
+
+_CIDADES = [
+    'SAO PAULO/SP', 'CAMPINAS/SP', 'RIO DE JANEIRO/RJ', 'BELO HORIZONTE/MG',
+    'CURITIBA/PR', 'PORTO ALEGRE/RS', 'SALVADOR/BA', 'RECIFE/PE',
+    'FORTALEZA/CE', 'GOIANIA/GO', 'MANAUS/AM', 'CANAL ELETRONICO',
+]
+
+
+def _moeda(valores):
+    """Formata valores no padrão ``R$1.234,56`` do arquivo original."""
+    return [
+        'R$' + f'{v:,.2f}'.replace(',', '_').replace('.', ',').replace('_', '.')
+        for v in valores
+    ]
+
+
+def gerar_historico(total, semente=0):
+    """
+    Gera um histórico sintético de sorteios.
+
+    Args:
+        total (int): Quantidade de sorteios
+        semente (int): Semente para resultados reprodutíveis
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas de ``base_dados.csv``
+    """
+    rng = np.random.default_rng(semente)
+
+    # 15 números distintos por sorteio, na ordem em que "saíram" (não ordenados)
+    chaves = rng.random((total, TOTAL_NUMEROS), dtype=np.float32)
+    bolas = np.argpartition(chaves, NUMEROS_POR_SORTEIO - 1, axis=1)[:, :NUMEROS_POR_SORTEIO] + 1
+
+    # Colunas de texto como categorias: milhões de linhas sem milhões de strings
+    dias = np.arange(total) % DIAS_CALENDARIO
+    calendario = pd.date_range(DATA_INICIAL, periods=min(total, DIAS_CALENDARIO), freq='D')
+    datas = pd.Categorical.from_codes(dias, calendario.strftime('%d/%m/%Y'))
+
+    ganhadores_15 = rng.poisson(1.5, total)
+    cidades = pd.Categorical.from_codes(
+        np.where(ganhadores_15 > 0, rng.integers(0, len(_CIDADES), total), len(_CIDADES)),
+        _CIDADES + [''],
+    )
+
+    # Valores monetários sorteados de um conjunto pequeno já formatado
+    pool = _moeda(rng.uniform(1, 2_000_000, 1000))
+
+    def valores():
+        return pd.Categorical.from_codes(rng.integers(0, len(pool), total), pool)
+
+    df = pd.DataFrame(bolas, columns=COLUNAS_BOLAS)
+    df.insert(0, 'Concurso', np.arange(1, total + 1))
+    df.insert(1, 'Data Sorteio', datas)
+    df['Ganhadores 15 acertos'] = ganhadores_15
+    df['Cidade / UF'] = cidades
+    for faixa, media in ((15, None), (14, 300), (13, 10_000), (12, 120_000), (11, 600_000)):
+        if media is not None:
+            df[f'Ganhadores {faixa} acertos'] = rng.poisson(media, total)
+        df[f'Rateio {faixa} acertos'] = valores()
+    for coluna in ('Acumulado 15 acertos', 'Arrecadacao Total', 'Estimativa Prêmio',
+                   'Acumulado sorteio especial Lotofácil da Independência'):
+        df[coluna] = valores()
+    df['Observação'] = ''
+    return df[COLUNAS]
+
+
+def gravar_csv(df, caminho):
+    """Grava o histórico sintético como CSV no mesmo formato do arquivo real."""
+    df.to_csv(caminho, index=False)
+    return caminho
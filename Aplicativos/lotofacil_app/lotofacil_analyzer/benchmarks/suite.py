@@ -0,0 +1,266 @@
+# lotofacil_analyzer/benchmarks/suite.py
+"""
+Suíte de benchmarks dos analisadores, geradores e backtests.
+
+Para cada tamanho de histórico sintético mede o tempo e o pico de memória
+(``tracemalloc``) de cada etapa e produz um relatório JSON comparável entre
+commits. Etapas cujo custo estimado (extrapolado linearmente do tamanho
+anterior) passa dos limites são puladas e registradas como tal, para que a
+suíte termine mesmo com implementações que não escalam.
+"""
+
+from ..analyzers import REGISTRO
+from ..conferencia import conferir
+from ..data.bitmask import mascaras_do_df, matriz_incidencia
+from ..data.processor import LotofacilDataImporter
+from ..data.store import calcular_arrays
+from .historico import gerar_historico, gravar_csv
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+import gc
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+TAMANHOS_PADRAO = (3_000, 30_000, 300_000, 3_000_000)
+CAMINHO_BASELINE = Path(__file__).parent / 'baseline.json'
+VERSAO_RELATORIO = 1
+
+APOSTAS_GERADAS = 10_000
+APOSTAS_BACKTEST = 1_000
+
+
+def _commit_atual():
+    """Hash do commit atual, se o código estiver em um repositório git."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir(funcao, memoria=True):
+    """
+    Executa ``funcao`` medindo tempo e, opcionalmente, o pico de memória.
+
+    Returns:
+        tuple: (retorno da função, {'segundos', 'pico_mb'})
+    """
+    gc.collect()
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        resultado = funcao()
+    finally:
+        segundos = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1] if memoria else None
+        if memoria:
+            tracemalloc.stop()
+    return resultado, {
+        'segundos': round(segundos, 4),
+        'pico_mb': round(pico / 1e6, 2) if pico is not None else None,
+    }
+
+
+def _etapas(contexto):
+    """
+    Etapas medidas, em ordem, para o histórico do contexto.
+
+    Returns:
+        list: Pares (nome da etapa, função sem argumentos)
+    """
+    from ..generators.frequency import GeradorFrequencia
+    from ..generators.markov import GeradorMarkov
+    from ..generators.portfolio import GeradorPortfolio
+
+    def importar():
+        contexto['df'] = LotofacilDataImporter(file_path=contexto['csv']).importar_csv()
+
+    def analisador(classe, extras):
+        def executar():
+            instancia = classe(df=contexto['df'])
+            instancia.analisar()
+            for metodo in extras.values():
+                getattr(instancia, metodo)()
+        return executar
+
+    contagem = {n + 1: int(f) for n, f in enumerate(contexto['frequencias'])}
+    etapas = [
+        ('importacao', importar),
+        ('publicacao', lambda: calcular_arrays(contexto['df'])),
+    ]
+    etapas += [
+        (f'analisador:{chave}', analisador(classe, extras))
+        for chave, (classe, extras) in REGISTRO.items()
+    ]
+    etapas += [
+        ('gerador:frequencia', lambda: GeradorFrequencia(
+            {'AnalisadorFrequencia': {'contagem': contagem}}, semente=0
+        ).gerar(APOSTAS_GERADAS, salvar=False)),
+        ('gerador:markov', lambda: GeradorMarkov(
+            df=contexto['df'], semente=0
+        ).gerar(APOSTAS_GERADAS, salvar=False)),
+        ('gerador:portfolio', lambda: GeradorPortfolio(
+            sorteios=contexto['mascaras'], iteracoes=2000, reinicios=1, semente=0
+        ).gerar(10, salvar=False)),
+        ('backtest:historico', lambda: conferir(
+            contexto['apostas'], contexto['mascaras'], contexto['concursos']
+        )),
+    ]
+    return etapas
+
+
+def _estimar(medicoes, tamanho):
+    """
+    Extrapola tempo e memória de uma etapa para ``tamanho`` sorteios.
+
+    Com duas medições anteriores ajusta um custo fixo mais um custo por
+    sorteio; com uma só, supõe custo proporcional ao tamanho.
+
+    Returns:
+        tuple: (segundos, pico em MB) estimados
+    """
+    def extrapolar(chave):
+        pontos = [(m['tamanho'], m[chave] or 0) for m in medicoes[-2:]]
+        if len(pontos) == 1:
+            (n, valor), = pontos
+            return valor * tamanho / n
+        (n0, v0), (n1, v1) = pontos
+        return v1 + max((v1 - v0) / (n1 - n0), 0) * (tamanho - n1)
+
+    return extrapolar('segundos'), extrapolar('pico_mb')
+
+
+def executar_suite(tamanhos=TAMANHOS_PADRAO, semente=0, limite_segundos=120,
+                   limite_memoria_mb=2048, memoria=True, filtro=None, diretorio=None,
+                   progresso=None):
+    """
+    Executa a suíte de benchmarks.
+
+    Args:
+        tamanhos (iterable): Quantidades de sorteios dos históricos sintéticos
+        semente (int): Semente dos históricos e das apostas do backtest
+        limite_segundos (float): Tempo estimado acima do qual uma etapa é pulada
+        limite_memoria_mb (float): Pico estimado acima do qual uma etapa é pulada
+        memoria (bool): Se True, mede o pico de memória com ``tracemalloc``
+            (o rastreamento deixa o código Python mais lento)
+        filtro (list, optional): Prefixos das etapas a executar
+        diretorio (str, optional): Onde gravar os CSVs (padrão: temporário)
+        progresso (callable, optional): Chamado com (tamanho, etapa, medição)
+
+    Returns:
+        dict: Relatório serializável em JSON
+    """
+    relatorio = {
+        'versao': VERSAO_RELATORIO,
+        'gerado_em': datetime.now(timezone.utc).isoformat(),
+        'commit': _commit_atual(),
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'parametros': {
+            'tamanhos': list(tamanhos),
+            'semente': semente,
+            'limite_segundos': limite_segundos,
+            'limite_memoria_mb': limite_memoria_mb,
+            'memoria': memoria,
+        },
+        'resultados': {},
+    }
+    anteriores = defaultdict(list)
+    puladas = set()
+
+    with tempfile.TemporaryDirectory(dir=diretorio) as temporario:
+        for tamanho in sorted(tamanhos):
+            historico = gerar_historico(tamanho, semente)
+            contexto = {
+                'csv': gravar_csv(historico, Path(temporario) / f'historico_{tamanho}.csv'),
+                # Usado pelas etapas seguintes se a importação for pulada
+                'df': historico,
+                'mascaras': mascaras_do_df(historico),
+                'concursos': historico['Concurso'].to_numpy(),
+            }
+            contexto['frequencias'] = matriz_incidencia(contexto['mascaras']).sum(axis=0)
+            rng = np.random.default_rng(semente)
+            contexto['apostas'] = contexto['mascaras'][
+                rng.integers(0, tamanho, min(APOSTAS_BACKTEST, tamanho))
+            ]
+
+            resultados = relatorio['resultados'][str(tamanho)] = {}
+            for nome, funcao in _etapas(contexto):
+                if filtro and not any(nome.startswith(prefixo) for prefixo in filtro):
+                    continue
+
+                if nome in puladas:
+                    medicao = {'pulada': "pulada em um tamanho menor"}
+                elif nome in anteriores:
+                    segundos, pico = _estimar(anteriores[nome], tamanho)
+                    if segundos > limite_segundos or pico > limite_memoria_mb:
+                        medicao = {'pulada': f"estimativa de {segundos:.0f} s e {pico:.0f} MB"}
+                        puladas.add(nome)
+                    else:
+                        medicao = None
+                else:
+                    medicao = None
+
+                if medicao is None:
+                    try:
+                        _, medicao = medir(funcao, memoria)
+                        anteriores[nome].append({'tamanho': tamanho, **medicao})
+                    except (Exception, MemoryError) as e:
+                        medicao = {'erro': repr(e)}
+                        puladas.add(nome)
+
+                resultados[nome] = medicao
+                if progresso:
+                    progresso(tamanho, nome, medicao)
+
+            del contexto, historico
+            os.remove(Path(temporario) / f'historico_{tamanho}.csv')
+
+    return relatorio
+
+
+def comparar(atual, referencia, tolerancia=0.25):
+    """
+    Compara dois relatórios etapa a etapa.
+
+    Args:
+        atual (dict): Relatório novo
+        referencia (dict): Relatório de referência (ex.: ``baseline.json``)
+        tolerancia (float): Aumento relativo de tempo aceito antes de acusar regressão
+
+    Returns:
+        list: Uma linha por etapa medida nos dois relatórios, com a razão
+        atual/referência do tempo e se houve regressão
+    """
+    linhas = []
+    for tamanho, etapas in atual['resultados'].items():
+        etapas_referencia = referencia['resultados'].get(tamanho, {})
+        for nome, medicao in etapas.items():
+            base = etapas_referencia.get(nome, {})
+            if 'segundos' not in medicao or 'segundos' not in base:
+                continue
+            razao = medicao['segundos'] / base['segundos'] if base['segundos'] else None
+            linhas.append({
+                'tamanho': int(tamanho),
+                'etapa': nome,
+                'referencia': base['segundos'],
+                'atual': medicao['segundos'],
+                'razao': round(razao, 3) if razao is not None else None,
+                'regressao': razao is not None and razao > 1 + tolerancia,
+            })
+    return linhas
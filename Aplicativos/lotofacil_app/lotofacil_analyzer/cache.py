@@ -0,0 +1,378 @@
+# lotofacil_analyzer/cache.py
+"""
+Cache dos resultados das análises, versionado pela geração dos dados publicados.
+
+A chave inclui a geração do ``ArmazemSorteios``: quando uma nova geração é
+publicada as chaves antigas simplesmente deixam de ser consultadas.
+"""
+
+from .analyzers import REGISTRO, ExecutorAnalisadores
+from .analyzers.randomness import TESTES as TESTES_ALEATORIEDADE
+from .data.store import obter_armazem
+from .metrics import registrar_cache
+from .pool import executar_coalescido, submeter_coalescido
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from datetime import datetime, timezone
+from pathlib import Path
+import gzip
+import hashlib
+import inspect
+import json
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_CSV = Path(__file__).parent / 'data' / 'files' / 'base_dados.csv'
+ANALISADORES_ESTATISTICAS = ('frequencia', 'atraso', 'combinacoes', 'aleatoriedade')
+# Pontos, no máximo, de cada série de p-valores do gráfico de aleatoriedade
+PONTOS_ALEATORIEDADE = 300
+NOMES_TESTES_ALEATORIEDADE = {
+    'qui_quadrado': 'Qui-quadrado (uniformidade)',
+    'sequencias': 'Sequências (runs)',
+    'correlacao_serial': 'Correlação serial',
+}
+
+
+def chave_estatisticas(geracao):
+    """Chave de cache do contexto da página de estatísticas para uma geração."""
+    return f'lotofacil:estatisticas:{geracao}'
+
+
+def geracao_atual():
+    """
+    Sincroniza o armazém com o CSV e retorna a geração vigente.
+
+    Raises:
+        FileNotFoundError: Se o CSV de origem não existir
+    """
+    armazem = obter_armazem()
+    armazem.sincronizar(CAMINHO_CSV)
+    return armazem.geracao
+
+
+def estatisticas_em_cache():
+    """
+    Retorna o contexto de estatísticas já calculado para a geração vigente.
+
+    Returns:
+        dict | None: Contexto do template ou None se ainda não foi calculado
+    """
+    contexto = cache.get(chave_estatisticas(geracao_atual()))
+    registrar_cache('estatisticas', contexto is not None)
+    return contexto
+
+
+def montar_tabelas(frequencia, atraso):
+    """
+    Converte os resultados em linhas prontas para os partials de estatísticas.
+
+    Evita que o template faça uma consulta a dicionário por célula.
+
+    Args:
+        frequencia (dict): Resultados do ``AnalisadorFrequencia``
+        atraso (dict): Resultados do ``AnalisadorAtraso``
+
+    Returns:
+        dict: Listas de linhas por tabela
+    """
+    percentuais = frequencia.get('percentuais', {})
+    estatisticas = atraso.get('estatisticas', {})
+
+    def linhas_frequencia(pares):
+        return [
+            {'numero': num, 'frequencia': freq, 'percentual': percentuais.get(num)}
+            for num, freq in pares
+        ]
+
+    return {
+        'frequencia_mais': linhas_frequencia(frequencia.get('mais_frequentes', [])),
+        'frequencia_menos': linhas_frequencia(frequencia.get('menos_frequentes', [])),
+        'atraso_maior': [
+            {
+                'numero': num,
+                'atraso': valor,
+                'ultimo_sorteio': estatisticas.get(num, {}).get('ultimo_sorteio'),
+            }
+            for num, valor in atraso.get('ranking_atrasos', [])[:5]
+        ],
+        'atraso_numeros': [
+            {'numero': num, **estatisticas[num]} for num in sorted(estatisticas)
+        ],
+    }
+
+
+def montar_aleatoriedade(resultados):
+    """
+    Prepara os resultados do ``AnalisadorAleatoriedade`` para o partial.
+
+    Args:
+        resultados (dict): Resultados do analisador
+
+    Returns:
+        dict: ``tabela`` (uma linha por janela e teste) e ``series`` de
+        p-valores por janela, serializáveis para o gráfico
+    """
+    tabela = []
+    series = []
+    for tamanho, janela in resultados.get('janelas', {}).items():
+        for teste in TESTES_ALEATORIEDADE:
+            tabela.append({
+                'janela': tamanho,
+                'teste': NOMES_TESTES_ALEATORIEDADE[teste],
+                'rejeicoes': janela['rejeicoes'][teste] * 100,
+                'ultimo_p': float(janela['geral'][teste][-1]),
+            })
+        series.append({
+            'janela': tamanho,
+            'concursos': [int(c) for c in janela['concursos']],
+            'p_valores': {
+                NOMES_TESTES_ALEATORIEDADE[teste]: janela['geral'][teste].tolist()
+                for teste in TESTES_ALEATORIEDADE
+            },
+        })
+    return {'alfa_percentual': resultados.get('alfa', 0) * 100, 'tabela': tabela, 'series': series}
+
+
+def computar_estatisticas(processos=None):
+    """
+    Executa os analisadores da página de estatísticas sobre a geração vigente.
+
+    Não acessa o cache, então pode rodar em um processo do pool.
+
+    Args:
+        processos (int, optional): Processos usados pelo ``ExecutorAnalisadores``
+
+    Returns:
+        dict: Contexto do template ``estatisticas.html``
+    """
+    armazem = obter_armazem()
+    # dataframe() mapeia a geração vigente: num processo recém-criado do pool
+    # o armazém ainda não leu nenhuma
+    df = armazem.dataframe()
+    passo = max(1, armazem.meta['total_sorteios'] // PONTOS_ALEATORIEDADE)
+    execucao = ExecutorAnalisadores(df, processos=processos).executar(
+        ANALISADORES_ESTATISTICAS, {'aleatoriedade': {'passo': passo}}
+    )
+    for chave in ANALISADORES_ESTATISTICAS:
+        logger.info("Análise de %s concluída em %.3fs.", chave, execucao[chave]['duracao'])
+
+    frequencia = execucao['frequencia']['resultados']
+    atraso = execucao['atraso']['resultados']
+    return {
+        'versao': armazem.geracao,
+        'frequencia': frequencia,
+        'atraso': atraso,
+        'combinacoes': {
+            'resultados': execucao['combinacoes']['resultados'],
+            'probabilidades': execucao['combinacoes']['extras']['probabilidades'],
+        },
+        'tabelas': montar_tabelas(frequencia, atraso),
+        'aleatoriedade': montar_aleatoriedade(execucao['aleatoriedade']['resultados']),
+    }
+
+
+def calcular_estatisticas():
+    """
+    Calcula as estatísticas no pool de processos e grava o resultado no cache.
+
+    Versão síncrona de ``acalcular_estatisticas``, usada pelo aquecimento:
+    divide o mesmo cálculo coalescido com as requisições e, como elas, roda
+    os analisadores em série dentro de um único processo do pool.
+
+    Returns:
+        dict: Contexto do template ``estatisticas.html``
+    """
+    geracao = geracao_atual()
+    contexto, _ = submeter_coalescido(('estatisticas', geracao), computar_estatisticas, 1).result()
+    cache.set(chave_estatisticas(contexto['versao']), contexto, timeout=None)
+    return contexto
+
+
+def agendar_estatisticas():
+    """
+    Submete o cálculo das estatísticas ao pool sem aguardar o resultado.
+
+    Usado pelas views síncronas, que respondem 503 enquanto isso; o contexto
+    é gravado no cache quando o cálculo (coalescido com as requisições da
+    mesma geração) termina.
+
+    Returns:
+        concurrent.futures.Future: Cálculo em andamento da geração vigente
+    """
+    geracao = geracao_atual()
+    futuro = submeter_coalescido(('estatisticas', geracao), computar_estatisticas, 1)
+    futuro.add_done_callback(_gravar_estatisticas)
+    return futuro
+
+
+def _gravar_estatisticas(futuro):
+    if futuro.cancelled():
+        return
+    if futuro.exception() is not None:
+        logger.error("Falha no cálculo das estatísticas: %s", futuro.exception())
+        return
+    contexto, _ = futuro.result()
+    cache.set(chave_estatisticas(contexto['versao']), contexto, timeout=None)
+
+
+async def acalcular_estatisticas():
+    """
+    Calcula as estatísticas no pool de processos e grava o resultado no cache.
+
+    Requisições simultâneas para a mesma geração compartilham um único cálculo.
+
+    Returns:
+        dict: Contexto do template ``estatisticas.html``
+    """
+    geracao = await sync_to_async(geracao_atual)()
+    # Dentro do pool os analisadores rodam em série: o paralelismo vem do pool
+    contexto = await executar_coalescido(('estatisticas', geracao), computar_estatisticas, 1)
+    await cache.aset(chave_estatisticas(contexto['versao']), contexto, timeout=None)
+    return contexto
+
+
+class EncoderResultados(DjangoJSONEncoder):
+    """Serializa os tipos numpy presentes nos resultados dos analisadores."""
+
+    def default(self, o):
+        if isinstance(o, np.integer):
+            return int(o)
+        if isinstance(o, np.floating):
+            return float(o)
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        return super().default(o)
+
+
+# Faixas aceitas pela API para parâmetros específicos; os demais só não podem ser negativos.
+# Combinações maiores que 5 geram milhões de tuplas por requisição.
+LIMITES_PARAMETROS = {
+    'tamanhos_combinacoes': (1, 5),
+}
+# Valores aceitos em um parâmetro de lista
+MAXIMO_VALORES_LISTA = 10
+
+
+def _inteiro_api(nome, texto):
+    """Converte um valor da query string, respeitando ``LIMITES_PARAMETROS``."""
+    valor = int(texto)
+    minimo, maximo = LIMITES_PARAMETROS.get(nome, (0, None))
+    if valor < minimo or (maximo is not None and valor > maximo):
+        faixa = f"entre {minimo} e {maximo}" if maximo is not None else f"maior ou igual a {minimo}"
+        raise ValueError(f"{nome} deve estar {faixa}")
+    return valor
+
+
+def parametros_api(analisador, consulta):
+    """
+    Extrai da query string os parâmetros aceitos por ``analisar`` do analisador.
+
+    O tipo segue o valor padrão na assinatura: parâmetros com padrão lista ou
+    tupla viram sempre listas de inteiros (``?tamanhos_combinacoes=2`` vira
+    ``[2]``), ordenadas e sem repetição; os demais, inteiros.
+
+    Args:
+        analisador (str): Chave registrada do analisador
+        consulta (QueryDict): ``request.GET``
+
+    Returns:
+        dict: Parâmetros normalizados (ordenados, para compor a ETag)
+
+    Raises:
+        KeyError: Se o analisador não estiver registrado
+        ValueError: Se algum parâmetro não for numérico ou estiver fora dos limites
+    """
+    classe, _ = REGISTRO[analisador]
+    assinatura = inspect.signature(classe.analisar).parameters
+    parametros = {}
+    for nome in sorted((set(assinatura) - {'self'}) & set(consulta)):
+        valor = consulta[nome]
+        if isinstance(assinatura[nome].default, (list, tuple)):
+            valores = sorted({_inteiro_api(nome, v) for v in valor.split(',')})
+            if len(valores) > MAXIMO_VALORES_LISTA:
+                raise ValueError(f"{nome} aceita no máximo {MAXIMO_VALORES_LISTA} valores")
+            parametros[nome] = valores
+        else:
+            parametros[nome] = _inteiro_api(nome, valor)
+    return parametros
+
+
+def versao_api(analisador, parametros):
+    """
+    Calcula ETag e data de modificação de uma resposta da API.
+
+    Ambas derivam da geração vigente (último concurso publicado) e dos
+    parâmetros, então podem ser respondidas sem executar o analisador.
+
+    Returns:
+        tuple: (etag, datetime da publicação do último concurso)
+    """
+    geracao_atual()
+    geracao, meta = obter_armazem().versao()
+    base = json.dumps([analisador, meta['ultimo_concurso'], geracao, parametros], sort_keys=True)
+    etag = hashlib.sha1(base.encode()).hexdigest()[:20]
+    return etag, datetime.fromtimestamp(meta['publicado_em'], tz=timezone.utc)
+
+
+def computar_resposta_api(analisador, parametros):
+    """
+    Executa um analisador e serializa a resposta da API em cada codificação.
+
+    Não acessa o cache, então pode rodar em um processo do pool.
+
+    Returns:
+        dict: {codificação: bytes}
+    """
+    armazem = obter_armazem()
+    execucao = ExecutorAnalisadores(armazem.dataframe(), processos=1).executar(
+        [analisador], {analisador: parametros}
+    )
+    dados = {
+        'analisador': analisador,
+        'ultimo_concurso': armazem.meta['ultimo_concurso'],
+        'parametros': parametros,
+        'resultados': execucao[analisador]['resultados'],
+        'extras': execucao[analisador]['extras'],
+    }
+    bruto = json.dumps(dados, cls=EncoderResultados, ensure_ascii=False).encode('utf-8')
+    return {'identity': bruto, 'gzip': gzip.compress(bruto, compresslevel=6)}
+
+
+def resposta_api(analisador, parametros):
+    """
+    Retorna a resposta JSON já serializada e comprimida de um analisador.
+
+    O cache guarda os bytes por codificação ('identity', 'gzip'), de modo que
+    requisições repetidas não serializam nem comprimem nada.
+
+    Returns:
+        dict: {codificação: bytes}
+    """
+    etag, _ = versao_api(analisador, parametros)
+    chave = f'lotofacil:api:{etag}'
+    corpos = cache.get(chave)
+    registrar_cache('api', corpos is not None)
+    if corpos is None:
+        corpos = computar_resposta_api(analisador, parametros)
+        cache.set(chave, corpos, timeout=None)
+    return corpos
+
+
+async def aresposta_api(analisador, parametros, etag=None):
+    """
+    Versão assíncrona de ``resposta_api``, calculada no pool de processos.
+
+    ``etag`` é a de ``versao_api``, quando a view já a consultou.
+    """
+    if etag is None:
+        etag, _ = await sync_to_async(versao_api)(analisador, parametros)
+    chave = f'lotofacil:api:{etag}'
+    corpos = await cache.aget(chave)
+    registrar_cache('api', corpos is not None)
+    if corpos is None:
+        corpos = await executar_coalescido(chave, computar_resposta_api, analisador, parametros)
+        await cache.aset(chave, corpos, timeout=None)
+    return corpos
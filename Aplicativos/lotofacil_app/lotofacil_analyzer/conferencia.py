@@ -0,0 +1,103 @@
+# lotofacil_analyzer/conferencia.py
+"""
+Conferência vetorizada de apostas contra o histórico de sorteios.
+
+Todas as apostas são comparadas com todos os sorteios em uma única operação
+de ``AND`` + popcount sobre as máscaras de bits do jogo (padrão: Lotofácil).
+"""
+
+from .data.jogos import LOTOFACIL, obter_jogo
+from .data.store import obter_armazem
+from .metrics import instrumentar
+import numpy as np
+
+FAIXAS_PREMIADAS = LOTOFACIL.faixas_premiadas
+LIMITE_APOSTAS = 10_000
+
+
+def validar_apostas(apostas, jogo=LOTOFACIL):
+    """
+    Valida apostas recebidas pela API e as converte em máscaras.
+
+    Args:
+        apostas (list): Lista de apostas (listas de K números)
+        jogo (Jogo): Jogo das apostas
+
+    Returns:
+        np.ndarray: Vetor de máscaras das apostas
+
+    Raises:
+        ValueError: Se alguma aposta for inválida ou houver apostas demais
+    """
+    if not apostas:
+        raise ValueError("Nenhuma aposta informada.")
+    if len(apostas) > LIMITE_APOSTAS:
+        raise ValueError(f"Máximo de {LIMITE_APOSTAS} apostas por conferência.")
+
+    matriz = np.asarray(apostas)
+    if matriz.ndim != 2 or matriz.shape[1] != jogo.numeros_por_sorteio:
+        raise ValueError(f"Cada aposta deve ter exatamente {jogo.numeros_por_sorteio} números.")
+    if not np.issubdtype(matriz.dtype, np.integer):
+        raise ValueError("Os números devem ser inteiros.")
+    if matriz.min() < 1 or matriz.max() > jogo.total_numeros:
+        raise ValueError(f"Os números devem estar entre 1 e {jogo.total_numeros}.")
+
+    mascaras = jogo.mascaras_de_matriz(matriz)
+    if (jogo.contar_numeros(mascaras) != jogo.numeros_por_sorteio).any():
+        raise ValueError("Uma aposta não pode repetir números.")
+    return mascaras
+
+
+@instrumentar('conferencia')
+def conferir(apostas, sorteios, concursos, jogo=LOTOFACIL):
+    """
+    Confere apostas contra uma sequência de sorteios.
+
+    Args:
+        apostas (np.ndarray): Máscaras das apostas
+        sorteios (np.ndarray): Máscaras dos sorteios, em ordem cronológica
+        concursos (np.ndarray): Número do concurso de cada sorteio
+        jogo (Jogo): Jogo das apostas e sorteios
+
+    Returns:
+        list: Por aposta, acertos no último concurso, melhor acerto histórico
+        (e em qual concurso) e quantos concursos teriam premiado cada faixa
+    """
+    concursos = np.asarray(concursos)
+    acertos = jogo.acertos(apostas, sorteios)
+    melhor_indice = acertos.argmax(axis=1)
+    faixas = np.stack([(acertos == faixa).sum(axis=1) for faixa in jogo.faixas_premiadas], axis=1)
+
+    return [
+        {
+            'acertos_ultimo': int(acertos[i, -1]),
+            'melhor_acerto': int(acertos[i, melhor_indice[i]]),
+            'melhor_concurso': int(concursos[melhor_indice[i]]),
+            'premios': {faixa: int(faixas[i, j]) for j, faixa in enumerate(jogo.faixas_premiadas)},
+        }
+        for i in range(len(apostas))
+    ]
+
+
+def conferir_historico(apostas, jogo=None):
+    """
+    Confere apostas contra todos os sorteios da geração vigente do armazém.
+
+    Função de nível de módulo para poder ser executada no pool de processos.
+
+    Args:
+        apostas (np.ndarray): Máscaras das apostas
+        jogo (str, optional): Chave do jogo (padrão: Lotofácil)
+
+    Returns:
+        dict: Último concurso publicado e o resultado de ``conferir``
+    """
+    armazem = obter_armazem(jogo)
+    if not armazem.atualizar():
+        raise FileNotFoundError("Nenhuma geração de dados publicada")
+    return {
+        'ultimo_concurso': armazem.meta['ultimo_concurso'],
+        'apostas': conferir(
+            apostas, armazem.arrays['mascaras'], armazem.arrays['concursos'], armazem.jogo,
+        ),
+    }
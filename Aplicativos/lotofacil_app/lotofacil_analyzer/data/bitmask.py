@@ -0,0 +1,130 @@
+# lotofacil_analyzer/data/bitmask.py
+"""
+Representação compacta de apostas e sorteios como máscaras de bits.
+
+O número ``n`` (1..25) ocupa o bit ``n - 1``, de modo que uma aposta de 15
+números cabe em um único ``uint32`` e os acertos entre duas apostas são o
+popcount do ``AND`` entre as máscaras.
+
+As funções deste módulo são atalhos para a Lotofácil (``jogos.LOTOFACIL``);
+outros jogos usam os métodos equivalentes do seu ``Jogo``.
+"""
+
+from .jogos import LOTOFACIL
+
+TOTAL_NUMEROS = LOTOFACIL.total_numeros
+NUMEROS_POR_SORTEIO = LOTOFACIL.numeros_por_sorteio
+COLUNAS_BOLAS = LOTOFACIL.colunas_bolas
+DTYPE_MASCARA = LOTOFACIL.dtype_mascara
+
+
+def mascara(numeros):
+    """
+    Converte uma lista de números em máscara de bits.
+
+    Args:
+        numeros (iterable): Números entre 1 e 25
+
+    Returns:
+        int: Máscara com um bit ligado por número
+    """
+    valor = 0
+    for num in numeros:
+        valor |= 1 << (int(num) - 1)
+    return valor
+
+
+def numeros_da_mascara(valor):
+    """
+    Converte uma máscara de bits de volta para a lista ordenada de números.
+
+    Args:
+        valor (int): Máscara de bits
+
+    Returns:
+        list: Números ligados na máscara, em ordem crescente
+    """
+    return LOTOFACIL.numeros_da_mascara(valor)
+
+
+def mascaras_de_matriz(matriz):
+    """
+    Converte uma matriz (n, k) de números em um vetor de máscaras.
+
+    Args:
+        matriz (array-like): Cada linha é uma aposta ou sorteio
+
+    Returns:
+        np.ndarray: Vetor ``uint32`` com uma máscara por linha
+    """
+    return LOTOFACIL.mascaras_de_matriz(matriz)
+
+
+def mascaras_de_textos(textos):
+    """
+    Converte apostas gravadas como texto ("1,2,...,15") em máscaras.
+
+    Todos os textos são convertidos de uma vez, sem laço por aposta.
+
+    Args:
+        textos (list): Apostas no formato do campo ``numeros`` dos modelos
+
+    Returns:
+        np.ndarray: Vetor ``uint32`` com uma máscara por aposta
+    """
+    return LOTOFACIL.mascaras_de_textos(textos)
+
+
+def mascaras_do_df(df):
+    """
+    Extrai as máscaras dos sorteios de um DataFrame no layout de ``base_dados.csv``.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as colunas ``Bola1..Bola15``
+
+    Returns:
+        np.ndarray: Vetor ``uint32`` com uma máscara por sorteio
+    """
+    return LOTOFACIL.mascaras_do_df(df)
+
+
+def matriz_incidencia(mascaras):
+    """
+    Expande máscaras em uma matriz booleana (n, 25) de presença.
+
+    Args:
+        mascaras (np.ndarray): Vetor de máscaras
+
+    Returns:
+        np.ndarray: Matriz booleana onde a coluna ``j`` indica o número ``j + 1``
+    """
+    return LOTOFACIL.matriz_incidencia(mascaras)
+
+
+def acertos(apostas, sorteios):
+    """
+    Calcula a matriz de acertos entre apostas e sorteios.
+
+    Args:
+        apostas (np.ndarray): Vetor de máscaras das apostas
+        sorteios (np.ndarray): Vetor de máscaras dos sorteios
+
+    Returns:
+        np.ndarray: Matriz ``uint8`` (apostas, sorteios) com o número de acertos
+    """
+    return LOTOFACIL.acertos(apostas, sorteios)
+
+
+def sortear_mascaras(rng, quantidade, k=NUMEROS_POR_SORTEIO):
+    """
+    Sorteia máscaras uniformes de ``k`` números entre os 25, de forma vetorizada.
+
+    Args:
+        rng (np.random.Generator): Gerador de números aleatórios
+        quantidade (int): Quantidade de máscaras
+        k (int): Números por máscara
+
+    Returns:
+        np.ndarray: Vetor ``uint32`` com ``quantidade`` máscaras
+    """
+    return LOTOFACIL.sortear_mascaras(rng, quantidade, k)
@@ -0,0 +1,176 @@
+# lotofacil_analyzer/data/combinatoria.py
+"""
+Endereçamento de apostas (subconjuntos de K números entre N) por um único inteiro.
+
+O índice é a posição lexicográfica da aposta ordenada entre as C(N, K)
+possíveis: ``(1, 2, ..., 15)`` é 0 e ``(11, 12, ..., 25)`` é
+``TOTAL_APOSTAS - 1``. Para a Lotofácil o índice cabe em 22 bits.
+
+A conversão usa a correspondência com o rank colexicográfico do complemento
+espelhado (``N - 1 - posição``): a ordem lexicográfica das apostas é a ordem
+colexicográfica inversa desses conjuntos, cujo rank é uma soma de binomiais.
+Assim o rank é uma soma indexada e o unrank são K buscas binárias em uma
+coluna de binomiais, ambos vetorizados sobre milhões de apostas. Só as
+colunas C(a, 0..K) são usadas, então o limite é o próprio C(N, K) caber em
+``int64`` (ex.: 5 de 80 na Quina), não o tamanho do universo.
+"""
+
+from .bitmask import NUMEROS_POR_SORTEIO, TOTAL_NUMEROS
+from .jogos import BITS_PALAVRA, dtype_mascara, mascaras_de_matriz, matriz_incidencia
+from functools import lru_cache
+from math import comb
+import numpy as np
+
+TOTAL_APOSTAS = comb(TOTAL_NUMEROS, NUMEROS_POR_SORTEIO)
+BITS_INDICE = (TOTAL_APOSTAS - 1).bit_length()
+
+# Os binomiais (e os índices) precisam caber em int64
+MAXIMO_BINOMIAL = int(np.iinfo(np.int64).max)
+
+
+@lru_cache(maxsize=None)
+def _binomiais(n, k):
+    """Tabela ``int64`` (n + 1, k + 1) com C(a, b) na linha a, coluna b (0 se b > a)."""
+    tabela = np.array([[comb(a, b) for b in range(k + 1)] for a in range(n + 1)], dtype=np.int64)
+    tabela.flags.writeable = False
+    return tabela
+
+
+def _validar(k, n):
+    if n < 1:
+        raise ValueError("O universo deve ter pelo menos 1 número.")
+    if not 0 < k <= n:
+        raise ValueError(f"K deve estar entre 1 e {n}.")
+    # O maior binomial da tabela é C(n, min(k, n // 2))
+    if comb(n, min(k, n // 2)) > MAXIMO_BINOMIAL:
+        raise ValueError(f"C({n}, {k}) não cabe em um índice de 64 bits.")
+
+
+def total_apostas(k=NUMEROS_POR_SORTEIO, n=TOTAL_NUMEROS):
+    """Quantidade de apostas de ``k`` números entre ``n``: C(n, k)."""
+    _validar(k, n)
+    return comb(n, k)
+
+
+def _ranks_de_posicoes(posicoes, n):
+    """Índices lexicográficos de linhas de posições 0-based já ordenadas."""
+    k = posicoes.shape[1]
+    binomiais = _binomiais(n, k)
+    # A posição i (0-based, crescente) contribui C(n - 1 - posição, k - i)
+    parcelas = binomiais[n - 1 - posicoes, np.arange(k, 0, -1)]
+    return comb(n, k) - 1 - parcelas.sum(axis=1)
+
+
+def indices_de_apostas(apostas, n=TOTAL_NUMEROS):
+    """
+    Índices lexicográficos de várias apostas de uma vez.
+
+    Args:
+        apostas (array-like): Matriz (apostas, K) de números entre 1 e ``n``,
+            em qualquer ordem dentro da linha
+        n (int): Tamanho do universo
+
+    Returns:
+        np.ndarray: Vetor ``int64`` com um índice por aposta
+
+    Raises:
+        ValueError: Se alguma aposta tiver números fora do universo ou repetidos
+    """
+    posicoes = np.sort(np.asarray(apostas, dtype=np.int64), axis=-1) - 1
+    if posicoes.ndim == 1:
+        posicoes = posicoes[np.newaxis, :]
+    _validar(posicoes.shape[1], n)
+    if posicoes.size and (
+        posicoes[:, 0].min() < 0 or posicoes[:, -1].max() >= n
+        or (posicoes.shape[1] > 1 and (np.diff(posicoes, axis=1) == 0).any())
+    ):
+        raise ValueError(f"As apostas devem ter números distintos entre 1 e {n}.")
+    return _ranks_de_posicoes(posicoes, n)
+
+
+def indices_de_mascaras(mascaras, k=NUMEROS_POR_SORTEIO, n=TOTAL_NUMEROS):
+    """
+    Índices lexicográficos a partir das máscaras de bits (bit ``n - 1`` = número ``n``).
+
+    As máscaras são ``uint32`` até 32 números, ``uint64`` até 64 e matrizes
+    (máscaras, palavras) de ``uint64`` acima disso (``data.jogos``).
+
+    Raises:
+        ValueError: Se alguma máscara não tiver exatamente ``k`` números
+    """
+    _validar(k, n)
+    if n <= BITS_PALAVRA:
+        mascaras = np.asarray(mascaras, dtype=dtype_mascara(n))
+    else:
+        mascaras = np.asarray(mascaras, dtype=np.uint64).reshape(-1, -(-n // BITS_PALAVRA))
+    incidencia = matriz_incidencia(mascaras, n)
+    # Bits além do número n contam no popcount mas não na incidência
+    bits = np.bitwise_count(mascaras).reshape(len(incidencia), -1).sum(axis=1)
+    if (bits != k).any() or (incidencia.sum(axis=1) != k).any():
+        raise ValueError(f"Todas as máscaras devem ter {k} números entre 1 e {n}.")
+    # np.nonzero percorre por linha, então as posições de cada aposta saem ordenadas
+    posicoes = np.nonzero(incidencia)[1].reshape(len(incidencia), k)
+    return _ranks_de_posicoes(posicoes, n)
+
+
+def apostas_de_indices(indices, k=NUMEROS_POR_SORTEIO, n=TOTAL_NUMEROS):
+    """
+    Apostas correspondentes a vários índices lexicográficos.
+
+    Args:
+        indices (array-like): Índices entre 0 e C(n, k) - 1
+        k (int): Números por aposta
+        n (int): Tamanho do universo
+
+    Returns:
+        np.ndarray: Matriz ``int8`` (``int16`` acima de 127 números) (índices, k)
+        com as apostas em ordem crescente
+
+    Raises:
+        ValueError: Se algum índice estiver fora do intervalo
+    """
+    _validar(k, n)
+    indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+    total = comb(n, k)
+    if indices.size and (indices.min() < 0 or indices.max() >= total):
+        raise ValueError(f"Os índices devem estar entre 0 e {total - 1}.")
+
+    binomiais = _binomiais(n, k)
+    restante = total - 1 - indices  # rank colexicográfico do complemento espelhado
+    apostas = np.empty((len(indices), k), dtype=np.int8 if n <= np.iinfo(np.int8).max else np.int16)
+    for j in range(k, 0, -1):
+        # Maior b com C(b, j) <= restante; a coluna é não decrescente em b
+        b = np.searchsorted(binomiais[:n, j], restante, side='right') - 1
+        restante -= binomiais[b, j]
+        apostas[:, k - j] = n - b
+    return apostas
+
+
+def mascaras_de_indices(indices, k=NUMEROS_POR_SORTEIO, n=TOTAL_NUMEROS):
+    """Máscaras de bits das apostas de vários índices, no formato de ``indices_de_mascaras``."""
+    return mascaras_de_matriz(apostas_de_indices(indices, k, n), n)
+
+
+def indice_da_aposta(numeros, n=TOTAL_NUMEROS):
+    """Índice lexicográfico de uma aposta (lista de números em qualquer ordem)."""
+    return int(indices_de_apostas([list(numeros)], n)[0])
+
+
+def aposta_do_indice(indice, k=NUMEROS_POR_SORTEIO, n=TOTAL_NUMEROS):
+    """Aposta (lista ordenada de números) de um índice lexicográfico."""
+    return [int(x) for x in apostas_de_indices([indice], k, n)[0]]
+
+
+def fatia_universo(inicio, tamanho, k=NUMEROS_POR_SORTEIO, n=TOTAL_NUMEROS):
+    """
+    Apostas das posições [inicio, inicio + tamanho) da ordem lexicográfica.
+
+    Só a fatia é gerada, então qualquer página do universo custa o mesmo.
+
+    Returns:
+        tuple: (índices da fatia, matriz de apostas), truncados no fim do universo
+    """
+    total = total_apostas(k, n)
+    inicio = min(max(int(inicio), 0), total)
+    indices = np.arange(inicio, min(inicio + max(int(tamanho), 0), total), dtype=np.int64)
+    return indices, apostas_de_indices(indices, k, n)
@@ -0,0 +1,96 @@
+# lotofacil_analyzer/data/datas.py
+"""
+Conversão, feita uma única vez na importação, das colunas de data e de valores.
+
+``Data Sorteio`` vem como texto ``dd/mm/aaaa`` e vira um array
+``datetime64[D]``; a coluna do acumulado da Lotofácil da Independência é usada
+para marcar os concursos especiais (os que pagaram o acumulado).
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNA_DATA = 'Data Sorteio'
+COLUNA_ACUMULADO_ESPECIAL = 'Acumulado sorteio especial Lotofácil da Independência'
+FORMATO_DATA = '%d/%m/%Y'
+DATA_AUSENTE = np.datetime64('NaT', 'D')
+
+
+def ler_datas(textos):
+    """
+    Converte datas ``dd/mm/aaaa`` em ``datetime64[D]``.
+
+    Args:
+        textos (array-like): Datas como texto; valores inválidos viram ``NaT``
+
+    Returns:
+        np.ndarray: Vetor ``datetime64[D]``
+    """
+    datas = pd.to_datetime(pd.Series(textos, dtype=object), format=FORMATO_DATA, errors='coerce')
+    return datas.to_numpy(dtype='datetime64[D]')
+
+
+def valores_monetarios(textos):
+    """
+    Converte valores como ``R$1.234,56`` (ou ``R$0.00``) em float.
+
+    Returns:
+        np.ndarray: Vetor ``float64``; valores inválidos viram ``nan``
+    """
+    serie = pd.Series(textos, dtype=object).astype(str).str.replace('R$', '', regex=False).str.strip()
+    # Com vírgula o ponto é separador de milhar; sem vírgula, separador decimal
+    brasileiro = serie.str.contains(',', regex=False)
+    serie = serie.where(~brasileiro, serie.str.replace('.', '', regex=False).str.replace(',', '.'))
+    return pd.to_numeric(serie, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def sorteios_especiais(acumulado):
+    """
+    Marca os concursos especiais da Lotofácil da Independência.
+
+    O acumulado cresce a cada concurso e é pago (zerado) no especial, então o
+    especial é o concurso em que o acumulado cai em relação ao anterior e
+    continua abaixo dele no concurso seguinte. Uma queda de uma linha só
+    (ex.: o concurso 881, com acumulado zerado entre 27,9 e 28,6 milhões) é
+    erro de digitação da planilha, não pagamento. No último concurso não há
+    como confirmar e a queda basta.
+
+    Args:
+        acumulado (array-like): Valores da coluna do acumulado especial, em
+            ordem de concurso
+
+    Returns:
+        np.ndarray: Vetor booleano, True nos concursos especiais
+    """
+    valores = np.nan_to_num(valores_monetarios(acumulado))
+    especiais = np.zeros(len(valores), dtype=bool)
+    especiais[1:] = (valores[:-1] > 0) & (valores[1:] < valores[:-1])
+    # A queda precisa persistir: o seguinte continua abaixo do valor anterior à queda
+    especiais[1:-1] &= valores[2:] < valores[:-2]
+    return especiais
+
+
+def colunas_de_data(df):
+    """
+    Datas e marcação de especiais de um DataFrame no layout de ``base_dados.csv``.
+
+    Usa as colunas já convertidas (``data``, ``especial``) se existirem;
+    colunas ausentes resultam em ``NaT`` / False.
+
+    Returns:
+        tuple: (datetime64[D], bool), alinhados às linhas do DataFrame
+    """
+    if 'data' in df.columns:
+        datas = df['data'].to_numpy(dtype='datetime64[D]')
+    elif COLUNA_DATA in df.columns:
+        datas = ler_datas(df[COLUNA_DATA])
+    else:
+        datas = np.full(len(df), DATA_AUSENTE)
+
+    if 'especial' in df.columns:
+        especiais = df['especial'].to_numpy(dtype=bool)
+    elif COLUNA_ACUMULADO_ESPECIAL in df.columns:
+        especiais = sorteios_especiais(df[COLUNA_ACUMULADO_ESPECIAL])
+    else:
+        especiais = np.zeros(len(df), dtype=bool)
+    return datas, especiais
@@ -0,0 +1,210 @@
+# lotofacil_analyzer/data/incremental.py
+"""
+Estado agregado dos sorteios que pode ser atualizado sorteio a sorteio.
+
+O mesmo estado é calculado de uma vez (``calcular_estado``) ao publicar o
+histórico completo e atualizado (``atualizar_estado``) quando chegam novos
+sorteios, sem reprocessar o histórico: um sorteio custa algumas operações
+vetorizadas de tamanho fixo, independentemente do tamanho do histórico.
+
+Estado mantido:
+
+- ``frequencias``: aparições de cada número (N,)
+- ``atrasos``: sorteios desde a última aparição de cada número (N,)
+- ``pares``: coocorrências entre números (N, N)
+- ``ewma``: frequência com média móvel exponencial (N,)
+- ``combinacoes_K``: contagem de cada combinação de K números, indexada pelo
+  rank colexicográfico da combinação (C(N, K),), para cada K de
+  ``jogo.tamanhos_combinacoes``
+
+Todas as funções recebem o ``Jogo`` (padrão: Lotofácil, com N = 25 e
+combinações de 3, 4 e 5 números).
+"""
+
+from .jogos import LOTOFACIL
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+import numpy as np
+
+ALFA_EWMA = 0.05
+TAMANHOS_COMBINACOES = LOTOFACIL.tamanhos_combinacoes
+ESTADO_BASE = ('frequencias', 'atrasos', 'pares', 'ewma')
+_TABELAS_COMBINACOES = {}
+
+# Sorteios processados por bloco no cálculo completo (limita a memória das combinações)
+_BLOCO = 20_000
+
+
+def nomes_estado(jogo=LOTOFACIL):
+    """Nomes dos arrays do estado de um jogo."""
+    return ESTADO_BASE + tuple(f'combinacoes_{k}' for k in jogo.tamanhos_combinacoes)
+
+
+ESTADO = nomes_estado()
+
+
+@lru_cache(maxsize=None)
+def _tabelas(total_numeros, numeros_por_sorteio, tamanhos):
+    """
+    Tabelas constantes do rank colexicográfico de um jogo.
+
+    Returns:
+        tuple: ``binomiais[n, k] = C(n, k)``; as posições (dentro de um
+        sorteio ordenado) de cada combinação de K números; e as mesmas
+        posições separadas por coluna, contíguas, para o caminho de um sorteio
+    """
+    binomiais = np.array(
+        [[comb(n, k) for k in range(numeros_por_sorteio + 1)] for n in range(total_numeros + 1)],
+        dtype=np.int64,
+    )
+    posicoes = {
+        k: np.array(list(combinations(range(numeros_por_sorteio), k)), dtype=np.intp)
+        for k in tamanhos
+    }
+    colunas = {k: [np.ascontiguousarray(posicoes[k][:, j]) for j in range(k)] for k in tamanhos}
+    return binomiais, posicoes, colunas
+
+
+def _tabelas_jogo(jogo):
+    return _tabelas(jogo.total_numeros, jogo.numeros_por_sorteio, jogo.tamanhos_combinacoes)
+
+
+def _ordenar(bolas, jogo):
+    """Índices 0..N-1 de cada sorteio, em ordem crescente."""
+    return np.sort(
+        np.asarray(bolas, dtype=np.intp).reshape(-1, jogo.numeros_por_sorteio), axis=1,
+    ) - 1
+
+
+def _ranks(indices, k, tabelas):
+    """Rank colexicográfico de todas as combinações de K números de cada sorteio."""
+    binomiais, posicoes, _ = tabelas
+    selecionados = indices[:, posicoes[k]]
+    return binomiais[selecionados, np.arange(1, k + 1)].sum(axis=2)
+
+
+def _ranks_sorteio(indices, k, tabelas):
+    """``_ranks`` para um único sorteio, com acessos 1-D (bem mais rápido)."""
+    binomiais, _, colunas_posicoes = tabelas
+    parcelas = np.ascontiguousarray(binomiais[indices, 1:k + 1].T)
+    colunas = colunas_posicoes[k]
+    ranks = parcelas[0].take(colunas[0])
+    for j in range(1, k):
+        ranks += parcelas[j].take(colunas[j])
+    return ranks
+
+
+def _incidencia(indices, jogo):
+    incidencia = np.zeros((len(indices), jogo.total_numeros), dtype=np.int32)
+    np.put_along_axis(incidencia, indices, 1, axis=1)
+    return incidencia
+
+
+def estado_vazio(jogo=LOTOFACIL):
+    """Estado de um histórico sem sorteios."""
+    n = jogo.total_numeros
+    estado = {
+        'frequencias': np.zeros(n, dtype=np.int64),
+        'atrasos': np.zeros(n, dtype=np.int32),
+        'pares': np.zeros((n, n), dtype=np.int32),
+        'ewma': np.zeros(n, dtype=np.float64),
+    }
+    for k in jogo.tamanhos_combinacoes:
+        estado[f'combinacoes_{k}'] = np.zeros(comb(n, k), dtype=np.int32)
+    return estado
+
+
+def calcular_estado(bolas, jogo=LOTOFACIL):
+    """
+    Calcula o estado completo de um histórico.
+
+    Args:
+        bolas (np.ndarray): Matriz (sorteios, K) em ordem cronológica
+        jogo (Jogo): Jogo dos sorteios
+
+    Returns:
+        dict: Arrays do estado, indexados pelos nomes de ``nomes_estado(jogo)``
+    """
+    indices = _ordenar(bolas, jogo)
+    total = len(indices)
+    estado = estado_vazio(jogo)
+    if not total:
+        return estado
+
+    tabelas = _tabelas_jogo(jogo)
+    incidencia = _incidencia(indices, jogo)
+    presente = incidencia.astype(bool)
+    ultima_aparicao = np.where(
+        presente.any(axis=0), total - 1 - np.argmax(presente[::-1], axis=0), -1,
+    )
+    pesos = ALFA_EWMA * (1 - ALFA_EWMA) ** np.arange(total - 1, -1, -1, dtype=np.float64)
+
+    estado['frequencias'] = incidencia.sum(axis=0).astype(np.int64)
+    estado['atrasos'] = (total - 1 - ultima_aparicao).astype(np.int32)
+    estado['pares'] = incidencia.T @ incidencia
+    estado['ewma'] = pesos @ incidencia
+    for k in jogo.tamanhos_combinacoes:
+        contagem = estado[f'combinacoes_{k}']
+        for inicio in range(0, total, _BLOCO):
+            ranks = _ranks(indices[inicio:inicio + _BLOCO], k, tabelas)
+            contagem += np.bincount(ranks.ravel(), minlength=len(contagem)).astype(np.int32)
+    return estado
+
+
+def atualizar_estado(estado, bolas, jogo=LOTOFACIL):
+    """
+    Incorpora novos sorteios a um estado existente, em ordem cronológica.
+
+    Args:
+        estado (dict): Estado a atualizar (modificado no lugar)
+        bolas (np.ndarray): Matriz (novos sorteios, K)
+        jogo (Jogo): Jogo dos sorteios
+
+    Returns:
+        dict: O próprio ``estado``
+    """
+    tabelas = _tabelas_jogo(jogo)
+    for indices in _ordenar(bolas, jogo):
+        estado['frequencias'][indices] += 1
+        estado['atrasos'] += 1
+        estado['atrasos'][indices] = 0
+        estado['pares'][np.ix_(indices, indices)] += 1
+        estado['ewma'] *= 1 - ALFA_EWMA
+        estado['ewma'][indices] += ALFA_EWMA
+        for k in jogo.tamanhos_combinacoes:
+            # Ranks de um mesmo sorteio são distintos, então a soma indexada é segura
+            estado[f'combinacoes_{k}'][_ranks_sorteio(indices, k, tabelas)] += 1
+    return estado
+
+
+def tabela_combinacoes(k, jogo=LOTOFACIL):
+    """
+    Combinações de K números (1..N) indexadas pelo rank colexicográfico.
+
+    Returns:
+        np.ndarray: Matriz (C(N, K), K) com as combinações
+    """
+    chave = (jogo.total_numeros, k)
+    if chave not in _TABELAS_COMBINACOES:
+        binomiais = _tabelas_jogo(jogo)[0]
+        todas = np.array(list(combinations(range(jogo.total_numeros), k)), dtype=np.intp)
+        tabela = np.empty_like(todas)
+        tabela[binomiais[todas, np.arange(1, k + 1)].sum(axis=1)] = todas
+        _TABELAS_COMBINACOES[chave] = (tabela + 1).astype(jogo.dtype_bolas)
+    return _TABELAS_COMBINACOES[chave]
+
+
+def combinacoes_mais_frequentes(estado, k, quantidade=10, jogo=LOTOFACIL):
+    """
+    Combinações de K números mais frequentes segundo o estado.
+
+    Returns:
+        list: Pares (tupla de números, frequência), da mais para a menos frequente
+    """
+    contagem = np.asarray(estado[f'combinacoes_{k}'])
+    quantidade = min(quantidade, len(contagem))
+    melhores = np.argpartition(-contagem, quantidade - 1)[:quantidade]
+    melhores = melhores[np.argsort(-contagem[melhores], kind='stable')]
+    tabela = tabela_combinacoes(k, jogo)
+    return [(tuple(int(n) for n in tabela[r]), int(contagem[r])) for r in melhores]
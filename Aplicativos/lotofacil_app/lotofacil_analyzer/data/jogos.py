@@ -0,0 +1,304 @@
+# lotofacil_analyzer/data/jogos.py
+"""
+Loterias do tipo "K números sorteados entre N" e suas máscaras de bits.
+
+Um ``Jogo`` reúne o tamanho do universo, os números por sorteio, as faixas
+premiadas e as operações vetorizadas sobre as máscaras daquele jogo. O
+número ``n`` ocupa o bit ``n - 1`` e a representação depende do universo:
+
+- até 32 números: um ``uint32`` por sorteio (Lotofácil);
+- até 64 números: um ``uint64`` por sorteio (ex.: Mega-Sena);
+- acima de 64: uma matriz (sorteios, palavras) de ``uint64``, com a palavra
+  ``p`` guardando os números ``64p + 1`` a ``64p + 64`` (ex.: Quina).
+
+Em todos os casos os acertos são o popcount do ``AND`` entre as máscaras,
+somado entre as palavras. Jogos adicionais podem ser declarados em
+``settings.LOTOFACIL_JOGOS`` ({chave: argumentos de ``Jogo``}).
+"""
+
+from django.conf import settings
+from math import comb
+import numpy as np
+
+BITS_PALAVRA = 64
+
+
+def dtype_mascara(total_numeros):
+    """Tipo de cada palavra da máscara de um universo de ``total_numeros`` números."""
+    return np.uint32 if total_numeros <= 32 else np.uint64
+
+
+def mascaras_de_matriz(matriz, total_numeros):
+    """
+    Converte uma matriz (n, k) de números de um universo de ``total_numeros`` em máscaras.
+
+    Returns:
+        np.ndarray: Vetor (n,) de máscaras, ou matriz (n, palavras) acima de
+        64 números
+    """
+    matriz = np.asarray(matriz, dtype=np.int64)
+    if matriz.ndim == 1:
+        matriz = matriz[np.newaxis, :]
+    if total_numeros <= BITS_PALAVRA:
+        bits = np.left_shift(np.uint64(1), (matriz - 1).astype(np.uint64))
+        return np.bitwise_or.reduce(bits, axis=1).astype(dtype_mascara(total_numeros))
+
+    posicoes = matriz - 1
+    palavras = posicoes // BITS_PALAVRA
+    bits = np.left_shift(np.uint64(1), (posicoes % BITS_PALAVRA).astype(np.uint64))
+    mascaras = np.empty((len(matriz), -(-total_numeros // BITS_PALAVRA)), dtype=np.uint64)
+    for palavra in range(mascaras.shape[1]):
+        mascaras[:, palavra] = np.bitwise_or.reduce(
+            np.where(palavras == palavra, bits, np.uint64(0)), axis=1,
+        )
+    return mascaras
+
+
+def matriz_incidencia(mascaras, total_numeros):
+    """
+    Expande máscaras de um universo de ``total_numeros`` em uma matriz booleana (n, N).
+
+    Returns:
+        np.ndarray: Matriz booleana onde a coluna ``j`` indica o número ``j + 1``
+    """
+    if total_numeros <= BITS_PALAVRA:
+        dtype = dtype_mascara(total_numeros)
+        mascaras = np.asarray(mascaras, dtype=dtype)
+        deslocamentos = np.arange(total_numeros, dtype=dtype)
+        return (mascaras[:, np.newaxis] >> deslocamentos) & 1 == 1
+
+    palavras = -(-total_numeros // BITS_PALAVRA)
+    mascaras = np.asarray(mascaras, dtype=np.uint64).reshape(-1, palavras)
+    posicoes = np.arange(total_numeros)
+    deslocamentos = (posicoes % BITS_PALAVRA).astype(np.uint64)
+    return (mascaras[:, posicoes // BITS_PALAVRA] >> deslocamentos) & 1 == 1
+
+
+class Jogo:
+    """Configuração de uma loteria e operações sobre as máscaras dos seus sorteios"""
+
+    def __init__(self, chave, nome, total_numeros, numeros_por_sorteio, faixas_premiadas,
+                 tamanhos_combinacoes=(2, 3)):
+        """
+        Inicializa o jogo
+
+        Args:
+            chave (str): Identificador curto (ex.: 'mega_sena'), usado em
+                diretórios e parâmetros
+            nome (str): Nome de exibição
+            total_numeros (int): Tamanho do universo (N)
+            numeros_por_sorteio (int): Números sorteados por concurso (K)
+            faixas_premiadas (tuple): Quantidades de acertos que premiam
+            tamanhos_combinacoes (tuple): Tamanhos das combinações contadas
+                no estado agregado de ``data.incremental``
+
+        Raises:
+            ValueError: Se os tamanhos forem incoerentes entre si
+        """
+        if not 0 < numeros_por_sorteio <= total_numeros:
+            raise ValueError("Os números por sorteio devem estar entre 1 e o total de números.")
+        if not all(0 <= faixa <= numeros_por_sorteio for faixa in faixas_premiadas):
+            raise ValueError(f"As faixas premiadas devem estar entre 0 e {numeros_por_sorteio}.")
+        if not all(0 < k <= numeros_por_sorteio for k in tamanhos_combinacoes):
+            raise ValueError(f"Os tamanhos de combinação devem estar entre 1 e {numeros_por_sorteio}.")
+
+        self.chave = chave
+        self.nome = nome
+        self.total_numeros = int(total_numeros)
+        self.numeros_por_sorteio = int(numeros_por_sorteio)
+        self.faixas_premiadas = tuple(sorted(faixas_premiadas))
+        self.tamanhos_combinacoes = tuple(sorted(tamanhos_combinacoes))
+        self.colunas_bolas = [f'Bola{i}' for i in range(1, self.numeros_por_sorteio + 1)]
+        self.palavras = -(-self.total_numeros // BITS_PALAVRA)
+        self.dtype_mascara = dtype_mascara(self.total_numeros)
+        self.dtype_bolas = np.int8 if self.total_numeros <= np.iinfo(np.int8).max else np.int16
+
+    def __repr__(self):
+        return f'Jogo({self.chave!r}, {self.numeros_por_sorteio} de {self.total_numeros})'
+
+    def __eq__(self, outro):
+        return isinstance(outro, Jogo) and self._identidade() == outro._identidade()
+
+    def __hash__(self):
+        return hash(self._identidade())
+
+    def _identidade(self):
+        return (self.chave, self.total_numeros, self.numeros_por_sorteio)
+
+    @property
+    def numeros(self):
+        """Números do universo, de 1 a N."""
+        return range(1, self.total_numeros + 1)
+
+    @property
+    def total_apostas(self):
+        """Apostas simples possíveis: C(N, K)."""
+        return comb(self.total_numeros, self.numeros_por_sorteio)
+
+    @property
+    def _forma_palavras(self):
+        """Dimensões de uma máscara: escalar com uma palavra, vetor de palavras acima de 64 números."""
+        return () if self.palavras == 1 else (self.palavras,)
+
+    # ------------------------------------------------------------- conversões
+
+    def mascaras_de_matriz(self, matriz):
+        """
+        Converte uma matriz (n, k) de números em máscaras.
+
+        Args:
+            matriz (array-like): Cada linha é uma aposta ou sorteio
+
+        Returns:
+            np.ndarray: Vetor (n,) de máscaras, ou matriz (n, palavras) acima
+            de 64 números
+        """
+        return mascaras_de_matriz(matriz, self.total_numeros)
+
+    def mascaras_de_textos(self, textos):
+        """
+        Converte apostas gravadas como texto ("1,2,...") em máscaras, sem laço por aposta.
+
+        Args:
+            textos (list): Apostas com ``numeros_por_sorteio`` números separados por vírgula
+
+        Returns:
+            np.ndarray: Máscaras no formato de ``mascaras_de_matriz``
+        """
+        if not textos:
+            return np.empty((0,) + self._forma_palavras, dtype=self.dtype_mascara)
+        numeros = np.array(','.join(textos).split(','), dtype=np.int64)
+        return self.mascaras_de_matriz(numeros.reshape(len(textos), self.numeros_por_sorteio))
+
+    def mascaras_do_df(self, df):
+        """
+        Extrai as máscaras dos sorteios de um DataFrame com as colunas ``Bola1..BolaK``.
+
+        Returns:
+            np.ndarray: Máscaras no formato de ``mascaras_de_matriz``
+        """
+        return self.mascaras_de_matriz(df[self.colunas_bolas].to_numpy())
+
+    def numeros_da_mascara(self, valor):
+        """
+        Converte uma máscara de volta para a lista ordenada de números.
+
+        Args:
+            valor (int | np.ndarray): Máscara (inteiro ou linha de palavras)
+
+        Returns:
+            list: Números ligados na máscara, em ordem crescente
+        """
+        if np.ndim(valor):
+            valor = sum(int(p) << (BITS_PALAVRA * i) for i, p in enumerate(np.ravel(valor)))
+        valor = int(valor)
+        return [n + 1 for n in range(self.total_numeros) if valor >> n & 1]
+
+    def matriz_incidencia(self, mascaras):
+        """
+        Expande máscaras em uma matriz booleana (n, N) de presença.
+
+        Returns:
+            np.ndarray: Matriz booleana onde a coluna ``j`` indica o número ``j + 1``
+        """
+        return matriz_incidencia(mascaras, self.total_numeros)
+
+    # --------------------------------------------------------------- kernels
+
+    def contar_numeros(self, mascaras):
+        """Quantidade de números ligados em cada máscara."""
+        mascaras = np.asarray(mascaras, dtype=self.dtype_mascara)
+        if self.palavras == 1:
+            return np.bitwise_count(mascaras)
+        return np.bitwise_count(mascaras).sum(axis=-1, dtype=np.uint8)
+
+    def acertos(self, apostas, sorteios):
+        """
+        Calcula a matriz de acertos entre apostas e sorteios.
+
+        Args:
+            apostas (np.ndarray): Máscaras das apostas
+            sorteios (np.ndarray): Máscaras dos sorteios
+
+        Returns:
+            np.ndarray: Matriz ``uint8`` (apostas, sorteios) com o número de acertos
+        """
+        apostas = np.asarray(apostas, dtype=self.dtype_mascara)
+        sorteios = np.asarray(sorteios, dtype=self.dtype_mascara)
+        if self.palavras == 1:
+            return np.bitwise_count(apostas[:, np.newaxis] & sorteios[np.newaxis, :])
+        return np.bitwise_count(
+            apostas[:, np.newaxis, :] & sorteios[np.newaxis, :, :]
+        ).sum(axis=2, dtype=np.uint8)
+
+    def sortear_mascaras(self, rng, quantidade, k=None):
+        """
+        Sorteia máscaras uniformes de ``k`` números do universo, de forma vetorizada.
+
+        Args:
+            rng (np.random.Generator): Gerador de números aleatórios
+            quantidade (int): Quantidade de máscaras
+            k (int, optional): Números por máscara (padrão: ``numeros_por_sorteio``)
+
+        Returns:
+            np.ndarray: Máscaras no formato de ``mascaras_de_matriz``
+        """
+        k = k or self.numeros_por_sorteio
+        chaves = rng.random((quantidade, self.total_numeros), dtype=np.float32)
+        escolhidos = np.argpartition(chaves, k - 1, axis=1)[:, :k]
+        if self.palavras > 1:
+            return self.mascaras_de_matriz(escolhidos + 1)
+        bits = np.left_shift(self.dtype_mascara(1), escolhidos.astype(self.dtype_mascara))
+        return np.bitwise_or.reduce(bits, axis=1)
+
+    def probabilidades_acertos(self):
+        """
+        Distribuição hipergeométrica de acertos de uma aposta simples.
+
+        Returns:
+            np.ndarray: Probabilidade de 0..K acertos para uma aposta aleatória
+        """
+        k = self.numeros_por_sorteio
+        fora = self.total_numeros - k
+        return np.array([
+            comb(k, acertos) * comb(fora, k - acertos) / self.total_apostas
+            for acertos in range(k + 1)
+        ])
+
+
+LOTOFACIL = Jogo('lotofacil', 'Lotofácil', 25, 15, (11, 12, 13, 14, 15), (3, 4, 5))
+
+JOGOS = {
+    jogo.chave: jogo
+    for jogo in (
+        LOTOFACIL,
+        Jogo('mega_sena', 'Mega-Sena', 60, 6, (4, 5, 6), (2, 3, 4)),
+        Jogo('quina', 'Quina', 80, 5, (2, 3, 4, 5), (2, 3)),
+    )
+}
+
+
+def jogos_disponiveis():
+    """Jogos embutidos mais os declarados em ``settings.LOTOFACIL_JOGOS``."""
+    configurados = getattr(settings, 'LOTOFACIL_JOGOS', None) or {}
+    return {
+        **JOGOS,
+        **{chave: Jogo(chave, **argumentos) for chave, argumentos in configurados.items()},
+    }
+
+
+def obter_jogo(jogo=None):
+    """
+    Resolve um jogo pela chave (None = Lotofácil; um ``Jogo`` é devolvido como está).
+
+    Raises:
+        ValueError: Se a chave não for de um jogo disponível
+    """
+    if jogo is None:
+        return LOTOFACIL
+    if isinstance(jogo, Jogo):
+        return jogo
+    disponiveis = JOGOS if jogo in JOGOS else jogos_disponiveis()
+    if jogo not in disponiveis:
+        raise ValueError(f"Jogo desconhecido: {jogo} (disponíveis: {', '.join(disponiveis)})")
+    return disponiveis[jogo]
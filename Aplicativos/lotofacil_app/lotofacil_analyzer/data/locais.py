@@ -0,0 +1,211 @@
+# lotofacil_analyzer/data/locais.py
+"""
+Locais dos ganhadores de 15 acertos, explodidos e codificados uma única vez.
+
+A coluna ``Cidade / UF`` traz textos como ``"BA; PR; SP"`` (concursos
+antigos, só a UF) ou ``"CANAL ELETRONICO; SAO PAULO/SP"``. Cada local vira
+uma entrada de uma tabela achatada, ordenada por sorteio, com a UF e a cidade
+como códigos inteiros de categorias; os rótulos são normalizados (maiúsculas,
+sem acentos), então ``SÃO PAULO/SP`` e ``SAO PAULO/SP`` são a mesma cidade.
+"""
+
+from .datas import valores_monetarios
+import unicodedata
+import numpy as np
+import pandas as pd
+
+COLUNA_LOCAIS = 'Cidade / UF'
+COLUNA_GANHADORES = 'Ganhadores 15 acertos'
+COLUNA_RATEIO = 'Rateio 15 acertos'
+CANAL_ELETRONICO = 'CANAL ELETRONICO'
+SEM_CIDADE = -1
+UFS = (
+    'AC', 'AL', 'AM', 'AP', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MG', 'MS', 'MT', 'PA',
+    'PB', 'PE', 'PI', 'PR', 'RJ', 'RN', 'RO', 'RR', 'RS', 'SC', 'SE', 'SP', 'TO',
+)
+
+# Arrays publicados no armazém (por sorteio e por local)
+ARRAYS_LOCAIS = (
+    'ganhadores', 'rateios', 'locais_sorteio', 'locais_uf', 'locais_cidade', 'ufs', 'cidades',
+)
+
+
+def normalizar_local(texto):
+    """Maiúsculas, sem acentos e com espaços simples (``'São  Paulo/sp'`` -> ``'SAO PAULO/SP'``)."""
+    texto = unicodedata.normalize('NFKD', str(texto))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.upper().split()).replace(' /', '/').replace('/ ', '/')
+
+
+def _uf_e_cidade(local):
+    """Separa um local normalizado em (UF, cidade ou None)."""
+    if local == CANAL_ELETRONICO:
+        return CANAL_ELETRONICO, CANAL_ELETRONICO
+    cidade, barra, uf = local.rpartition('/')
+    if uf not in UFS:
+        # O arquivo tem UFs truncadas (ex.: 'FORTALEZA/C'); só corrige se não houver ambiguidade
+        candidatas = [sigla for sigla in UFS if uf and sigla.startswith(uf)]
+        if len(candidatas) == 1:
+            uf = candidatas[0]
+    if not barra:
+        return uf, None
+    return uf, f'{cidade}/{uf}'
+
+
+def _codificar(rotulos, existentes):
+    """Códigos de ``rotulos`` nas categorias ``existentes``, acrescentando as novas no fim."""
+    indices = {rotulo: codigo for codigo, rotulo in enumerate(existentes)}
+    categorias = list(existentes)
+    codigos = np.empty(len(rotulos), dtype=np.int64)
+    for i, rotulo in enumerate(rotulos):
+        if rotulo is None:
+            codigos[i] = SEM_CIDADE
+            continue
+        if rotulo not in indices:
+            indices[rotulo] = len(categorias)
+            categorias.append(rotulo)
+        codigos[i] = indices[rotulo]
+    return codigos, categorias
+
+
+def _rotulos(categorias):
+    return np.array(categorias, dtype=str) if categorias else np.array([], dtype='<U1')
+
+
+def calcular_locais(df):
+    """
+    Explode e codifica os locais dos ganhadores de um DataFrame.
+
+    Só os valores distintos da coluna são normalizados, então o custo
+    depende da variedade de textos e não do número de sorteios.
+
+    Args:
+        df (pd.DataFrame): DataFrame no layout de ``base_dados.csv``, em
+            ordem de concurso
+
+    Returns:
+        dict: ``ganhadores`` e ``rateios`` por sorteio; ``locais_sorteio``
+        (posição do sorteio), ``locais_uf`` e ``locais_cidade`` por local
+        (``SEM_CIDADE`` quando só a UF foi informada); rótulos ``ufs`` e ``cidades``
+    """
+    total = len(df)
+    ganhadores = (
+        pd.to_numeric(df[COLUNA_GANHADORES], errors='coerce').fillna(0).to_numpy(dtype=np.int32)
+        if COLUNA_GANHADORES in df.columns else np.zeros(total, dtype=np.int32)
+    )
+    rateios = (
+        valores_monetarios(df[COLUNA_RATEIO]) if COLUNA_RATEIO in df.columns
+        else np.full(total, np.nan)
+    )
+    if COLUNA_LOCAIS not in df.columns:
+        return {
+            'ganhadores': ganhadores, 'rateios': rateios, **locais_vazios(),
+        }
+
+    textos = df[COLUNA_LOCAIS]
+    if not isinstance(textos.dtype, pd.CategoricalDtype):
+        textos = textos.astype('category')
+    distintos = textos.cat.categories
+    # Locais de cada texto distinto: [(uf, cidade), ...]; ausentes têm código -1
+    partes = [
+        [_uf_e_cidade(normalizar_local(p)) for p in str(texto).split(';') if p.strip()]
+        for texto in distintos
+    ]
+    quantidades = np.array([len(p) for p in partes], dtype=np.int64)
+    codigos_uf, ufs = _codificar([uf for p in partes for uf, _ in p], [])
+    codigos_cidade, cidades = _codificar([cidade for p in partes for _, cidade in p], [])
+
+    # Entradas de cada texto distinto ficam contíguas em codigos_*
+    codigos_texto = textos.cat.codes.to_numpy().astype(np.int64)
+    codigos_texto[codigos_texto < 0] = len(distintos)
+    quantidades = np.append(quantidades, 0)
+    inicios = np.concatenate([[0], np.cumsum(quantidades)[:-1]])
+    por_sorteio = quantidades[codigos_texto]
+    sorteio = np.repeat(np.arange(total, dtype=np.int32), por_sorteio)
+    primeira = np.repeat(np.cumsum(por_sorteio) - por_sorteio, por_sorteio)
+    entradas = inicios[codigos_texto[sorteio]] + np.arange(len(sorteio)) - primeira
+
+    return {
+        'ganhadores': ganhadores,
+        'rateios': rateios,
+        'locais_sorteio': sorteio,
+        'locais_uf': codigos_uf[entradas].astype(np.int16),
+        'locais_cidade': codigos_cidade[entradas].astype(np.int32),
+        'ufs': _rotulos(ufs),
+        'cidades': _rotulos(cidades),
+    }
+
+
+def locais_vazios():
+    """Tabela de locais sem entradas (sorteios vindos do banco, sem a coluna de locais)."""
+    return {
+        'locais_sorteio': np.zeros(0, dtype=np.int32),
+        'locais_uf': np.zeros(0, dtype=np.int16),
+        'locais_cidade': np.zeros(0, dtype=np.int32),
+        'ufs': _rotulos([]),
+        'cidades': _rotulos([]),
+    }
+
+
+def selecionar_sorteios(locais, posicoes):
+    """
+    Reordena/filtra os sorteios de uma tabela de locais.
+
+    Args:
+        locais (dict): Saída de ``calcular_locais``
+        posicoes (np.ndarray): Posições dos sorteios mantidos, na nova ordem
+
+    Returns:
+        dict: Tabela com ``locais_sorteio`` renumerado e entradas na nova ordem
+    """
+    posicoes = np.asarray(posicoes, dtype=np.int64)
+    nova = np.full(len(locais['ganhadores']), -1, dtype=np.int64)
+    nova[posicoes] = np.arange(len(posicoes))
+    sorteio = nova[locais['locais_sorteio']]
+    ordem = np.argsort(np.where(sorteio < 0, len(posicoes), sorteio), kind='stable')
+    ordem = ordem[sorteio[ordem] >= 0]
+    return {
+        **locais,
+        'ganhadores': locais['ganhadores'][posicoes],
+        'rateios': locais['rateios'][posicoes],
+        'locais_sorteio': sorteio[ordem].astype(np.int32),
+        'locais_uf': locais['locais_uf'][ordem],
+        'locais_cidade': locais['locais_cidade'][ordem],
+    }
+
+
+def juntar_locais(atuais, novos, publicados):
+    """
+    Acrescenta a tabela de locais de sorteios novos à de uma geração publicada.
+
+    Os códigos dos novos são traduzidos para as categorias publicadas, que só
+    crescem, então os códigos já publicados continuam válidos.
+
+    Args:
+        atuais (dict): Arrays de locais da geração vigente
+        novos (dict): Saída de ``calcular_locais`` para os sorteios novos
+        publicados (int): Sorteios da geração vigente
+
+    Returns:
+        dict: Arrays de locais da nova geração
+    """
+    ufs_novas = list(novos['ufs'])
+    cidades_novas = list(novos['cidades'])
+    traducao_uf, ufs = _codificar(ufs_novas, [str(u) for u in atuais['ufs']])
+    traducao_cidade, cidades = _codificar(cidades_novas, [str(c) for c in atuais['cidades']])
+    traducao_cidade = np.append(traducao_cidade, SEM_CIDADE)  # índice -1 = SEM_CIDADE
+    return {
+        'ganhadores': np.concatenate([atuais['ganhadores'], novos['ganhadores']]),
+        'rateios': np.concatenate([atuais['rateios'], novos['rateios']]),
+        'locais_sorteio': np.concatenate([
+            atuais['locais_sorteio'], novos['locais_sorteio'] + np.int32(publicados),
+        ]).astype(np.int32),
+        'locais_uf': np.concatenate([
+            atuais['locais_uf'], traducao_uf[novos['locais_uf']],
+        ]).astype(np.int16),
+        'locais_cidade': np.concatenate([
+            atuais['locais_cidade'], traducao_cidade[novos['locais_cidade']],
+        ]).astype(np.int32),
+        'ufs': _rotulos(ufs),
+        'cidades': _rotulos(cidades),
+    }
@@ -4,20 +4,24 @@ import pandas as pd
 import os
 from pathlib import Path
 from django.conf import settings
+import logging
 import numpy as np
 from typing import List, Dict, Tuple, Any
+from ..metrics import instrumentar
+from .datas import COLUNA_ACUMULADO_ESPECIAL, COLUNA_DATA, ler_datas, sorteios_especiais
+from .jogos import obter_jogo
+
+logger = logging.getLogger(__name__)
 
 class LotofacilDataImporter:
     """
     Classe responsável por importar e processar os dados da Lotofácil a partir de arquivos CSV.
     """
-    
-    print("Módulo processor.py sendo carregado...")  # Adicione esta linha no início do arquivo
 
 class LotofacilDataImporter:
-    def __init__(self, file_path=None):
-        print(f"Inicializando LotofacilDataImporter com file_path: {file_path}")  # Adicione esta linha
+    def __init__(self, file_path=None, jogo=None):
         self.file_path = file_path
+        self.jogo = obter_jogo(jogo)
         if not file_path:
             data_dir = Path(settings.BASE_DIR) / 'lotofacil_analyzer' / 'data' / 'files'
             os.makedirs(data_dir, exist_ok=True)
@@ -25,11 +29,11 @@ class LotofacilDataImporter:
         
         self.resultados = None
     
+    @instrumentar('importacao')
     def importar_csv(self) -> pd.DataFrame:
-        print("Método importar_csv sendo chamado...")  # Adicione esta linha
         try:
             # Verificar se o arquivo existe
-            print(f"Tentando ler o arquivo: {self.file_path}")
+            logger.debug("Lendo o arquivo %s", self.file_path)
             if not os.path.exists(self.file_path):
                 raise FileNotFoundError(f"Arquivo não encontrado: {self.file_path}")
             
@@ -37,16 +41,22 @@ class LotofacilDataImporter:
             df = pd.read_csv(self.file_path)
             
             # Criar coluna de números
-            bolas_colunas = [f'Bola{i}' for i in range(1, 16)]
+            bolas_colunas = self.jogo.colunas_bolas
             df['numeros'] = df[bolas_colunas].apply(
                 lambda row: [int(row[col]) for col in bolas_colunas], 
                 axis=1
             )
+
+            # Datas convertidas uma única vez; a marcação de especiais depende da ordem
+            df = df.sort_values('Concurso', ignore_index=True)
+            df['data'] = ler_datas(df[COLUNA_DATA])
+            if COLUNA_ACUMULADO_ESPECIAL in df.columns:
+                df['especial'] = sorteios_especiais(df[COLUNA_ACUMULADO_ESPECIAL])
             
             self.resultados = df
             return df
         except Exception as e:
-            print(f"Erro detalhado: {e}")  # Adicione esta linha
+            logger.error("Falha ao importar %s: %s", self.file_path, e)
             raise Exception(f"Erro ao importar o arquivo CSV: {str(e)}")
         
         def _normalizar_colunas(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -0,0 +1,550 @@
+# lotofacil_analyzer/data/store.py
+"""
+Armazenamento versionado dos sorteios processados em arquivos mapeados em memória.
+
+Cada publicação grava um diretório ``geracao_NNNNNN`` com arrays ``.npy`` e só
+então troca, via ``os.replace``, o arquivo ``ATUAL`` que aponta para a geração
+vigente. Os processos de trabalho do servidor abrem os arrays com
+``mmap_mode='r'``, de modo que as páginas são compartilhadas pelo sistema
+operacional e a memória por processo não cresce com o número de workers.
+
+As datas (``datetime64[D]``) e a marcação dos concursos especiais também são
+publicadas, já convertidas (``data.datas``), assim como a tabela codificada
+dos locais dos ganhadores (``data.locais``).
+
+Além dos sorteios, cada geração guarda o estado agregado de
+``data.incremental``. Novos sorteios são anexados (``anexar``) atualizando
+esse estado a partir da geração anterior, sem reprocessar o histórico; a
+troca do ponteiro é também a troca de versão das chaves de cache.
+
+Cada armazém guarda os sorteios de um ``Jogo``: a Lotofácil usa o diretório
+configurado e os demais jogos um subdiretório com a chave do jogo.
+
+Toda nova geração vigente dispara o sinal ``geracao_publicada``, fora da trava.
+"""
+
+from .datas import DATA_AUSENTE, colunas_de_data
+from .incremental import ESTADO, atualizar_estado, calcular_estado, nomes_estado
+from .jogos import LOTOFACIL, obter_jogo
+from .locais import ARRAYS_LOCAIS, calcular_locais, juntar_locais, locais_vazios, selecionar_sorteios
+from ..metrics import medir
+from django.conf import settings
+from django.db import DatabaseError
+from django.dispatch import Signal
+from pathlib import Path
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+import numpy as np
+import pandas as pd
+
+ARQUIVO_PONTEIRO = 'ATUAL'
+PREFIXO_GERACAO = 'geracao_'
+GERACOES_MANTIDAS = 3
+ARQUIVO_TRAVA = '.trava'
+
+# Versão do conjunto de arrays (e de como são derivados, ex.: especiais);
+# gerações de outro formato são republicadas
+FORMATO = 5
+ARRAYS_SORTEIOS = ('concursos', 'bolas', 'mascaras', 'datas', 'especiais') + ARRAYS_LOCAIS
+ARRAYS = ARRAYS_SORTEIOS + ESTADO
+
+try:
+    import fcntl
+except ImportError:  # Windows: só há a trava entre threads
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Enviado depois que uma geração se torna vigente (argumentos: ``armazem`` e ``geracao``)
+geracao_publicada = Signal()
+
+
+def nomes_arrays(jogo=LOTOFACIL):
+    """Nomes dos arrays publicados para um jogo."""
+    return ARRAYS_SORTEIOS + nomes_estado(jogo)
+
+
+def calcular_arrays(df, jogo=LOTOFACIL):
+    """
+    Calcula os arrays publicados a partir de um DataFrame de sorteios.
+
+    Args:
+        df (pd.DataFrame): DataFrame no layout de ``base_dados.csv``, com as
+            colunas ``Bola1..BolaK`` do jogo
+        jogo (Jogo): Jogo dos sorteios
+
+    Returns:
+        dict: Arrays numpy indexados pelo nome do arquivo
+    """
+    df = df.sort_values('Concurso')
+    bolas = df[jogo.colunas_bolas].to_numpy(dtype=jogo.dtype_bolas)
+    datas, especiais = colunas_de_data(df)
+    return {
+        'concursos': df['Concurso'].to_numpy(dtype=np.int32),
+        'bolas': bolas,
+        'mascaras': jogo.mascaras_de_matriz(bolas),
+        'datas': datas,
+        'especiais': especiais,
+        **calcular_locais(df),
+        **calcular_estado(bolas, jogo),
+    }
+
+
+class ArmazemSorteios:
+    """Publica e lê as gerações dos dados processados de sorteios"""
+
+    def __init__(self, diretorio=None, jogo=None):
+        """
+        Inicializa o armazém
+
+        Args:
+            diretorio (str, optional): Diretório das gerações (padrão:
+                ``settings.LOTOFACIL_DIRETORIO_PROCESSADOS``, ou o
+                subdiretório com a chave do jogo para outros jogos)
+            jogo (Jogo | str, optional): Jogo dos sorteios (padrão: Lotofácil)
+        """
+        self.jogo = obter_jogo(jogo)
+        if diretorio is None:
+            diretorio = Path(settings.LOTOFACIL_DIRETORIO_PROCESSADOS)
+            if self.jogo != LOTOFACIL:
+                diretorio = diretorio / self.jogo.chave
+        self.diretorio = Path(diretorio)
+        self.nomes_arrays = nomes_arrays(self.jogo)
+        self._lock = threading.Lock()
+        self._lock_publicacao = threading.Lock()
+        self._ponteiro_stat = None
+        self.geracao = None
+        self.meta = {}
+        self.arrays = {}
+
+    # ------------------------------------------------------------------ leitura
+
+    def _ler_ponteiro(self):
+        """Lê a geração vigente; retorna None se nada foi publicado."""
+        try:
+            return int((self.diretorio / ARQUIVO_PONTEIRO).read_text().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def atualizar(self):
+        """
+        Remapeia os arrays se uma nova geração foi publicada.
+
+        Returns:
+            bool: True se há uma geração disponível
+        """
+        caminho = self.diretorio / ARQUIVO_PONTEIRO
+        try:
+            stat = caminho.stat()
+            assinatura = (stat.st_mtime_ns, stat.st_ino)
+        except FileNotFoundError:
+            return self.geracao is not None
+
+        if assinatura == self._ponteiro_stat:
+            return True
+
+        with self._lock:
+            geracao = self._ler_ponteiro()
+            if geracao is None:
+                return self.geracao is not None
+            if geracao != self.geracao:
+                pasta = self.diretorio / f'{PREFIXO_GERACAO}{geracao:06d}'
+                # Gerações de formatos anteriores podem não ter todos os arrays
+                self.arrays = {
+                    nome: np.load(pasta / f'{nome}.npy', mmap_mode='r')
+                    for nome in self.nomes_arrays if (pasta / f'{nome}.npy').exists()
+                }
+                self.meta = json.loads((pasta / 'meta.json').read_text())
+                self.meta.setdefault('publicado_em', (pasta / 'meta.json').stat().st_mtime)
+                self.geracao = geracao
+            self._ponteiro_stat = assinatura
+        return True
+
+    def versao(self):
+        """
+        Geração vigente e seus metadados, lidos juntos.
+
+        Um remapeamento concorrente (``atualizar``) troca os dois atributos;
+        lidos separadamente, poderiam vir de gerações diferentes.
+
+        Returns:
+            tuple: (geração, dict de metadados)
+        """
+        with self._lock:
+            return self.geracao, self.meta
+
+    def disponivel(self):
+        """Indica se existe alguma geração publicada."""
+        return self.atualizar()
+
+    def dataframe(self):
+        """
+        Monta o DataFrame mínimo esperado pelos analisadores.
+
+        Returns:
+            pd.DataFrame: Concurso, Bola1..BolaK, ``data`` e ``especial`` dos
+            sorteios da geração vigente
+        """
+        if not self.atualizar():
+            raise FileNotFoundError("Nenhuma geração de dados publicada")
+        df = pd.DataFrame(
+            np.asarray(self.arrays['bolas'], dtype=np.int64), columns=self.jogo.colunas_bolas,
+        )
+        df.insert(0, 'Concurso', np.asarray(self.arrays['concursos']))
+        if 'datas' in self.arrays:
+            df['data'] = np.asarray(self.arrays['datas'])
+            df['especial'] = np.asarray(self.arrays['especiais'])
+        return df
+
+    # ---------------------------------------------------------------- publicação
+
+    def publicar(self, df, origem=None):
+        """
+        Grava uma nova geração e a torna vigente de forma atômica.
+
+        Sorteios posteriores ao último concurso do DataFrame que já estavam
+        publicados (anexados a partir do banco) ou gravados em
+        ``SorteioLotofacil`` são anexados de novo, então republicar um CSV
+        defasado nunca faz o último concurso retroceder.
+
+        Args:
+            df (pd.DataFrame): DataFrame no layout de ``base_dados.csv``
+            origem (dict, optional): Metadados do arquivo de origem
+
+        Returns:
+            int: Número da geração publicada
+        """
+        with medir('publicacao') as medicao, self._trava():
+            medicao.linhas = len(df)
+            arrays = calcular_arrays(df, self.jogo)
+            for novos in (self._sorteios_publicados_apos, self._sorteios_do_banco_apos):
+                limite = int(arrays['concursos'][-1]) if len(arrays['concursos']) else None
+                sorteios = novos(limite)
+                if sorteios is not None:
+                    arrays = self._juntar(arrays, *sorteios)
+            geracao = self._gravar_geracao(arrays, origem)
+        geracao_publicada.send(sender=type(self), armazem=self, geracao=geracao)
+        return geracao
+
+    def anexar(self, concursos, bolas, origem=None, datas=None, especiais=None,
+               ganhadores=None, locais=None):
+        """
+        Publica uma geração com novos sorteios, atualizando o estado incrementalmente.
+
+        Sorteios de concursos já publicados são ignorados. O estado agregado é
+        atualizado em tempo constante por sorteio, mas a nova geração é uma
+        cópia completa dos arrays (alguns ms a cada mil sorteios de histórico):
+        é o que permite aos leitores trocar de geração sem travas.
+
+        Args:
+            concursos (array-like): Números dos concursos novos
+            bolas (array-like): Matriz (sorteios, K) com os números de cada um
+            origem (dict, optional): Metadados do arquivo de origem (padrão:
+                mantém os da geração vigente)
+            datas (array-like, optional): Data de cada sorteio (padrão: ``NaT``)
+            especiais (array-like, optional): Se cada sorteio é especial (padrão: False)
+            ganhadores (array-like, optional): Ganhadores da faixa principal de
+                cada sorteio, quando não há ``locais`` (padrão: 0)
+            locais (dict, optional): Saída de ``calcular_locais`` para estes
+                sorteios (padrão: sem locais e rateio desconhecido)
+
+        Returns:
+            int | None: Geração publicada, ou None se não havia sorteio novo
+
+        Raises:
+            FileNotFoundError: Se ainda não há geração para anexar
+        """
+        concursos, bolas, datas, especiais, locais = self._normalizar_sorteios(
+            concursos, bolas, datas, especiais, ganhadores, locais,
+        )
+
+        with self._trava():
+            # Relê o ponteiro dentro da trava: outro processo pode ter anexado antes
+            self._ponteiro_stat = None
+            if not self.atualizar():
+                raise FileNotFoundError("Nenhuma geração de dados publicada")
+            if self.meta.get('formato') != FORMATO:
+                raise FileNotFoundError("A geração vigente precisa ser republicada")
+
+            ultimo = self.meta['ultimo_concurso']
+            novos = concursos > ultimo if ultimo is not None else np.ones(len(concursos), bool)
+            if not novos.any():
+                return None
+            if (~novos).any():
+                logger.warning(
+                    "Ignorando %d sorteio(s) já publicado(s) ou fora de ordem.", int((~novos).sum())
+                )
+            posicoes = np.nonzero(novos)[0]
+
+            with medir('anexacao') as medicao:
+                medicao.linhas = len(posicoes)
+                arrays = self._juntar(
+                    self.arrays, concursos[posicoes], bolas[posicoes], datas[posicoes],
+                    especiais[posicoes], selecionar_sorteios(locais, posicoes),
+                )
+                geracao = self._gravar_geracao(arrays, origem or self.meta.get('origem'))
+        geracao_publicada.send(sender=type(self), armazem=self, geracao=geracao)
+        return geracao
+
+    def _normalizar_sorteios(self, concursos, bolas, datas=None, especiais=None,
+                             ganhadores=None, locais=None):
+        """
+        Converte sorteios avulsos para os tipos publicados, em ordem de concurso.
+
+        Returns:
+            tuple: (concursos, bolas, datas, especiais, locais)
+        """
+        concursos = np.asarray(concursos, dtype=np.int32)
+        bolas = np.asarray(bolas, dtype=self.jogo.dtype_bolas).reshape(len(concursos), -1)
+        datas = np.asarray(
+            datas if datas is not None else np.full(len(concursos), DATA_AUSENTE),
+            dtype='datetime64[D]',
+        )
+        especiais = np.asarray(
+            especiais if especiais is not None else np.zeros(len(concursos)), dtype=bool,
+        )
+        if locais is None:
+            locais = {
+                'ganhadores': np.asarray(
+                    ganhadores if ganhadores is not None else np.zeros(len(concursos)),
+                    dtype=np.int32,
+                ),
+                'rateios': np.full(len(concursos), np.nan),
+                **locais_vazios(),
+            }
+        ordem = np.argsort(concursos, kind='stable')
+        return (
+            concursos[ordem], bolas[ordem], datas[ordem], especiais[ordem],
+            selecionar_sorteios(locais, ordem),
+        )
+
+    def _juntar(self, base, concursos, bolas, datas, especiais, locais):
+        """Arrays de ``base`` acrescidos de sorteios normalizados, com o estado atualizado."""
+        estado = {nome: np.array(base[nome]) for nome in nomes_estado(self.jogo)}
+        return {
+            'concursos': np.concatenate([base['concursos'], concursos]),
+            'bolas': np.concatenate([base['bolas'], bolas]),
+            'mascaras': np.concatenate([base['mascaras'], self.jogo.mascaras_de_matriz(bolas)]),
+            'datas': np.concatenate([base['datas'], datas]),
+            'especiais': np.concatenate([base['especiais'], especiais]),
+            **juntar_locais(base, locais, len(base['concursos'])),
+            **atualizar_estado(estado, bolas, self.jogo),
+        }
+
+    def _sorteios_publicados_apos(self, limite):
+        """
+        Sorteios da geração vigente (de qualquer formato) posteriores a ``limite``.
+
+        Returns:
+            tuple | None: Argumentos de ``_juntar``, ou None se não houver
+        """
+        self._ponteiro_stat = None
+        if not self.atualizar() or 'concursos' not in self.arrays:
+            return None
+        concursos = np.asarray(self.arrays['concursos'])
+        posicoes = (
+            np.nonzero(concursos > limite)[0] if limite is not None else np.arange(len(concursos))
+        )
+        if not len(posicoes):
+            return None
+        arrays = self.arrays
+        locais = (
+            selecionar_sorteios({nome: arrays[nome] for nome in ARRAYS_LOCAIS}, posicoes)
+            if all(nome in arrays for nome in ARRAYS_LOCAIS) else None
+        )
+        return self._normalizar_sorteios(
+            concursos[posicoes], np.asarray(arrays['bolas'])[posicoes],
+            datas=np.asarray(arrays['datas'])[posicoes] if 'datas' in arrays else None,
+            especiais=np.asarray(arrays['especiais'])[posicoes] if 'especiais' in arrays else None,
+            locais=locais,
+        )
+
+    def _sorteios_do_banco_apos(self, limite):
+        """
+        Sorteios de ``SorteioLotofacil`` posteriores a ``limite`` (só na Lotofácil).
+
+        Cobre os sorteios gravados quando ainda não havia geração para anexá-los.
+
+        Returns:
+            tuple | None: Argumentos de ``_juntar``, ou None se não houver
+        """
+        if self.jogo != LOTOFACIL or not getattr(settings, 'LOTOFACIL_ANEXAR_SORTEIOS', True):
+            return None
+        from ..models import SorteioLotofacil
+
+        consulta = SorteioLotofacil.objects.order_by('concurso')
+        if limite is not None:
+            consulta = consulta.filter(concurso__gt=limite)
+        try:
+            sorteios = list(consulta)
+        except DatabaseError:
+            logger.warning("Sorteios do banco indisponíveis; publicando só o arquivo.")
+            return None
+        if not sorteios:
+            return None
+        return self._normalizar_sorteios(
+            [s.concurso for s in sorteios], [s.get_numeros_list() for s in sorteios],
+            datas=[s.data for s in sorteios],
+            ganhadores=[s.ganhadores_15_acertos for s in sorteios],
+        )
+
+    def _trava(self):
+        """Trava de publicação entre threads e, onde houver ``fcntl``, entre processos."""
+        return _TravaPublicacao(self)
+
+    def _gravar_geracao(self, arrays, origem):
+        """Grava os arrays como nova geração e troca o ponteiro; requer a trava."""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        temporario = self.diretorio / f'.tmp-{os.getpid()}-{uuid.uuid4().hex}'
+        temporario.mkdir()
+        try:
+            for nome in self.nomes_arrays:
+                np.save(temporario / f'{nome}.npy', arrays[nome])
+            meta = {
+                'formato': FORMATO,
+                'total_sorteios': len(arrays['concursos']),
+                'ultimo_concurso': int(arrays['concursos'][-1]) if len(arrays['concursos']) else None,
+                'jogo': self.jogo.chave,
+                'total_numeros': self.jogo.total_numeros,
+                'numeros_por_sorteio': self.jogo.numeros_por_sorteio,
+                'publicado_em': time.time(),
+                'origem': origem,
+            }
+            (temporario / 'meta.json').write_text(json.dumps(meta))
+
+            # Renomear o diretório reserva o número da geração mesmo com
+            # publicadores concorrentes: quem perder a corrida tenta o próximo
+            geracao = (self._ler_ponteiro() or 0) + 1
+            while True:
+                destino = self.diretorio / f'{PREFIXO_GERACAO}{geracao:06d}'
+                try:
+                    temporario.rename(destino)
+                    break
+                except OSError:
+                    if not destino.exists():
+                        raise
+                    geracao += 1
+        except Exception:
+            shutil.rmtree(temporario, ignore_errors=True)
+            raise
+
+        ponteiro_tmp = self.diretorio / f'.{ARQUIVO_PONTEIRO}-{uuid.uuid4().hex}'
+        ponteiro_tmp.write_text(str(geracao))
+        os.replace(ponteiro_tmp, self.diretorio / ARQUIVO_PONTEIRO)
+
+        self._remover_geracoes_antigas(geracao)
+        self.atualizar()
+        return geracao
+
+    def sincronizar(self, caminho_csv):
+        """
+        Publica uma nova geração somente se o CSV de origem mudou.
+
+        Args:
+            caminho_csv (str): Caminho do ``base_dados.csv``
+
+        Returns:
+            int: Geração vigente após a sincronização
+        """
+        from .processor import LotofacilDataImporter
+
+        stat = os.stat(caminho_csv)
+        origem = {'arquivo': str(caminho_csv), 'mtime_ns': stat.st_mtime_ns, 'tamanho': stat.st_size}
+        atual = self.atualizar() and self.meta.get('formato') == FORMATO
+        if atual and self.meta.get('origem') == origem:
+            return self.geracao
+
+        df = LotofacilDataImporter(file_path=caminho_csv, jogo=self.jogo).importar_csv()
+        if atual:
+            geracao = self._anexar_csv(df, origem)
+            if geracao is not None:
+                return geracao
+        return self.publicar(df, origem=origem)
+
+    def _anexar_csv(self, df, origem):
+        """
+        Anexa só os sorteios novos do CSV quando o histórico publicado não mudou.
+
+        Returns:
+            int | None: Geração publicada, ou None se é preciso republicar tudo
+        """
+        df = df.sort_values('Concurso')
+        publicados = len(self.arrays['concursos'])
+        concursos = df['Concurso'].to_numpy(dtype=np.int32)
+        bolas = df[self.jogo.colunas_bolas].to_numpy(dtype=self.jogo.dtype_bolas)
+        # Compara as máscaras: sorteios anexados pelo banco têm as bolas ordenadas
+        if len(concursos) < publicados or not (
+            np.array_equal(concursos[:publicados], self.arrays['concursos'])
+            and np.array_equal(
+                self.jogo.mascaras_de_matriz(bolas[:publicados]), self.arrays['mascaras'],
+            )
+        ):
+            return None
+
+        if publicados == len(concursos):
+            # Só os metadados do arquivo mudaram
+            with self._trava():
+                return self._gravar_geracao(
+                    {nome: self.arrays[nome] for nome in self.nomes_arrays}, origem,
+                )
+        datas, especiais = colunas_de_data(df)
+        return self.anexar(
+            concursos[publicados:], bolas[publicados:], origem=origem,
+            datas=datas[publicados:], especiais=especiais[publicados:],
+            locais=calcular_locais(df.iloc[publicados:]),
+        )
+
+    def _remover_geracoes_antigas(self, atual):
+        """Remove gerações antigas; arquivos ainda mapeados seguem válidos até o munmap."""
+        for pasta in self.diretorio.glob(f'{PREFIXO_GERACAO}*'):
+            try:
+                numero = int(pasta.name[len(PREFIXO_GERACAO):])
+            except ValueError:
+                continue
+            if numero <= atual - GERACOES_MANTIDAS:
+                shutil.rmtree(pasta, ignore_errors=True)
+
+
+class _TravaPublicacao:
+    """Gerenciador de contexto da trava de publicação de um ``ArmazemSorteios``."""
+
+    def __init__(self, armazem):
+        self.armazem = armazem
+        self.arquivo = None
+
+    def __enter__(self):
+        self.armazem._lock_publicacao.acquire()
+        if fcntl is not None:
+            self.armazem.diretorio.mkdir(parents=True, exist_ok=True)
+            self.arquivo = open(self.armazem.diretorio / ARQUIVO_TRAVA, 'a')
+            fcntl.flock(self.arquivo, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *excecao):
+        if self.arquivo is not None:
+            fcntl.flock(self.arquivo, fcntl.LOCK_UN)
+            self.arquivo.close()
+        self.armazem._lock_publicacao.release()
+
+
+# Armazéns compartilhados deste processo, por chave do jogo
+_ARMAZENS = {}
+
+
+def obter_armazem(jogo=None):
+    """
+    Retorna o armazém compartilhado deste processo para um jogo.
+
+    Args:
+        jogo (Jogo | str, optional): Jogo ou sua chave (padrão: Lotofácil)
+    """
+    jogo = obter_jogo(jogo)
+    armazem = _ARMAZENS.get(jogo.chave)
+    if armazem is None:
+        armazem = _ARMAZENS.setdefault(jogo.chave, ArmazemSorteios(jogo=jogo))
+    return armazem
@@ -0,0 +1,232 @@
+# lotofacil_analyzer/export.py
+"""
+Exportação em streaming de apostas e tabelas de análise.
+
+As linhas são produzidas por geradores e agrupadas em blocos antes de ir para
+o ``StreamingHttpResponse``: nenhuma exportação é montada inteira em memória,
+e a compressão gzip (opcional) também é feita bloco a bloco.
+
+Sob ASGI o Django carregaria um iterador síncrono inteiro em memória antes de
+enviá-lo; nesse caso os blocos são entregues por um iterador assíncrono que
+produz cada um (consultas ao banco incluídas) via ``sync_to_async``.
+"""
+
+from .data.bitmask import COLUNAS_BOLAS, NUMEROS_POR_SORTEIO, TOTAL_NUMEROS
+from .data.combinatoria import indices_de_mascaras
+from .data.jogos import matriz_incidencia
+from .data import incremental
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+import csv
+import json
+import logging
+import zlib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+TAMANHO_BLOCO = 64 * 1024
+TAMANHO_LOTE_CONSULTA = 2000
+TABELAS_ESTATISTICAS = ('frequencia', 'atraso', 'combinacoes')
+
+
+class _Eco:
+    """Pseudo-arquivo que devolve o que o ``csv.writer`` escreve."""
+
+    def write(self, valor):
+        return valor
+
+
+def linhas_csv(cabecalho, linhas):
+    """Gera o CSV linha a linha, começando pelo cabeçalho."""
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(cabecalho)
+    for linha in linhas:
+        yield escritor.writerow(linha)
+
+
+def linhas_jsonl(cabecalho, linhas):
+    """Gera um objeto JSON por linha, com as chaves do cabeçalho."""
+    for linha in linhas:
+        yield json.dumps(dict(zip(cabecalho, linha)), ensure_ascii=False, default=str) + '\n'
+
+
+def agrupar(textos, tamanho=TAMANHO_BLOCO):
+    """Codifica os textos em UTF-8 e os agrupa em blocos de ~``tamanho`` bytes."""
+    partes, total = [], 0
+    for texto in textos:
+        dados = texto.encode('utf-8')
+        partes.append(dados)
+        total += len(dados)
+        if total >= tamanho:
+            yield b''.join(partes)
+            partes, total = [], 0
+    if partes:
+        yield b''.join(partes)
+
+
+def comprimir_gzip(blocos, nivel=6):
+    """Comprime os blocos em formato gzip à medida que são produzidos."""
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+    for bloco in blocos:
+        comprimido = compressor.compress(bloco)
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
+
+
+async def iterar_assincrono(blocos):
+    """
+    Entrega os blocos de um iterador síncrono sem bloquear o loop de eventos.
+
+    Cada bloco é produzido na thread síncrona compartilhada
+    (``thread_sensitive``), a mesma da view, então ``QuerySet.iterator`` usa a
+    conexão da requisição e busca um lote por vez.
+    """
+    blocos = iter(blocos)
+    proximo = sync_to_async(next, thread_sensitive=True)
+    fim = object()
+    try:
+        while (bloco := await proximo(blocos, fim)) is not fim:
+            yield bloco
+    finally:
+        # Cliente desconectado: encerra o gerador (e o cursor) na thread síncrona
+        if hasattr(blocos, 'close'):
+            await sync_to_async(blocos.close, thread_sensitive=True)()
+
+
+def resposta_exportacao(cabecalho, linhas, formato, nome, gzip=False, assincrono=False):
+    """
+    Monta a resposta de download em streaming.
+
+    Args:
+        cabecalho (list): Nomes das colunas
+        linhas (iterable): Linhas (sequências na ordem do cabeçalho)
+        formato (str): 'csv' ou 'jsonl'
+        nome (str): Nome do arquivo, sem extensão
+        gzip (bool): Se True, entrega o arquivo comprimido (``.gz``)
+        assincrono (bool): Se True (requisição ASGI), entrega os blocos por um
+            iterador assíncrono
+
+    Returns:
+        StreamingHttpResponse: Resposta com o arquivo em anexo
+
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato não suportado: {formato}")
+
+    gerar = linhas_csv if formato == 'csv' else linhas_jsonl
+    blocos = agrupar(gerar(cabecalho, linhas))
+    arquivo = f'{nome}.{formato}'
+    tipo = FORMATOS[formato]
+    if gzip:
+        blocos = comprimir_gzip(blocos)
+        arquivo += '.gz'
+        tipo = 'application/gzip'
+
+    if assincrono:
+        blocos = iterar_assincrono(blocos)
+    response = StreamingHttpResponse(blocos, content_type=tipo)
+    response['Content-Disposition'] = f'attachment; filename="{arquivo}"'
+    return response
+
+
+def tabela_apostas(apostas):
+    """
+    Linhas de exportação das apostas de um queryset de ``ApostaGerada``.
+
+    O queryset é percorrido com ``iterator``, em lotes, sem cache de resultados.
+    Números e coluna ``indice`` (posição lexicográfica da aposta entre todas as
+    possíveis, ``data.combinatoria``) vêm da coluna ``mascara``, calculados
+    por lote. Linhas com máscara inválida são puladas e registradas no log,
+    em vez de interromper o download no meio.
+
+    Returns:
+        tuple: (cabeçalho, gerador de linhas)
+    """
+    cabecalho = ['id', 'data_geracao', 'metodo_geracao'] + COLUNAS_BOLAS + ['indice']
+    consulta = apostas.values_list('pk', 'data_geracao', 'metodo_geracao', 'mascara')
+
+    def lote_de_linhas(lote):
+        mascaras = np.array([mascara for *_, mascara in lote], dtype=np.int64)
+        validas = (mascaras >= 0) & (mascaras < 1 << TOTAL_NUMEROS)
+        validas[validas] = np.bitwise_count(mascaras[validas]) == NUMEROS_POR_SORTEIO
+        if not validas.all():
+            logger.warning(
+                "Exportação: %d aposta(s) com máscara inválida ignorada(s) (ids %s).",
+                int((~validas).sum()), [lote[i][0] for i in np.nonzero(~validas)[0][:10]],
+            )
+        mascaras = mascaras[validas].astype(np.uint32)
+        numeros = np.nonzero(matriz_incidencia(mascaras, TOTAL_NUMEROS))[1] + 1
+        numeros = numeros.reshape(len(mascaras), NUMEROS_POR_SORTEIO).tolist()
+        indices = indices_de_mascaras(mascaras).tolist()
+        registros = (registro for registro, valida in zip(lote, validas) if valida)
+        for (pk, data, metodo, _), dezenas, indice in zip(registros, numeros, indices):
+            yield [pk, data.isoformat(), metodo, *dezenas, indice]
+
+    def linhas():
+        lote = []
+        for registro in consulta.iterator(chunk_size=TAMANHO_LOTE_CONSULTA):
+            lote.append(registro)
+            if len(lote) == TAMANHO_LOTE_CONSULTA:
+                yield from lote_de_linhas(lote)
+                lote = []
+        if lote:
+            yield from lote_de_linhas(lote)
+
+    return cabecalho, linhas()
+
+
+def tabela_frequencia(resultados):
+    """Linhas da análise de frequência: uma por número."""
+    percentuais = resultados['percentuais']
+    cabecalho = ['numero', 'frequencia', 'percentual']
+    linhas = (
+        [num, freq, round(percentuais[num], 4)]
+        for num, freq in sorted(resultados['contagem'].items())
+    )
+    return cabecalho, linhas
+
+
+def tabela_atraso(resultados):
+    """Linhas da análise de atraso: uma por número."""
+    cabecalho = ['numero', 'atual', 'media', 'maximo', 'minimo', 'ultimo_sorteio']
+    linhas = (
+        [num] + [dados[coluna] for coluna in cabecalho[1:]]
+        for num, dados in sorted(resultados['estatisticas'].items())
+    )
+    return cabecalho, linhas
+
+
+def tabela_combinacoes(estado, tamanho):
+    """
+    Contagem de todas as combinações de ``tamanho`` números do histórico.
+
+    Lida diretamente do estado agregado do armazém (``data.incremental``).
+
+    Raises:
+        ValueError: Se o tamanho não for mantido no estado
+    """
+    if tamanho not in incremental.TAMANHOS_COMBINACOES:
+        disponiveis = ', '.join(map(str, incremental.TAMANHOS_COMBINACOES))
+        raise ValueError(f"Tamanhos disponíveis: {disponiveis}")
+
+    contagem = estado[f'combinacoes_{tamanho}']
+    combinacoes = incremental.tabela_combinacoes(tamanho)
+    cabecalho = [f'numero{i}' for i in range(1, tamanho + 1)] + ['frequencia']
+
+    def linhas():
+        # Converte em lotes para não criar todas as listas de uma vez
+        for inicio in range(0, len(contagem), TAMANHO_LOTE_CONSULTA):
+            fim = inicio + TAMANHO_LOTE_CONSULTA
+            numeros = combinacoes[inicio:fim].tolist()
+            for combinacao, frequencia in zip(numeros, contagem[inicio:fim].tolist()):
+                yield combinacao + [frequencia]
+
+    return cabecalho, linhas()
@@ -1,20 +1,51 @@
 # lotofacil_analyzer/generators/base.py
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from ..data.bitmask import NUMEROS_POR_SORTEIO, mascaras_de_matriz
+from ..data.jogos import LOTOFACIL, obter_jogo
 from ..models import ApostaGerada
+from ..unicidade import chaves_unicas
+from django.db import transaction
+import numpy as np
+
+
+def amostrar_sem_reposicao(rng, pesos, quantidade, k=NUMEROS_POR_SORTEIO):
+    """
+    Sorteia ``quantidade`` apostas de ``k`` números sem reposição, ponderadas por ``pesos``.
+
+    Usa o truque Gumbel-top-k: as ``k`` maiores chaves ``log(peso) + Gumbel``
+    seguem a mesma distribuição de sortear um número por vez, proporcional ao
+    peso, descartando repetidos; mas todas as apostas saem em um único passo.
+
+    Args:
+        rng (np.random.Generator): Gerador de números aleatórios
+        pesos (array-like): Peso de cada número (índice 0 = número 1)
+        quantidade (int): Número de apostas
+        k (int): Números por aposta
+
+    Returns:
+        list: Apostas ordenadas (listas de ``k`` números)
+    """
+    log_pesos = np.log(np.maximum(np.asarray(pesos, dtype=np.float64), 1e-12))
+    chaves = log_pesos + rng.gumbel(size=(quantidade, len(log_pesos)))
+    escolhidos = np.argpartition(-chaves, k - 1, axis=1)[:, :k]
+    return (np.sort(escolhidos, axis=1) + 1).tolist()
 
 class GeradorBase(ABC):
     """Classe base para geradores de apostas"""
     
-    def __init__(self, analisadores=None, usuario=None):
+    def __init__(self, analisadores=None, usuario=None, jogo=None):
         """
         Inicializa o gerador
         
         Args:
             analisadores (dict): Dicionário com resultados de analisadores
             usuario (User): Usuário para quem gerar as apostas
+            jogo (Jogo | str, optional): Jogo das apostas (padrão: Lotofácil)
         """
         self.analisadores = analisadores or {}
         self.usuario = usuario
+        self.jogo = obter_jogo(jogo)
         self.nome = self.__class__.__name__
     
     @abstractmethod
@@ -27,10 +58,17 @@ class GeradorBase(ABC):
             salvar (bool): Se True, salva as apostas no banco de dados
             
         Returns:
-            list: Lista de apostas geradas (cada aposta é uma lista de 15 números)
+            list: Lista de apostas geradas (cada aposta é uma lista de K números)
         """
         pass
     
+    def _validar_salvamento(self):
+        """Apostas só são salvas para um usuário, e o banco guarda apenas apostas da Lotofácil."""
+        if not self.usuario:
+            raise ValueError("É necessário um usuário para salvar apostas")
+        if self.jogo != LOTOFACIL:
+            raise ValueError(f"Apostas de {self.jogo.nome} não podem ser salvas no banco")
+
     def salvar_aposta(self, numeros):
         """
         Salva uma aposta gerada no banco de dados
@@ -41,8 +79,7 @@ class GeradorBase(ABC):
         Returns:
             ApostaGerada: Objeto da aposta salva
         """
-        if not self.usuario:
-            raise ValueError("É necessário um usuário para salvar apostas")
+        self._validar_salvamento()
         
         numeros_str = ','.join(map(str, sorted(numeros)))
         
@@ -52,4 +89,46 @@ class GeradorBase(ABC):
             metodo_geracao=self.nome
         )
         aposta.save()
-        return aposta
\ No newline at end of file
+        return aposta
+
+    def salvar_apostas(self, apostas, parametros=None, lote=1000, unicas=None):
+        """
+        Salva várias apostas em lotes com ``bulk_create``
+
+        Args:
+            apostas (list): Lista de apostas (listas de 15 números)
+            parametros (dict, optional): Parâmetros gravados em cada aposta
+            lote (int): Apostas inseridas por comando
+            unicas (str, optional): Escopo de ``unicidade.ESCOPOS``; grava a
+                ``chave_unica`` e insere tudo em uma transação, de modo que uma
+                repetição (``IntegrityError``) não salva nenhuma aposta
+
+        Returns:
+            int: Quantidade de apostas salvas
+        """
+        self._validar_salvamento()
+
+        mascaras = mascaras_de_matriz(apostas) if apostas else []
+        chaves = (
+            chaves_unicas(unicas, self.usuario.pk, mascaras).tolist() if unicas
+            else [None] * len(apostas)
+        )
+        objetos = (
+            ApostaGerada(
+                usuario=self.usuario,
+                numeros=','.join(map(str, sorted(numeros))),
+                mascara=int(mascara),
+                chave_unica=chave,
+                metodo_geracao=self.nome,
+                parametros=parametros,
+            )
+            for numeros, mascara, chave in zip(apostas, mascaras, chaves)
+        )
+        total = 0
+        with transaction.atomic() if unicas else nullcontext():
+            while True:
+                bloco = [o for _, o in zip(range(lote), objetos)]
+                if not bloco:
+                    return total
+                ApostaGerada.objects.bulk_create(bloco)
+                total += len(bloco)
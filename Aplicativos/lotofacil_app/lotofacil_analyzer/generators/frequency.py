@@ -1,11 +1,25 @@
 # lotofacil_analyzer/generators/frequency.py
-from .base import GeradorBase
-import random
+from .base import GeradorBase, amostrar_sem_reposicao
+from ..metrics import instrumentar
 import numpy as np
 
 class GeradorFrequencia(GeradorBase):
     """Gerador baseado na frequência dos números"""
-    
+
+    def __init__(self, analisadores=None, usuario=None, semente=None, jogo=None):
+        """
+        Inicializa o gerador de frequência
+
+        Args:
+            analisadores (dict): Dicionário com resultados de analisadores
+            usuario (User): Usuário para quem gerar as apostas
+            semente (int, optional): Semente para resultados reprodutíveis
+            jogo (Jogo | str, optional): Jogo das apostas (padrão: Lotofácil)
+        """
+        super().__init__(analisadores, usuario, jogo)
+        self.rng = np.random.default_rng(semente)
+
+    @instrumentar('gerador:frequencia')
     def gerar(self, quantidade=1, salvar=True):
         """
         Gera apostas baseadas na frequência dos números
@@ -25,26 +39,15 @@ class GeradorFrequencia(GeradorBase):
         resultados = self.analisadores['AnalisadorFrequencia']
         frequencias = resultados['contagem']
         
-        # Cria uma lista ponderada com base na frequência
-        numeros = list(range(1, 26))
-        pesos = [frequencias[num] for num in numeros]
-        
-        # Normaliza os pesos
-        pesos = np.array(pesos) / sum(pesos)
-        
-        # Gera as apostas
-        apostas = []
-        for _ in range(quantidade):
-            # Escolhe 15 números com probabilidade proporcional à frequência
-            aposta = set()
-            while len(aposta) < 15:
-                aposta.add(np.random.choice(numeros, p=pesos))
-            
-            aposta_ordenada = sorted(list(aposta))
-            apostas.append(aposta_ordenada)
-            
-            # Salva a aposta se solicitado
-            if salvar and self.usuario:
-                self.salvar_aposta(aposta_ordenada)
+        # Escolhe os K números com probabilidade proporcional à frequência,
+        # todas as apostas de uma vez (ver ``amostrar_sem_reposicao``)
+        pesos = [frequencias[num] for num in self.jogo.numeros]
+        apostas = amostrar_sem_reposicao(
+            self.rng, pesos, quantidade, self.jogo.numeros_por_sorteio
+        )
+
+        # Salva as apostas se solicitado
+        if salvar and self.usuario:
+            self.salvar_apostas(apostas)
         
         return apostas
\ No newline at end of file
@@ -0,0 +1,110 @@
+# lotofacil_analyzer/generators/markov.py
+from .base import GeradorBase, amostrar_sem_reposicao
+from ..metrics import instrumentar
+import numpy as np
+
+# Transições calculadas, indexadas por (jogo, último concurso, total de sorteios)
+_CACHE_TRANSICOES = {}
+
+
+def calcular_transicoes(incidencia):
+    """
+    Calcula as probabilidades de transição entre sorteios consecutivos.
+
+    Args:
+        incidencia (np.ndarray): Matriz booleana (sorteios, N) em ordem cronológica
+
+    Returns:
+        dict: ``presente_presente`` e ``ausente_presente`` por número (N,) e
+        ``pares`` (N, N), onde ``pares[i, j]`` é P(j no próximo | i no atual)
+    """
+    anterior = incidencia[:-1].astype(np.float64)
+    proximo = incidencia[1:].astype(np.float64)
+
+    vezes_presente = anterior.sum(axis=0)
+    vezes_ausente = len(anterior) - vezes_presente
+
+    presente_presente = (anterior * proximo).sum(axis=0) / np.maximum(vezes_presente, 1)
+    ausente_presente = ((1 - anterior) * proximo).sum(axis=0) / np.maximum(vezes_ausente, 1)
+    pares = (anterior.T @ proximo) / np.maximum(vezes_presente, 1)[:, np.newaxis]
+
+    return {
+        'presente_presente': presente_presente,
+        'ausente_presente': ausente_presente,
+        'pares': pares,
+    }
+
+
+class GeradorMarkov(GeradorBase):
+    """Gerador baseado na persistência dos números entre sorteios consecutivos"""
+
+    def __init__(self, analisadores=None, usuario=None, df=None, peso_pares=0.0, semente=None,
+                 jogo=None):
+        """
+        Inicializa o gerador de Markov
+
+        Args:
+            analisadores (dict): Dicionário com resultados de analisadores
+            usuario (User): Usuário para quem gerar as apostas
+            df (pd.DataFrame): Histórico de sorteios no layout de ``base_dados.csv``
+            peso_pares (float): Peso (0 a 1) das transições entre pares de
+                números em relação às transições individuais
+            semente (int, optional): Semente para resultados reprodutíveis
+            jogo (Jogo | str, optional): Jogo do histórico (padrão: Lotofácil)
+        """
+        super().__init__(analisadores, usuario, jogo)
+        if df is None or df.empty:
+            raise ValueError("É necessário o histórico de sorteios")
+        if not 0 <= peso_pares <= 1:
+            raise ValueError("peso_pares deve estar entre 0 e 1")
+
+        df = df.sort_values('Concurso')
+        self.ultimo_concurso = int(df['Concurso'].iloc[-1])
+        self.peso_pares = peso_pares
+        self.rng = np.random.default_rng(semente)
+
+        chave = (self.jogo.chave, self.ultimo_concurso, len(df))
+        if chave not in _CACHE_TRANSICOES:
+            incidencia = self.jogo.matriz_incidencia(self.jogo.mascaras_do_df(df))
+            _CACHE_TRANSICOES.clear()
+            _CACHE_TRANSICOES[chave] = (calcular_transicoes(incidencia), incidencia[-1])
+        self.transicoes, self.ultimo_sorteio = _CACHE_TRANSICOES[chave]
+
+    def probabilidades(self):
+        """
+        Probabilidade de cada número aparecer no próximo sorteio.
+
+        Returns:
+            np.ndarray: Vetor (N,) com a probabilidade de cada número
+        """
+        individual = np.where(
+            self.ultimo_sorteio,
+            self.transicoes['presente_presente'],
+            self.transicoes['ausente_presente'],
+        )
+        if not self.peso_pares:
+            return individual
+
+        pares = self.transicoes['pares'][self.ultimo_sorteio].mean(axis=0)
+        return (1 - self.peso_pares) * individual + self.peso_pares * pares
+
+    @instrumentar('gerador:markov')
+    def gerar(self, quantidade=1, salvar=True):
+        """
+        Gera apostas para o próximo concurso a partir do último sorteio
+
+        Args:
+            quantidade (int): Número de jogos a gerar
+            salvar (bool): Se True, salva as apostas no banco de dados
+
+        Returns:
+            list: Lista de apostas geradas
+        """
+        apostas = amostrar_sem_reposicao(
+            self.rng, self.probabilidades(), quantidade, self.jogo.numeros_por_sorteio
+        )
+
+        if salvar and self.usuario:
+            self.salvar_apostas(apostas)
+
+        return apostas
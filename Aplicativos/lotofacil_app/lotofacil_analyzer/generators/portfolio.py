@@ -0,0 +1,184 @@
+# lotofacil_analyzer/generators/portfolio.py
+from .base import GeradorBase
+from ..data.jogos import LOTOFACIL
+from ..metrics import instrumentar
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+
+
+def _cobertura(contagens):
+    """Quantidade de sorteios cobertos (ao menos uma aposta na faixa) por faixa."""
+    return (contagens > 0).sum(axis=1)
+
+
+def _trocar_numero(rng, aposta, total_numeros):
+    """Troca um número sorteado da aposta por um número ausente."""
+    presentes = [b for b in range(total_numeros) if aposta >> b & 1]
+    ausentes = [b for b in range(total_numeros) if not aposta >> b & 1]
+    sai = presentes[rng.integers(len(presentes))]
+    entra = ausentes[rng.integers(len(ausentes))]
+    return (aposta & ~(1 << sai)) | (1 << entra)
+
+
+def _executar_recozimento(sorteios, quantidade, faixas, pesos, iteracoes,
+                          temperatura_inicial, resfriamento, semente, jogo=LOTOFACIL):
+    """
+    Executa uma rodada de recozimento simulado (simulated annealing).
+
+    A matriz de acertos (apostas x sorteios) e as contagens de cobertura por
+    faixa são mantidas entre as iterações, de forma que trocar uma aposta só
+    recalcula a linha dessa aposta (avaliação incremental em O(sorteios)).
+
+    Returns:
+        tuple: (pontuação, vetor de máscaras do portfólio)
+    """
+    rng = np.random.default_rng(semente)
+    faixas = np.asarray(faixas, dtype=np.uint8)
+    pesos = np.asarray(pesos, dtype=np.float64)
+
+    apostas = jogo.sortear_mascaras(rng, quantidade)
+    matriz = jogo.acertos(apostas, sorteios)
+    # contagens[f, s]: quantas apostas fazem ao menos faixas[f] pontos no sorteio s
+    contagens = (matriz[np.newaxis, :, :] >= faixas[:, np.newaxis, np.newaxis]).sum(axis=1)
+    pontuacao = float(pesos @ _cobertura(contagens))
+
+    melhor_pontuacao = pontuacao
+    melhores_apostas = apostas.copy()
+    temperatura = temperatura_inicial
+
+    for _ in range(iteracoes):
+        i = int(rng.integers(quantidade))
+        candidata = _trocar_numero(rng, int(apostas[i]), jogo.total_numeros)
+        linha = np.bitwise_count(jogo.dtype_mascara(candidata) & sorteios)
+
+        antigo = matriz[i][np.newaxis, :] >= faixas[:, np.newaxis]
+        novo = linha[np.newaxis, :] >= faixas[:, np.newaxis]
+        novas_contagens = contagens - antigo + novo
+        nova_pontuacao = float(pesos @ _cobertura(novas_contagens))
+
+        delta = nova_pontuacao - pontuacao
+        if delta >= 0 or rng.random() < np.exp(delta / max(temperatura, 1e-9)):
+            apostas[i] = candidata
+            matriz[i] = linha
+            contagens = novas_contagens
+            pontuacao = nova_pontuacao
+            if pontuacao > melhor_pontuacao:
+                melhor_pontuacao = pontuacao
+                melhores_apostas = apostas.copy()
+
+        temperatura *= resfriamento
+
+    return melhor_pontuacao, melhores_apostas
+
+
+class GeradorPortfolio(GeradorBase):
+    """
+    Gerador de portfólio otimizado para um orçamento fixo de apostas.
+
+    Em vez de sortear N apostas independentes, busca o conjunto de N apostas
+    que maximiza a quantidade de sorteios distintos cobertos nas faixas de
+    11+ e 13+ acertos, medida contra o histórico ou contra sorteios simulados.
+    Suporta jogos de até 64 números (máscaras de uma palavra).
+    """
+
+    def __init__(self, analisadores=None, usuario=None, sorteios=None,
+                 amostra_simulada=5000, faixas=None, pesos=(1.0, 10.0),
+                 iteracoes=20000, temperatura_inicial=2.0, resfriamento=0.9997,
+                 reinicios=None, semente=None, jogo=None):
+        """
+        Inicializa o gerador de portfólio
+
+        Args:
+            analisadores (dict): Dicionário com resultados de analisadores
+            usuario (User): Usuário para quem gerar as apostas
+            sorteios (np.ndarray, optional): Máscaras dos sorteios usados na
+                avaliação (ex.: ``jogo.mascaras_do_df(df)``). Se omitido, usa
+                uma amostra de sorteios simulados.
+            amostra_simulada (int): Tamanho da amostra simulada quando
+                ``sorteios`` não é informado
+            faixas (tuple, optional): Faixas de acertos avaliadas (padrão: a
+                menor faixa premiada e a do meio, 11 e 13 na Lotofácil)
+            pesos (tuple): Peso de cada faixa na função objetivo
+            iteracoes (int): Iterações do recozimento por reinício
+            temperatura_inicial (float): Temperatura inicial do recozimento
+            resfriamento (float): Fator multiplicativo de resfriamento
+            reinicios (int, optional): Reinícios independentes executados em
+                paralelo (padrão: número de núcleos)
+            semente (int, optional): Semente para resultados reprodutíveis
+            jogo (Jogo | str, optional): Jogo das apostas (padrão: Lotofácil)
+        """
+        super().__init__(analisadores, usuario, jogo)
+        if self.jogo.palavras > 1:
+            raise ValueError("O portfólio suporta jogos de até 64 números")
+        if faixas is None:
+            premiadas = self.jogo.faixas_premiadas
+            faixas = (premiadas[0], premiadas[len(premiadas) // 2])
+        if len(faixas) != len(pesos):
+            raise ValueError("É necessário um peso para cada faixa de acertos")
+
+        self.semente = np.random.SeedSequence(semente)
+        if sorteios is None:
+            rng = np.random.default_rng(self.semente.spawn(1)[0])
+            sorteios = self.jogo.sortear_mascaras(rng, amostra_simulada)
+        self.sorteios = np.asarray(sorteios, dtype=self.jogo.dtype_mascara)
+
+        self.faixas = tuple(faixas)
+        self.pesos = tuple(pesos)
+        self.iteracoes = iteracoes
+        self.temperatura_inicial = temperatura_inicial
+        self.resfriamento = resfriamento
+        self.reinicios = reinicios or os.cpu_count() or 1
+        self.pontuacao = None
+
+    def avaliar(self, apostas):
+        """
+        Avalia um portfólio com a mesma função objetivo do otimizador.
+
+        Args:
+            apostas (list): Lista de apostas (listas de K números)
+
+        Returns:
+            dict: Sorteios cobertos por faixa e pontuação ponderada
+        """
+        matriz = self.jogo.acertos(self.jogo.mascaras_de_matriz(apostas), self.sorteios)
+        melhor = matriz.max(axis=0)
+        cobertos = {faixa: int((melhor >= faixa).sum()) for faixa in self.faixas}
+        return {
+            'cobertos': cobertos,
+            'total_sorteios': len(self.sorteios),
+            'pontuacao': float(sum(p * cobertos[f] for f, p in zip(self.faixas, self.pesos))),
+        }
+
+    @instrumentar('gerador:portfolio')
+    def gerar(self, quantidade=1, salvar=True):
+        """
+        Gera um portfólio otimizado de apostas
+
+        Args:
+            quantidade (int): Número de apostas do portfólio
+            salvar (bool): Se True, salva as apostas no banco de dados
+
+        Returns:
+            list: Lista de apostas geradas
+        """
+        sementes = self.semente.spawn(self.reinicios)
+        argumentos = [
+            (self.sorteios, quantidade, self.faixas, self.pesos, self.iteracoes,
+             self.temperatura_inicial, self.resfriamento, s, self.jogo)
+            for s in sementes
+        ]
+
+        if self.reinicios == 1:
+            resultados = [_executar_recozimento(*argumentos[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.reinicios, os.cpu_count() or 1)) as executor:
+                resultados = list(executor.map(_executar_recozimento, *zip(*argumentos)))
+
+        self.pontuacao, melhores = max(resultados, key=lambda r: r[0])
+
+        apostas = [self.jogo.numeros_da_mascara(m) for m in melhores]
+        if salvar and self.usuario:
+            self.salvar_apostas(apostas)
+
+        return apostas
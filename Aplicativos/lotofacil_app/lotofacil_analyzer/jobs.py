@@ -0,0 +1,473 @@
+# lotofacil_analyzer/jobs.py
+"""
+Fila de tarefas em segundo plano apoiada no banco de dados.
+
+As views apenas gravam uma ``Tarefa`` pendente; o comando ``manage.py worker``
+reserva as pendentes com um ``UPDATE`` condicional (seguro com vários workers)
+e as executa em um pool de processos. Cada tarefa informa o progresso no
+próprio registro e grava o resultado completo como JSON em
+``LOTOFACIL_DIRETORIO_TAREFAS``; no banco fica só um resumo pequeno. Tarefas
+de workers que morreram sem devolvê-las voltam para a fila depois de
+``LOTOFACIL_TEMPO_MAXIMO_TAREFA`` segundos.
+
+Novos tipos de tarefa são registrados com o decorador ``tarefa``.
+"""
+
+from .cache import geracao_atual
+from .conferencia import validar_apostas
+from .data.store import obter_armazem
+from .models import Tarefa
+from .unicidade import IndiceApostas, escopo_padrao, validar_escopo
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils import timezone
+from datetime import timedelta
+from pathlib import Path
+import json
+import logging
+import os
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+# Tipo -> função(parametros, usuario, progresso) que retorna (resumo, dados)
+TIPOS = {}
+# Tipos enfileirados pelo próprio sistema, que a API só aceita de administradores
+TIPOS_INTERNOS = ('treinar_modelos',)
+
+LIMITE_APOSTAS = 100_000
+LIMITE_SORTEIOS_SIMULADOS = 100_000_000
+LIMITE_APOSTAS_PORTFOLIO = 1000
+LIMITE_ITERACOES = 1_000_000
+LIMITE_REINICIOS = 64
+# Processos de uma única tarefa: nunca mais que os núcleos da máquina
+LIMITE_PROCESSOS = os.cpu_count() or 1
+METODOS_GERACAO = ('frequencia', 'markov', 'aleatorio')
+# Blocos seguidos sem nenhuma aposta inédita antes de desistir (escopo quase esgotado)
+TENTATIVAS_APOSTAS_UNICAS = 20
+
+
+def tarefa(tipo):
+    """
+    Decorador que registra a função executada para um tipo de tarefa.
+
+    Args:
+        tipo (str): Um dos ``Tarefa.TIPO_CHOICES``
+    """
+    def decorador(funcao):
+        TIPOS[tipo] = funcao
+        return funcao
+    return decorador
+
+
+def diretorio_tarefas():
+    """Diretório dos artefatos de resultado das tarefas."""
+    return Path(getattr(settings, 'LOTOFACIL_DIRETORIO_TAREFAS',
+                        Path(settings.BASE_DIR) / 'media' / 'tarefas'))
+
+
+def enfileirar(tipo, parametros=None, usuario=None, sessao=''):
+    """
+    Cria uma tarefa pendente para o worker.
+
+    Args:
+        tipo (str): Tipo registrado da tarefa
+        parametros (dict, optional): Parâmetros repassados à função da tarefa
+        usuario (User, optional): Dono da tarefa
+        sessao (str, optional): Chave da sessão dona de uma tarefa anônima
+
+    Returns:
+        Tarefa: Tarefa criada
+
+    Raises:
+        ValueError: Se o tipo não estiver registrado
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de tarefa desconhecido: {tipo}")
+    return Tarefa.objects.create(
+        tipo=tipo, parametros=parametros or {}, usuario=usuario, sessao=sessao or '',
+    )
+
+
+def limite_tarefas_atingido(usuario=None, sessao=''):
+    """
+    Indica se um cliente já tem o máximo de tarefas pendentes ou em execução.
+
+    O cliente é o usuário ou, para tarefas anônimas, a sessão. O limite
+    (``LOTOFACIL_TAREFAS_ABERTAS_POR_CLIENTE``) impede que um único cliente
+    encha a fila e o diretório de artefatos.
+    """
+    abertas = Tarefa.objects.filter(status__in=('pendente', 'executando'))
+    if usuario is not None:
+        abertas = abertas.filter(usuario=usuario)
+    else:
+        abertas = abertas.filter(usuario=None, sessao=sessao)
+    return abertas.count() >= getattr(settings, 'LOTOFACIL_TAREFAS_ABERTAS_POR_CLIENTE', 3)
+
+
+def reservar_proxima():
+    """
+    Reserva a tarefa pendente mais antiga.
+
+    A reserva é um ``UPDATE ... WHERE status='pendente'``: se outro worker
+    reservou a mesma tarefa antes, nenhuma linha é alterada e a próxima
+    candidata é tentada.
+
+    Returns:
+        int | None: Id da tarefa reservada ou None se não houver pendentes
+    """
+    candidatas = Tarefa.objects.filter(status='pendente').order_by('criada_em', 'pk')
+    for pk in candidatas.values_list('pk', flat=True)[:20]:
+        reservadas = Tarefa.objects.filter(pk=pk, status='pendente').update(
+            status='executando', iniciada_em=timezone.now(), mensagem='Iniciando',
+        )
+        if reservadas:
+            return pk
+    return None
+
+
+def devolver_a_fila(tarefas):
+    """
+    Devolve tarefas em execução à fila, como se nunca tivessem sido reservadas.
+
+    Args:
+        tarefas (iterable): Ids das tarefas
+
+    Returns:
+        int: Quantidade de tarefas devolvidas
+    """
+    return Tarefa.objects.filter(pk__in=list(tarefas), status='executando').update(
+        status='pendente', progresso=0, mensagem='', iniciada_em=None,
+    )
+
+
+def devolver_abandonadas(tempo_maximo=None, exceto=()):
+    """
+    Devolve à fila as tarefas em execução há mais de ``tempo_maximo`` segundos.
+
+    Cobre workers que morreram sem devolver as próprias tarefas (SIGKILL,
+    queda da máquina). O tempo máximo deve ser maior que a tarefa mais longa
+    esperada, pois não há como distinguir uma tarefa lenta de uma abandonada.
+
+    Args:
+        tempo_maximo (float, optional): Segundos desde ``iniciada_em``
+            (padrão: ``LOTOFACIL_TEMPO_MAXIMO_TAREFA``)
+        exceto (iterable): Ids que o próprio worker está executando
+
+    Returns:
+        int: Quantidade de tarefas devolvidas
+    """
+    if tempo_maximo is None:
+        tempo_maximo = getattr(settings, 'LOTOFACIL_TEMPO_MAXIMO_TAREFA', 6 * 3600)
+    limite = timezone.now() - timedelta(seconds=tempo_maximo)
+    abandonadas = Tarefa.objects.filter(status='executando', iniciada_em__lt=limite)
+    return devolver_a_fila(abandonadas.exclude(pk__in=list(exceto)).values_list('pk', flat=True))
+
+
+class Progresso:
+    """
+    Atualiza o progresso de uma tarefa no banco, no máximo uma vez por intervalo.
+
+    Args:
+        tarefa_id (int): Tarefa acompanhada
+        intervalo (float): Segundos mínimos entre gravações
+    """
+
+    def __init__(self, tarefa_id, intervalo=1.0):
+        self.tarefa_id = tarefa_id
+        self.intervalo = intervalo
+        self._ultima = 0.0
+
+    def __call__(self, fracao, mensagem=None):
+        agora = time.monotonic()
+        if agora - self._ultima < self.intervalo and fracao < 1:
+            return
+        self._ultima = agora
+        campos = {'progresso': min(max(float(fracao), 0.0), 1.0)}
+        if mensagem is not None:
+            campos['mensagem'] = mensagem[:200]
+        Tarefa.objects.filter(pk=self.tarefa_id).update(**campos)
+
+
+def _gravar_artefato(tarefa_id, dados):
+    """Grava o resultado completo de forma atômica e retorna o caminho."""
+    diretorio = diretorio_tarefas()
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminho = diretorio / f'tarefa_{tarefa_id}.json'
+    temporario = caminho.with_suffix('.tmp')
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False)
+    os.replace(temporario, caminho)
+    return str(caminho)
+
+
+def executar_tarefa(tarefa_id):
+    """
+    Executa uma tarefa já reservada e registra o resultado.
+
+    Função de nível de módulo para poder ser executada no pool do worker.
+    Erros da tarefa não são propagados: ficam registrados no status ``falhou``.
+
+    Args:
+        tarefa_id (int): Id de uma tarefa com status ``executando``
+
+    Returns:
+        str: Status final da tarefa
+    """
+    registro = Tarefa.objects.select_related('usuario').get(pk=tarefa_id)
+    progresso = Progresso(tarefa_id)
+    inicio = time.perf_counter()
+    try:
+        resumo, dados = TIPOS[registro.tipo](registro.parametros, registro.usuario, progresso)
+        arquivo = _gravar_artefato(tarefa_id, {'tarefa': tarefa_id, 'tipo': registro.tipo, **dados})
+    except Exception:
+        logger.exception("Tarefa %s falhou.", tarefa_id)
+        Tarefa.objects.filter(pk=tarefa_id).update(
+            status='falhou', erro=traceback.format_exc(), concluida_em=timezone.now(),
+        )
+        return 'falhou'
+
+    resumo['duracao_segundos'] = round(time.perf_counter() - inicio, 3)
+    Tarefa.objects.filter(pk=tarefa_id).update(
+        status='concluida', progresso=1.0, mensagem='Concluída', resumo=resumo,
+        arquivo_resultado=arquivo, concluida_em=timezone.now(),
+    )
+    return 'concluida'
+
+
+def _armazem():
+    """Armazém de sorteios sincronizado com o CSV, com a geração vigente mapeada."""
+    geracao_atual()
+    return obter_armazem()
+
+
+def _quantidade(parametros, chave, padrao, limite):
+    """
+    Lê um parâmetro inteiro da tarefa, exigindo que esteja entre 1 e ``limite``.
+
+    Raises:
+        ValueError: Se o valor não for inteiro ou estiver fora do intervalo
+    """
+    quantidade = int(parametros.get(chave, padrao))
+    if not 1 <= quantidade <= limite:
+        raise ValueError(f"{chave} deve estar entre 1 e {limite}")
+    return quantidade
+
+
+def _escopo_unicas(parametros, usuario):
+    """Escopo sem repetição da tarefa: ``unicas`` ou ``LOTOFACIL_APOSTAS_UNICAS``."""
+    unicas = validar_escopo(parametros['unicas']) if 'unicas' in parametros else escopo_padrao()
+    if unicas == 'usuario' and usuario is None:
+        return None  # Apostas anônimas não são salvas nem têm histórico a comparar
+    return unicas
+
+
+def _criar_gerador(metodo, usuario, armazem, semente=None):
+    """Instancia o gerador de um método de ``METODOS_GERACAO``."""
+    from .generators.frequency import GeradorFrequencia
+    from .generators.markov import GeradorMarkov
+
+    if metodo == 'markov':
+        return GeradorMarkov(usuario=usuario, df=armazem.dataframe(), semente=semente)
+    if metodo == 'frequencia':
+        contagem = {n + 1: int(f) for n, f in enumerate(armazem.arrays['frequencias'])}
+    elif metodo == 'aleatorio':
+        contagem = {n: 1 for n in range(1, 26)}
+    else:
+        raise ValueError(f"Método de geração desconhecido: {metodo}")
+    gerador = GeradorFrequencia(
+        {'AnalisadorFrequencia': {'contagem': contagem}}, usuario, semente=semente,
+    )
+    if metodo == 'aleatorio':
+        gerador.nome = 'aleatorio'
+    return gerador
+
+
+@tarefa('gerar_apostas')
+def gerar_apostas(parametros, usuario, progresso):
+    """
+    Gera apostas em blocos, opcionalmente salvando-as para o usuário.
+
+    Parâmetros: ``metodo`` (frequencia, markov ou aleatorio), ``quantidade``
+    (até ``LIMITE_APOSTAS``), ``salvar``, ``semente`` e ``unicas`` (escopo
+    sem repetição: 'usuario' ou 'global'; padrão ``LOTOFACIL_APOSTAS_UNICAS``).
+
+    Sem repetição, os candidatos de cada bloco passam pelo ``IndiceApostas``
+    e o bloco é completado com novos candidatos até a quantidade pedida.
+    """
+    metodo = parametros.get('metodo', 'frequencia')
+    quantidade = _quantidade(parametros, 'quantidade', 1, LIMITE_APOSTAS)
+    salvar = bool(parametros.get('salvar')) and usuario is not None
+    unicas = _escopo_unicas(parametros, usuario)
+    armazem = _armazem()
+    gerador = _criar_gerador(metodo, usuario, armazem, parametros.get('semente'))
+    indice = IndiceApostas(unicas, usuario) if unicas else None
+
+    apostas = []
+    bloco = 10_000
+    tentativas_sem_novas = 0
+    while len(apostas) < quantidade:
+        novas = gerador.gerar(min(bloco, quantidade - len(apostas)), salvar=False)
+        if indice is not None:
+            indice.atualizar()
+            novas = indice.filtrar(novas)
+            tentativas_sem_novas = 0 if novas else tentativas_sem_novas + 1
+            if tentativas_sem_novas >= TENTATIVAS_APOSTAS_UNICAS:
+                raise ValueError("Não foi possível gerar apostas inéditas suficientes neste escopo")
+        if salvar and novas:
+            try:
+                gerador.salvar_apostas(novas, parametros={'metodo': metodo}, unicas=unicas)
+            except IntegrityError:
+                # Outra tarefa gravou alguma destas apostas depois da consulta: refaz o bloco
+                indice.desmarcar(novas)
+                continue
+        apostas.extend(novas)
+        progresso(len(apostas) / quantidade, f"{len(apostas)} de {quantidade} apostas")
+
+    resumo = {
+        'metodo': metodo,
+        'quantidade': quantidade,
+        'salvas': quantidade if salvar else 0,
+        'unicas': unicas,
+        'ultimo_concurso': armazem.meta['ultimo_concurso'],
+        'amostra': apostas[:10],
+    }
+    return resumo, {'resumo': resumo, 'apostas': apostas}
+
+
+@tarefa('portfolio')
+def otimizar_portfolio(parametros, usuario, progresso):
+    """
+    Otimiza um portfólio (fechamento) contra o histórico de sorteios.
+
+    Parâmetros: ``quantidade`` (apostas do portfólio), ``iteracoes``,
+    ``reinicios``, ``faixas``, ``pesos``, ``salvar``, ``semente`` e ``unicas``
+    (como em ``gerar_apostas``). Quantidade, iterações e reinícios são
+    limitados por ``LIMITE_APOSTAS_PORTFOLIO``, ``LIMITE_ITERACOES`` e
+    ``LIMITE_REINICIOS``.
+
+    O portfólio é otimizado como um conjunto, então não é completado com
+    outras apostas: sem repetição, só as apostas inéditas no escopo são
+    salvas e o resumo informa quantas.
+    """
+    from .generators.portfolio import GeradorPortfolio
+
+    quantidade = _quantidade(parametros, 'quantidade', 10, LIMITE_APOSTAS_PORTFOLIO)
+    armazem = _armazem()
+    opcoes = {
+        chave: parametros[chave]
+        for chave in ('faixas', 'pesos', 'semente')
+        if chave in parametros
+    }
+    if 'iteracoes' in parametros:
+        opcoes['iteracoes'] = _quantidade(parametros, 'iteracoes', 20000, LIMITE_ITERACOES)
+    # O paralelismo vem do pool do worker; reinícios extras são opcionais
+    gerador = GeradorPortfolio(
+        usuario=usuario, sorteios=armazem.arrays['mascaras'],
+        reinicios=_quantidade(parametros, 'reinicios', 1, LIMITE_REINICIOS), **opcoes,
+    )
+
+    progresso(0.0, "Otimizando portfólio")
+    salvar = bool(parametros.get('salvar')) and usuario is not None
+    unicas = _escopo_unicas(parametros, usuario)
+    apostas = gerador.gerar(quantidade, salvar=False)
+
+    salvas = 0
+    if salvar:
+        indice = IndiceApostas(unicas, usuario) if unicas else None
+        while True:
+            novas = indice.filtrar(apostas) if indice is not None else apostas
+            try:
+                salvas = gerador.salvar_apostas(novas, unicas=unicas) if novas else 0
+                break
+            except IntegrityError:
+                # Outra tarefa gravou alguma destas apostas depois da leitura: relê e refiltra
+                indice.desmarcar(novas)
+                indice.atualizar()
+
+    resumo = {
+        'quantidade': quantidade,
+        'salvas': salvas,
+        'unicas': unicas,
+        'ultimo_concurso': armazem.meta['ultimo_concurso'],
+        'avaliacao': gerador.avaliar(apostas),
+    }
+    return resumo, {'resumo': resumo, 'apostas': apostas}
+
+
+@tarefa('monte_carlo')
+def simular_monte_carlo(parametros, usuario, progresso):
+    """
+    Simula sorteios uniformes para comparar métodos de geração.
+
+    Parâmetros: ``estrategias`` (métodos de ``METODOS_GERACAO``), ``apostas``
+    (portfólio próprio, opcional), ``quantidade_apostas``, ``total_sorteios``,
+    ``processos`` (até os núcleos da máquina) e ``semente``.
+    """
+    from .simulation import SimuladorMonteCarlo
+
+    total_sorteios = _quantidade(parametros, 'total_sorteios', 1_000_000, LIMITE_SORTEIOS_SIMULADOS)
+    armazem = _armazem()
+    estrategias = {
+        metodo: _criar_gerador(metodo, None, armazem)
+        for metodo in parametros.get('estrategias', METODOS_GERACAO)
+    }
+    if parametros.get('apostas'):
+        validar_apostas(parametros['apostas'])  # Valida antes de simular
+        estrategias['apostas'] = parametros['apostas']
+
+    simulador = SimuladorMonteCarlo(
+        estrategias,
+        quantidade_apostas=_quantidade(parametros, 'quantidade_apostas', 10, LIMITE_APOSTAS_PORTFOLIO),
+        semente=parametros.get('semente'),
+        processos=_quantidade(parametros, 'processos', 1, LIMITE_PROCESSOS),
+    )
+    resultados = simulador.executar(
+        total_sorteios,
+        progresso=lambda fracao: progresso(fracao, f"{fracao:.0%} dos sorteios simulados"),
+    )
+
+    resumo = {
+        'total_sorteios': total_sorteios,
+        'taxa_premiacao': {
+            nome: estrategia['taxa_premiacao']
+            for nome, estrategia in resultados['estrategias'].items()
+        },
+    }
+    return resumo, {'resumo': resumo, 'resultados': resultados}
+
+
+@tarefa('treinar_modelos')
+def treinar_modelos(parametros, usuario, progresso):
+    """
+    Treina os modelos por número da geração vigente (``ml.modelos``).
+
+    Parâmetros: ``forcar``. Cada tarefa usa só a sua parte dos núcleos
+    (núcleos / ``LOTOFACIL_PROCESSOS_WORKER``) para os processos do joblib,
+    sem multiplicar processos com as outras tarefas do worker.
+    """
+    from .ml import treinar_armazem
+
+    armazem = _armazem()
+    processos = max(1, LIMITE_PROCESSOS // getattr(settings, 'LOTOFACIL_PROCESSOS_WORKER', 2))
+    progresso(0.0, "Treinando modelos")
+    versao = treinar_armazem(processos, bool(parametros.get('forcar')))
+
+    resumo = {'versao': versao, 'ultimo_concurso': armazem.meta['ultimo_concurso']}
+    return resumo, {'resumo': resumo}
+
+
+def enfileirar_treino():
+    """
+    Enfileira o treino dos modelos, a menos que já haja um pendente.
+
+    Um treino pendente sempre usa a geração vigente quando começa, então
+    várias publicações seguidas resultam em um único treino.
+
+    Returns:
+        Tarefa | None: Tarefa criada ou None se já havia uma pendente
+    """
+    if Tarefa.objects.filter(tipo='treinar_modelos', status='pendente').exists():
+        return None
+    return enfileirar('treinar_modelos')
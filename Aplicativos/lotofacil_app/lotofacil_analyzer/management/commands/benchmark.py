@@ -0,0 +1,91 @@
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+from lotofacil_analyzer.benchmarks import TAMANHOS_PADRAO, comparar, executar_suite
+from lotofacil_analyzer.benchmarks.suite import CAMINHO_BASELINE
+import json
+
+
+class Command(BaseCommand):
+    help = "Mede analisadores, geradores e backtests com históricos sintéticos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tamanhos', default=','.join(map(str, TAMANHOS_PADRAO)),
+            help="Quantidades de sorteios, separadas por vírgula",
+        )
+        parser.add_argument('--semente', type=int, default=0)
+        parser.add_argument(
+            '--etapas', default='',
+            help="Prefixos das etapas a executar (ex.: 'analisador:,backtest')",
+        )
+        parser.add_argument(
+            '--limite-segundos', type=float, default=120,
+            help="Pula etapas com tempo estimado acima deste valor",
+        )
+        parser.add_argument(
+            '--limite-memoria', type=float, default=2048,
+            help="Pula etapas com pico de memória estimado acima deste valor (MB)",
+        )
+        parser.add_argument(
+            '--sem-memoria', action='store_true',
+            help="Não mede o pico de memória (tracemalloc deixa o código mais lento)",
+        )
+        parser.add_argument('--saida', help="Arquivo JSON do relatório")
+        parser.add_argument(
+            '--comparar', nargs='?', const=str(CAMINHO_BASELINE),
+            help="Relatório de referência (padrão: a baseline versionada)",
+        )
+        parser.add_argument(
+            '--tolerancia', type=float, default=0.25,
+            help="Aumento relativo de tempo aceito na comparação",
+        )
+        parser.add_argument(
+            '--estrito', action='store_true',
+            help="Termina com erro se a comparação encontrar regressões",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            tamanhos = [int(t) for t in options['tamanhos'].split(',') if t]
+        except ValueError:
+            raise CommandError("--tamanhos deve ser uma lista de inteiros")
+        referencia = None
+        if options['comparar']:
+            caminho = Path(options['comparar'])
+            if not caminho.exists():
+                raise CommandError(f"Relatório não encontrado: {caminho}")
+            referencia = json.loads(caminho.read_text())
+
+        def progresso(tamanho, etapa, medicao):
+            if 'segundos' in medicao:
+                pico = f", {medicao['pico_mb']} MB" if medicao['pico_mb'] is not None else ""
+                texto = f"{medicao['segundos']:.3f} s{pico}"
+            else:
+                texto = medicao.get('pulada') or medicao.get('erro')
+            self.stdout.write(f"{tamanho:>9} {etapa:<36} {texto}")
+
+        relatorio = executar_suite(
+            tamanhos,
+            semente=options['semente'],
+            limite_segundos=options['limite_segundos'],
+            limite_memoria_mb=options['limite_memoria'],
+            memoria=not options['sem_memoria'],
+            filtro=[e for e in options['etapas'].split(',') if e] or None,
+            progresso=progresso,
+        )
+
+        if options['saida']:
+            Path(options['saida']).write_text(json.dumps(relatorio, indent=2, ensure_ascii=False))
+            self.stdout.write(self.style.SUCCESS(f"Relatório gravado em {options['saida']}"))
+
+        if referencia is not None:
+            linhas = comparar(relatorio, referencia, options['tolerancia'])
+            regressoes = [linha for linha in linhas if linha['regressao']]
+            for linha in regressoes:
+                self.stdout.write(self.style.WARNING(
+                    f"Regressão: {linha['etapa']} com {linha['tamanho']} sorteios "
+                    f"({linha['referencia']:.3f} s -> {linha['atual']:.3f} s, x{linha['razao']})"
+                ))
+            self.stdout.write(f"{len(linhas)} etapa(s) comparada(s), {len(regressoes)} regressão(ões)")
+            if regressoes and options['estrito']:
+                raise CommandError("Regressões de desempenho encontradas")
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+from lotofacil_analyzer.data import bitmask
+from lotofacil_analyzer.models import SorteioLotofacil
+from lotofacil_analyzer.signals import ingerir_sorteios
+import pandas as pd
+
+
+class Command(BaseCommand):
+    help = "Importa para o banco os sorteios do CSV que ainda não estão cadastrados"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--arquivo',
+            default=str(Path(__file__).resolve().parents[2] / 'data' / 'files' / 'base_dados.csv'),
+            help="CSV de origem no layout de base_dados.csv",
+        )
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help="Sorteios inseridos por comando",
+        )
+
+    def handle(self, *args, **options):
+        arquivo = options['arquivo']
+        if not Path(arquivo).exists():
+            raise CommandError(f"Arquivo não encontrado: {arquivo}")
+
+        df = pd.read_csv(arquivo).sort_values('Concurso')
+        existentes = set(SorteioLotofacil.objects.values_list('concurso', flat=True))
+        df = df[~df['Concurso'].isin(existentes)]
+
+        datas = pd.to_datetime(df['Data Sorteio'], format='%d/%m/%Y').dt.date
+        bolas = df[bitmask.COLUNAS_BOLAS].to_numpy()
+        mascaras = bitmask.mascaras_de_matriz(bolas) if len(df) else []
+        # bulk_create não chama save(): a máscara é calculada aqui
+        novos = [
+            SorteioLotofacil(
+                concurso=int(concurso),
+                data=data,
+                numeros=','.join(map(str, sorted(numeros))),
+                mascara=int(mascara),
+                ganhadores_15_acertos=int(ganhadores),
+            )
+            for concurso, data, numeros, mascara, ganhadores in zip(
+                df['Concurso'], datas, bolas.tolist(), mascaras, df['Ganhadores 15 acertos'],
+            )
+        ]
+        SorteioLotofacil.objects.bulk_create(novos, batch_size=options['lote'])
+
+        # bulk_create não dispara post_save: anexa os novos sorteios explicitamente
+        geracao = ingerir_sorteios(novos)
+        mensagem = f"{len(novos)} sorteio(s) importado(s)"
+        if geracao is not None:
+            mensagem += f"; geração {geracao} publicada"
+        self.stdout.write(self.style.SUCCESS(mensagem))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+from lotofacil_analyzer.data.jogos import LOTOFACIL, jogos_disponiveis, obter_jogo
+from lotofacil_analyzer.data.store import obter_armazem
+
+DIRETORIO_ARQUIVOS = Path(__file__).resolve().parents[2] / 'data' / 'files'
+
+
+class Command(BaseCommand):
+    help = "Publica uma nova geração dos sorteios processados para os workers do servidor"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--jogo', default=LOTOFACIL.chave, choices=sorted(jogos_disponiveis()),
+            help="Jogo dos sorteios (padrão: lotofacil)",
+        )
+        parser.add_argument(
+            '--arquivo',
+            help="CSV de origem no layout de base_dados.csv, com as colunas Bola1..BolaK do jogo "
+                 "(padrão: data/files/base_dados.csv na Lotofácil, data/files/<jogo>.csv nos demais)",
+        )
+        parser.add_argument(
+            '--forcar', action='store_true',
+            help="Publica mesmo que o CSV não tenha mudado",
+        )
+
+    def handle(self, *args, **options):
+        jogo = obter_jogo(options['jogo'])
+        armazem = obter_armazem(jogo)
+        arquivo = options['arquivo'] or str(
+            DIRETORIO_ARQUIVOS / ('base_dados.csv' if jogo == LOTOFACIL else f'{jogo.chave}.csv')
+        )
+        if not Path(arquivo).exists():
+            raise CommandError(f"Arquivo não encontrado: {arquivo}")
+
+        if options['forcar']:
+            from lotofacil_analyzer.data.processor import LotofacilDataImporter
+            geracao = armazem.publicar(LotofacilDataImporter(file_path=arquivo, jogo=jogo).importar_csv())
+        else:
+            geracao = armazem.sincronizar(arquivo)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{jogo.nome}: geração {geracao} vigente ({armazem.meta['total_sorteios']} sorteios)"
+        ))
@@ -0,0 +1,91 @@
+from contextlib import nullcontext
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from pathlib import Path
+from lotofacil_analyzer.benchmarks.carga import (
+    MISTURA_PADRAO, executar_carga, ler_mistura, servidor_local,
+)
+from lotofacil_analyzer.models import SorteioLotofacil
+import json
+
+
+class Command(BaseCommand):
+    help = "Dispara uma carga configurável contra o aplicativo e resume latência, vazão e erros"
+
+    def add_arguments(self, parser):
+        alvo = parser.add_mutually_exclusive_group()
+        alvo.add_argument(
+            '--url', default='http://127.0.0.1:8000',
+            help="URL base de um servidor já em execução (runserver, gunicorn, uvicorn...)",
+        )
+        alvo.add_argument(
+            '--servidor-local', action='store_true',
+            help="Inicia um servidor WSGI com threads neste processo e testa contra ele",
+        )
+        parser.add_argument(
+            '--mistura', default=','.join(f'{k}={v}' for k, v in MISTURA_PADRAO.items()),
+            help="Endpoints e pesos (ex.: 'home=3,estatisticas=2,conferir=1')",
+        )
+        parser.add_argument('--concorrencia', type=int, default=4, help="Threads simultâneas")
+        parser.add_argument('--duracao', type=float, default=30, help="Segundos de medição")
+        parser.add_argument(
+            '--requisicoes', type=int,
+            help="Total de requisições (substitui --duracao)",
+        )
+        parser.add_argument(
+            '--aquecimento', type=int, default=1,
+            help="Requisições por endpoint antes da medição, descartadas",
+        )
+        parser.add_argument('--semente', type=int, default=0)
+        parser.add_argument('--usuario', help="Usuário para logar (as apostas geradas são salvas)")
+        parser.add_argument('--senha', default='')
+        parser.add_argument(
+            '--apostas-conferencia', type=int, default=100,
+            help="Apostas por requisição de conferência",
+        )
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--saida', help="Arquivo JSON do resumo")
+
+    def handle(self, *args, **options):
+        try:
+            mistura = ler_mistura(options['mistura'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['concorrencia'] < 1:
+            raise CommandError("--concorrencia deve ser pelo menos 1")
+
+        ultimo = SorteioLotofacil.objects.aggregate(ultimo=Max('concurso'))['ultimo']
+        servidor = servidor_local() if options['servidor_local'] else nullcontext(options['url'])
+        with servidor as url:
+            self.stdout.write(f"Disparando carga contra {url}...")
+            relatorio = executar_carga(
+                url,
+                mistura=mistura,
+                concorrencia=options['concorrencia'],
+                duracao=options['duracao'],
+                requisicoes=options['requisicoes'],
+                aquecimento=options['aquecimento'],
+                semente=options['semente'],
+                usuario=options['usuario'],
+                senha=options['senha'],
+                apostas_conferencia=options['apostas_conferencia'],
+                timeout=options['timeout'],
+                ultimo_concurso=ultimo or 1,
+            )
+
+        for falha in relatorio['falhas_preparacao']:
+            self.stdout.write(self.style.WARNING(f"Preparação: {falha}"))
+        self.stdout.write(
+            f"{'endpoint':<18}{'req':>7}{'req/s':>9}{'erros':>7}"
+            f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"
+        )
+        for nome, resumo in {**relatorio['endpoints'], 'total': relatorio['total']}.items():
+            latencia = resumo.get('latencia_ms', {})
+            self.stdout.write(
+                f"{nome:<18}{resumo['requisicoes']:>7}{resumo['vazao'] or 0:>9.1f}{resumo['erros']:>7}"
+                + ''.join(f"{latencia.get(c, float('nan')):>9.1f}" for c in ('p50', 'p95', 'p99', 'maximo'))
+            )
+
+        if options['saida']:
+            Path(options['saida']).write_text(json.dumps(relatorio, indent=2, ensure_ascii=False))
+            self.stdout.write(self.style.SUCCESS(f"Resumo gravado em {options['saida']}"))
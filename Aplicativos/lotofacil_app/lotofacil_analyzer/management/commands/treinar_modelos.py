@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from lotofacil_analyzer.data.store import obter_armazem
+from lotofacil_analyzer.ml.modelos import MINIMO_SORTEIOS, treinar_armazem
+
+
+class Command(BaseCommand):
+    help = "Treina os modelos por número da geração vigente (só se ainda não houver modelos dessa versão)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--forcar', action='store_true',
+            help="Treina mesmo que a versão dos sorteios já tenha modelos",
+        )
+        parser.add_argument(
+            '--processos', type=int, default=None,
+            help="Processos da validação cruzada (padrão: núcleos da CPU)",
+        )
+
+    def handle(self, *args, **options):
+        # Verificado antes do treino: outros ValueError são erros de verdade e devem aparecer
+        armazem = obter_armazem()
+        if armazem.disponivel() and len(armazem.arrays['concursos']) < MINIMO_SORTEIOS:
+            raise CommandError(f"São necessários pelo menos {MINIMO_SORTEIOS} sorteios publicados")
+        try:
+            versao = treinar_armazem(options['processos'], options['forcar'])
+        except FileNotFoundError as e:
+            raise CommandError(f"{e}; execute publicar_sorteios antes")
+
+        self.stdout.write(self.style.SUCCESS(f"Modelos da versão {versao} prontos"))
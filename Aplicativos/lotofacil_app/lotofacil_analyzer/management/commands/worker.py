@@ -0,0 +1,141 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+from lotofacil_analyzer.jobs import (
+    devolver_a_fila, devolver_abandonadas, executar_tarefa, reservar_proxima,
+)
+from lotofacil_analyzer.models import Tarefa
+import django
+import multiprocessing
+import signal
+import time
+
+# Quedas do pool com a tarefa em execução antes de ela ser dada como falha
+QUEDAS_POR_TAREFA = 2
+# Segundos entre buscas por tarefas abandonadas por outros workers
+INTERVALO_ABANDONADAS = 60.0
+
+
+def _interromper(signum, frame):
+    # SIGTERM (systemd, docker stop) segue o mesmo caminho do Ctrl+C
+    raise KeyboardInterrupt
+
+
+class Command(BaseCommand):
+    help = "Executa as tarefas pendentes da fila em um pool de processos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processos', type=int,
+            default=getattr(settings, 'LOTOFACIL_PROCESSOS_WORKER', 2),
+            help="Tarefas executadas simultaneamente",
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=2.0,
+            help="Segundos entre consultas à fila quando não há tarefas",
+        )
+        parser.add_argument(
+            '--uma-vez', action='store_true',
+            help="Encerra quando a fila esvaziar em vez de aguardar novas tarefas",
+        )
+
+    def handle(self, *args, **options):
+        processos = max(options['processos'], 1)
+        intervalo = options['intervalo']
+        em_execucao = {}
+        self.quedas = {}
+
+        signal.signal(signal.SIGTERM, _interromper)
+        pool = self._criar_pool(processos)
+        self.stdout.write(f"Worker iniciado com {processos} processo(s).")
+        proxima_verificacao = 0.0
+
+        try:
+            while True:
+                if time.monotonic() >= proxima_verificacao:
+                    devolvidas = devolver_abandonadas(exceto=em_execucao.values())
+                    if devolvidas:
+                        self.stdout.write(f"{devolvidas} tarefa(s) abandonada(s) devolvida(s) à fila.")
+                    proxima_verificacao = time.monotonic() + INTERVALO_ABANDONADAS
+
+                quebrado = False
+                while len(em_execucao) < processos:
+                    tarefa_id = reservar_proxima()
+                    if tarefa_id is None:
+                        break
+                    try:
+                        em_execucao[pool.submit(executar_tarefa, tarefa_id)] = tarefa_id
+                    except BrokenProcessPool:
+                        devolver_a_fila([tarefa_id])
+                        quebrado = True
+                        break
+                    self.stdout.write(f"Tarefa {tarefa_id} iniciada.")
+
+                if not em_execucao and not quebrado:
+                    if options['uma_vez']:
+                        break
+                    time.sleep(intervalo)
+                    continue
+
+                concluidas, _ = wait(em_execucao, timeout=intervalo, return_when=FIRST_COMPLETED)
+                for futuro in concluidas:
+                    if isinstance(futuro.exception(), BrokenProcessPool):
+                        quebrado = True
+                    else:
+                        self._finalizar(em_execucao.pop(futuro), futuro)
+
+                if quebrado:
+                    # Um processo morreu (OOM, segfault): todas as tarefas do pool
+                    # foram perdidas e o pool não aceita novas submissões
+                    self._recuperar_queda(list(em_execucao.values()))
+                    em_execucao.clear()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self._criar_pool(processos)
+        except KeyboardInterrupt:
+            # Tarefas interrompidas voltam para a fila
+            devolver_a_fila(em_execucao.values())
+            self.stdout.write(f"{len(em_execucao)} tarefa(s) devolvida(s) à fila.")
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _criar_pool(self, processos):
+        # Processos novos (spawn) abrem as próprias conexões: nada é herdado do pai.
+        # O inicializador é o próprio django.setup, que pode ser importado antes
+        # de os apps estarem carregados.
+        connections.close_all()
+        return ProcessPoolExecutor(
+            max_workers=processos,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        )
+
+    def _recuperar_queda(self, tarefas):
+        """Devolve à fila as tarefas perdidas na queda do pool, ou as dá como falha se caírem de novo."""
+        for tarefa_id in tarefas:
+            self.quedas[tarefa_id] = self.quedas.get(tarefa_id, 0) + 1
+        reincidentes = [t for t in tarefas if self.quedas[t] >= QUEDAS_POR_TAREFA]
+        Tarefa.objects.filter(pk__in=reincidentes, status='executando').update(
+            status='falhou', erro="O processo da tarefa foi encerrado abruptamente.",
+            concluida_em=timezone.now(),
+        )
+        devolvidas = devolver_a_fila(t for t in tarefas if t not in reincidentes)
+        self.stdout.write(self.style.ERROR(
+            f"Pool de processos reiniciado: {devolvidas} tarefa(s) devolvida(s) à fila, "
+            f"{len(reincidentes)} dada(s) como falha."
+        ))
+
+    def _finalizar(self, tarefa_id, futuro):
+        try:
+            status = futuro.result()
+        except Exception as e:
+            # O processo morreu antes de registrar o resultado
+            status = 'falhou'
+            Tarefa.objects.filter(pk=tarefa_id).update(
+                status='falhou', erro=repr(e), concluida_em=timezone.now(),
+            )
+
+        estilo = self.style.SUCCESS if status == 'concluida' else self.style.ERROR
+        self.stdout.write(estilo(f"Tarefa {tarefa_id}: {status}."))
@@ -0,0 +1,68 @@
+# lotofacil_analyzer/memoria.py
+"""
+Cache em memória do processo, limitado a poucas entradas.
+
+Índices e cálculos derivados de uma geração de dados são guardados pela
+versão ou impressão digital dos dados. Como só algumas gerações ficam vivas
+ao mesmo tempo, basta descartar a entrada mais antiga (FIFO) ao atingir o
+limite.
+"""
+
+import threading
+
+_AUSENTE = object()
+
+
+class CacheLimitado:
+    """
+    Dicionário com no máximo ``maximo`` entradas, descartadas por ordem de inserção.
+
+    Args:
+        maximo (int): Entradas mantidas
+    """
+
+    def __init__(self, maximo=4):
+        self.maximo = maximo
+        self._itens = {}
+        self._lock = threading.Lock()
+
+    def obter(self, chave, calcular):
+        """
+        Retorna o valor da chave, calculando-o na primeira consulta.
+
+        ``calcular`` roda fora da trava: consultas simultâneas à mesma chave
+        podem calcular o valor mais de uma vez, mas só um é guardado.
+
+        Args:
+            chave (hashable): Versão ou impressão digital dos dados
+            calcular (callable): Produz o valor quando a chave não está em cache
+
+        Returns:
+            object: Valor em cache
+        """
+        valor = self._itens.get(chave, _AUSENTE)
+        if valor is not _AUSENTE:
+            return valor
+        valor = calcular()
+        with self._lock:
+            if chave not in self._itens:
+                while len(self._itens) >= self.maximo:
+                    self._itens.pop(next(iter(self._itens)))
+                self._itens[chave] = valor
+            return self._itens[chave]
+
+    def descartar(self, chave):
+        """Remove a chave, se estiver em cache."""
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self):
+        """Remove todas as entradas (usado em testes e benchmarks)."""
+        with self._lock:
+            self._itens.clear()
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def __len__(self):
+        return len(self._itens)
@@ -0,0 +1,333 @@
+# lotofacil_analyzer/metrics.py
+"""
+Instrumentação de analisadores, importadores, geradores e caches.
+
+Cada operação medida (``medir`` / ``instrumentar``) alimenta dois destinos:
+
+- a requisição em andamento, cujas medições o ``ServerTimingMiddleware``
+  devolve no cabeçalho ``Server-Timing``;
+- o registro do processo, exposto no formato texto do Prometheus pela view
+  ``metricas`` (histogramas de duração e contadores de linhas e de cache).
+
+Os valores são por processo: com vários workers, cada um expõe os seus e o
+Prometheus agrega pelo rótulo ``instance``. Operações executadas no pool das
+views (``pool.executar_coalescido``) são coletadas no processo do pool com
+``coletar`` e registradas no processo web que as submeteu. Com ``LOTOFACIL_METRICAS = False``
+o decorador e o gerenciador de contexto não medem nada.
+"""
+
+from contextvars import ContextVar
+from django.conf import settings
+from functools import wraps
+import bisect
+import re
+import threading
+import time
+
+# Limites superiores (em segundos) dos buckets dos histogramas
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+DESCRICOES = {
+    'lotofacil_requisicao_segundos': ('histogram', "Duração das requisições HTTP"),
+    'lotofacil_operacao_segundos': ('histogram', "Duração das operações instrumentadas"),
+    'lotofacil_operacao_linhas_total': ('counter', "Linhas processadas pelas operações"),
+    'lotofacil_cache_total': ('counter', "Consultas aos caches por resultado (acerto ou falha)"),
+}
+
+# Medições da requisição atual: lista de (nome, segundos ou None, descrição)
+_requisicao = ContextVar('lotofacil_medicoes', default=None)
+# Operações medidas dentro de ``coletar``: lista de (operação, segundos, linhas)
+_coleta = ContextVar('lotofacil_coleta', default=None)
+
+_lock = threading.Lock()
+_histogramas = {}
+_contadores = {}
+
+
+def ativo():
+    """Se a instrumentação está habilitada (``LOTOFACIL_METRICAS``)."""
+    return getattr(settings, 'LOTOFACIL_METRICAS', True)
+
+
+class _Histograma:
+    __slots__ = ('buckets', 'soma', 'total')
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.buckets[bisect.bisect_left(BUCKETS, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+
+def _rotulos(rotulos):
+    return tuple(sorted((chave, str(valor)) for chave, valor in rotulos.items()))
+
+
+def observar(metrica, valor, **rotulos):
+    """Registra um valor em um histograma do processo."""
+    chave = (metrica, _rotulos(rotulos))
+    with _lock:
+        histograma = _histogramas.get(chave)
+        if histograma is None:
+            histograma = _histogramas[chave] = _Histograma()
+        histograma.observar(valor)
+
+
+def incrementar(metrica, valor=1, **rotulos):
+    """Incrementa um contador do processo."""
+    chave = (metrica, _rotulos(rotulos))
+    with _lock:
+        _contadores[chave] = _contadores.get(chave, 0) + valor
+
+
+def iniciar_requisicao():
+    """Passa a coletar as medições do contexto atual (usado pelo middleware)."""
+    return _requisicao.set([])
+
+
+def encerrar_requisicao(token):
+    """
+    Para de coletar e devolve as medições da requisição.
+
+    Returns:
+        list: Tuplas (nome, segundos ou None, descrição ou None)
+    """
+    medicoes = _requisicao.get()
+    _requisicao.reset(token)
+    return medicoes or []
+
+
+def registrar(operacao, segundos, linhas=None):
+    """
+    Registra uma operação medida em outro lugar (ex.: em um processo do pool).
+
+    Dentro de ``coletar`` a operação é apenas guardada para ser devolvida ao
+    processo que submeteu o trabalho.
+
+    Args:
+        operacao (str): Nome da operação (ex.: 'analisador:frequencia')
+        segundos (float): Duração
+        linhas (int, optional): Linhas (sorteios, apostas) processadas
+    """
+    if not ativo():
+        return
+    coletadas = _coleta.get()
+    if coletadas is not None:
+        coletadas.append((operacao, segundos, linhas))
+        return
+    registrar_no_processo([(operacao, segundos, linhas)])
+    anotar_requisicao([(operacao, segundos, linhas)])
+
+
+def registrar_no_processo(operacoes):
+    """Acumula operações nos histogramas e contadores do processo, sem tocar na requisição."""
+    if not ativo():
+        return
+    for operacao, segundos, linhas in operacoes:
+        observar('lotofacil_operacao_segundos', segundos, operacao=operacao)
+        if linhas is not None:
+            incrementar('lotofacil_operacao_linhas_total', linhas, operacao=operacao)
+
+
+def anotar_requisicao(operacoes):
+    """Anota operações no ``Server-Timing`` da requisição atual, se houver."""
+    medicoes = _requisicao.get()
+    if medicoes is not None and ativo():
+        medicoes.extend((operacao, segundos, None) for operacao, segundos, _ in operacoes)
+
+
+def coletar(funcao, *args):
+    """
+    Executa ``funcao(*args)`` guardando as operações medidas em vez de registrá-las.
+
+    Usado nos processos do pool, cujo registro não é exposto em ``/metrics``:
+    as operações voltam junto com o resultado e o processo web as registra
+    com ``registrar_no_processo`` e ``anotar_requisicao``.
+
+    Returns:
+        tuple: (resultado, lista de (operação, segundos, linhas))
+    """
+    token = _coleta.set([])
+    try:
+        resultado = funcao(*args)
+        return resultado, _coleta.get()
+    finally:
+        _coleta.reset(token)
+
+
+def registrar_cache(nome, acerto):
+    """Conta um acerto ou falha de cache e o anota na requisição atual."""
+    if not ativo():
+        return
+    resultado = 'acerto' if acerto else 'falha'
+    incrementar('lotofacil_cache_total', cache=nome, resultado=resultado)
+    medicoes = _requisicao.get()
+    if medicoes is not None:
+        medicoes.append((f'cache:{nome}', None, 'hit' if acerto else 'miss'))
+
+
+class Medicao:
+    """
+    Gerenciador de contexto que mede a duração de uma operação.
+
+    Atribua ``linhas`` dentro do bloco para contar as linhas processadas::
+
+        with medir('importacao') as medicao:
+            df = pd.read_csv(caminho)
+            medicao.linhas = len(df)
+    """
+
+    __slots__ = ('operacao', 'linhas', '_inicio')
+
+    def __init__(self, operacao):
+        self.operacao = operacao
+        self.linhas = None
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        registrar(self.operacao, time.perf_counter() - self._inicio, self.linhas)
+        return False
+
+
+class _MedicaoNula:
+    """Substituto sem custo de ``Medicao`` quando a instrumentação está desligada."""
+
+    __slots__ = ('linhas',)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+def medir(operacao):
+    """
+    Mede a duração do bloco ``with`` como a operação informada.
+
+    Returns:
+        Medicao: Gerenciador de contexto (nulo se a instrumentação estiver desligada)
+    """
+    return Medicao(operacao) if ativo() else _MedicaoNula()
+
+
+def instrumentar(operacao):
+    """
+    Decorador que mede cada chamada da função como ``operacao``.
+
+    Se o retorno tiver tamanho (DataFrame, lista de apostas...), ele é contado
+    como as linhas processadas.
+    """
+    def decorador(funcao):
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not ativo():
+                return funcao(*args, **kwargs)
+            with Medicao(operacao) as medicao:
+                resultado = funcao(*args, **kwargs)
+                try:
+                    medicao.linhas = len(resultado)
+                except TypeError:
+                    pass
+            return resultado
+        return envoltorio
+    return decorador
+
+
+def _nome_timing(nome):
+    """Converte o nome da operação em um token válido para ``Server-Timing``."""
+    return re.sub(r'[^A-Za-z0-9_.-]', '-', nome)
+
+
+def cabecalho_server_timing(medicoes, total=None):
+    """
+    Monta o valor do cabeçalho ``Server-Timing``.
+
+    Operações repetidas na mesma requisição são somadas.
+
+    Args:
+        medicoes (list): Tuplas devolvidas por ``encerrar_requisicao``
+        total (float, optional): Duração total da requisição, em segundos
+
+    Returns:
+        str: Ex.: ``importacao;dur=12.3, cache-estatisticas;desc="hit", total;dur=40.1``
+    """
+    agregadas = {}
+    for nome, segundos, descricao in medicoes:
+        atual = agregadas.setdefault(_nome_timing(nome), [None, descricao])
+        if segundos is not None:
+            atual[0] = (atual[0] or 0) + segundos
+        if descricao is not None:
+            atual[1] = descricao
+    if total is not None:
+        agregadas['total'] = [total, None]
+
+    partes = []
+    for nome, (segundos, descricao) in agregadas.items():
+        parte = nome
+        if segundos is not None:
+            parte += f';dur={segundos * 1000:.1f}'
+        if descricao is not None:
+            parte += f';desc="{descricao}"'
+        partes.append(parte)
+    return ', '.join(partes)
+
+
+def _formatar_rotulos(rotulos, extra=None):
+    itens = list(rotulos) + ([extra] if extra else [])
+    if not itens:
+        return ''
+    texto = ','.join(
+        '{}="{}"'.format(
+            chave, valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        )
+        for chave, valor in itens
+    )
+    return '{' + texto + '}'
+
+
+def exposicao():
+    """
+    Métricas do processo no formato texto do Prometheus (versão 0.0.4).
+
+    Returns:
+        str: Corpo da resposta de ``/metrics``
+    """
+    with _lock:
+        histogramas = {chave: (list(h.buckets), h.soma, h.total) for chave, h in _histogramas.items()}
+        contadores = dict(_contadores)
+
+    linhas = []
+    for metrica, (tipo, descricao) in DESCRICOES.items():
+        linhas.append(f'# HELP {metrica} {descricao}')
+        linhas.append(f'# TYPE {metrica} {tipo}')
+        if tipo == 'histogram':
+            for (nome, rotulos), (buckets, soma, total) in sorted(histogramas.items()):
+                if nome != metrica:
+                    continue
+                acumulado = 0
+                for limite, quantidade in zip(BUCKETS + (float('inf'),), buckets):
+                    acumulado += quantidade
+                    le = '+Inf' if limite == float('inf') else repr(limite)
+                    linhas.append(f'{metrica}_bucket{_formatar_rotulos(rotulos, ("le", le))} {acumulado}')
+                linhas.append(f'{metrica}_sum{_formatar_rotulos(rotulos)} {soma}')
+                linhas.append(f'{metrica}_count{_formatar_rotulos(rotulos)} {total}')
+        else:
+            for (nome, rotulos), valor in sorted(contadores.items()):
+                if nome == metrica:
+                    linhas.append(f'{metrica}{_formatar_rotulos(rotulos)} {valor}')
+    return '\n'.join(linhas) + '\n'
+
+
+def reiniciar():
+    """Zera as métricas do processo (usado em testes e benchmarks)."""
+    with _lock:
+        _histogramas.clear()
+        _contadores.clear()
@@ -0,0 +1,58 @@
+# lotofacil_analyzer/middleware.py
+from . import metrics
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+import time
+
+
+class ServerTimingMiddleware:
+    """
+    Mede cada requisição e devolve as medições no cabeçalho ``Server-Timing``.
+
+    As operações instrumentadas durante a requisição (``metrics.medir``,
+    ``metrics.instrumentar``) aparecem no cabeçalho junto com a duração total,
+    que também alimenta o histograma ``lotofacil_requisicao_segundos``.
+    Funciona tanto no caminho síncrono quanto no assíncrono.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not metrics.ativo():
+            return self.get_response(request)
+        token = metrics.iniciar_requisicao()
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            medicoes = metrics.encerrar_requisicao(token)
+        return self._finalizar(request, response, medicoes, time.perf_counter() - inicio)
+
+    async def __acall__(self, request):
+        if not metrics.ativo():
+            return await self.get_response(request)
+        token = metrics.iniciar_requisicao()
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            medicoes = metrics.encerrar_requisicao(token)
+        return self._finalizar(request, response, medicoes, time.perf_counter() - inicio)
+
+    @staticmethod
+    def _finalizar(request, response, medicoes, total):
+        # Rótulo pelo nome da rota, não pelo caminho, para não explodir a cardinalidade
+        rota = getattr(request.resolver_match, 'view_name', None) or 'desconhecida'
+        metrics.observar(
+            'lotofacil_requisicao_segundos', total,
+            rota=rota, metodo=request.method, status=response.status_code,
+        )
+        response['Server-Timing'] = metrics.cabecalho_server_timing(medicoes, total)
+        return response
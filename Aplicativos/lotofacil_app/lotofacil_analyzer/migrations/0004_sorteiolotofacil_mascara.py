@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-19 02:24
+
+from django.db import migrations, models
+
+
+def preencher_mascaras(apps, schema_editor):
+    """Calcula a máscara de bits dos sorteios já existentes."""
+    SorteioLotofacil = apps.get_model('lotofacil_analyzer', 'SorteioLotofacil')
+    sorteios = list(SorteioLotofacil.objects.only('id', 'numeros'))
+    for sorteio in sorteios:
+        sorteio.mascara = sum(1 << (int(n) - 1) for n in sorteio.numeros.split(','))
+    SorteioLotofacil.objects.bulk_update(sorteios, ['mascara'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotofacil_analyzer', '0003_analiseestatistica_apostagerada_sorteiolotofacil_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sorteiolotofacil',
+            name='mascara',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_mascaras, migrations.RunPython.noop),
+    ]
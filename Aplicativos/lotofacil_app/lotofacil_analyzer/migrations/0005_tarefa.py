@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-19 02:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotofacil_analyzer', '0004_sorteiolotofacil_mascara'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('gerar_apostas', 'Geração de Apostas'), ('portfolio', 'Portfólio Otimizado'), ('monte_carlo', 'Simulação Monte Carlo')], max_length=50)),
+                ('parametros', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('executando', 'Executando'), ('concluida', 'Concluída'), ('falhou', 'Falhou')], default='pendente', max_length=20)),
+                ('progresso', models.FloatField(default=0)),
+                ('mensagem', models.CharField(blank=True, max_length=200)),
+                ('resumo', models.JSONField(blank=True, null=True)),
+                ('arquivo_resultado', models.CharField(blank=True, max_length=255)),
+                ('erro', models.TextField(blank=True)),
+                ('criada_em', models.DateTimeField(auto_now_add=True)),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True)),
+                ('concluida_em', models.DateTimeField(blank=True, null=True)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tarefas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'ordering': ['-criada_em'],
+                'indexes': [models.Index(fields=['status', 'criada_em'], name='tarefa_status_criada_idx')],
+            },
+        ),
+    ]
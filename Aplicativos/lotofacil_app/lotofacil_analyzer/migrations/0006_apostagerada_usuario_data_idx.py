@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-19 02:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotofacil_analyzer', '0005_tarefa'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apostagerada',
+            index=models.Index(fields=['usuario', 'data_geracao'], name='aposta_usuario_data_idx'),
+        ),
+    ]
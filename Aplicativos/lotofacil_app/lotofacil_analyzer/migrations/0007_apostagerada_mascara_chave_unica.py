@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def preencher_mascaras(apps, schema_editor):
+    """Calcula a máscara de bits das apostas já existentes, em lotes."""
+    ApostaGerada = apps.get_model('lotofacil_analyzer', 'ApostaGerada')
+    lote = []
+    for aposta in ApostaGerada.objects.only('id', 'numeros').iterator(chunk_size=2000):
+        aposta.mascara = sum(1 << (int(n) - 1) for n in aposta.numeros.split(','))
+        lote.append(aposta)
+        if len(lote) == 2000:
+            ApostaGerada.objects.bulk_update(lote, ['mascara'])
+            lote = []
+    ApostaGerada.objects.bulk_update(lote, ['mascara'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotofacil_analyzer', '0006_apostagerada_usuario_data_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apostagerada',
+            name='chave_unica',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='apostagerada',
+            name='mascara',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_mascaras, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='apostagerada',
+            index=models.Index(fields=['mascara'], name='aposta_mascara_idx'),
+        ),
+    ]
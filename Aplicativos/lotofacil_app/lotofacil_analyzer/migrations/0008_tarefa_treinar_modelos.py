@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotofacil_analyzer', '0007_apostagerada_mascara_chave_unica'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tarefa',
+            name='tipo',
+            field=models.CharField(choices=[('gerar_apostas', 'Geração de Apostas'), ('portfolio', 'Portfólio Otimizado'), ('monte_carlo', 'Simulação Monte Carlo'), ('treinar_modelos', 'Treino dos Modelos')], max_length=50),
+        ),
+    ]
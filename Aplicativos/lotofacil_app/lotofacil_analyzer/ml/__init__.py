@@ -0,0 +1,3 @@
+# lotofacil_analyzer/ml/__init__.py
+from .features import NOMES_FEATURES, calcular_features
+from .modelos import carregar_modelos, prever, resumo_modelos, treinar, treinar_armazem, versao_dados
@@ -0,0 +1,106 @@
+# lotofacil_analyzer/ml/features.py
+"""
+Matriz de atributos por sorteio e por número para os modelos de ``ml.modelos``.
+
+A linha ``t`` descreve o histórico até o sorteio ``t`` (inclusive) e é usada
+para prever a presença de cada número no sorteio ``t + 1``; a última linha é
+a da previsão do próximo concurso. Todos os atributos são calculados de uma
+vez, vetorizados ao longo do histórico.
+"""
+
+from ..data.bitmask import NUMEROS_POR_SORTEIO, TOTAL_NUMEROS, matriz_incidencia
+from scipy import signal
+import numpy as np
+
+# Defasagens da presença (1 = o próprio sorteio t)
+DEFASAGENS = 5
+ALFAS_EWMA = (0.05, 0.2)
+NOMES_FEATURES = (
+    tuple(f'presenca_{d}' for d in range(1, DEFASAGENS + 1))
+    + ('atraso', 'frequencia')
+    + tuple(f'ewma_{alfa}' for alfa in ALFAS_EWMA)
+    + ('coocorrencia',)
+)
+
+# Sorteios por bloco no acumulado de pares (limita a memória a BLOCO x 25 x 25)
+_BLOCO = 4096
+
+# Frequência esperada de cada número, ponto de partida das médias móveis
+_P = NUMEROS_POR_SORTEIO / TOTAL_NUMEROS
+
+
+def _atrasos(presente):
+    """Sorteios desde a última aparição de cada número, até o sorteio t (0 se saiu em t)."""
+    total = len(presente)
+    posicoes = np.arange(total)[:, np.newaxis]
+    # Última posição em que o número saiu; antes da primeira aparição conta desde o início
+    ultima = np.maximum.accumulate(np.where(presente, posicoes, -1), axis=0)
+    return np.where(ultima >= 0, posicoes - ultima, posicoes + 1)
+
+
+def _coocorrencias(presente):
+    """
+    Taxa média com que o número saiu junto dos números do sorteio t, até t.
+
+    Para cada número k e cada j do sorteio t (j != k), a taxa é a fração dos
+    sorteios de j em que k também saiu; a feature é a razão entre as somas
+    dessas coocorrências e das aparições de j.
+    """
+    total = len(presente)
+    resultado = np.empty((total, TOTAL_NUMEROS), dtype=np.float64)
+    acumulado = np.zeros((TOTAL_NUMEROS, TOTAL_NUMEROS), dtype=np.float64)
+    for inicio in range(0, total, _BLOCO):
+        bloco = presente[inicio:inicio + _BLOCO].astype(np.float64)
+        # Pares acumulados até cada sorteio do bloco, inclusive
+        pares = acumulado + np.cumsum(bloco[:, :, np.newaxis] * bloco[:, np.newaxis, :], axis=0)
+        frequencias = np.diagonal(pares, axis1=1, axis2=2)
+        numerador = np.einsum('tj,tjk->tk', bloco, pares) - bloco * frequencias
+        denominador = (bloco * frequencias).sum(axis=1, keepdims=True) - bloco * frequencias
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resultado[inicio:inicio + len(bloco)] = np.where(
+                denominador > 0, numerador / np.where(denominador > 0, denominador, 1), _P,
+            )
+        acumulado = pares[-1]
+    return resultado
+
+
+def calcular_features(mascaras):
+    """
+    Calcula os atributos de cada número após cada sorteio.
+
+    Args:
+        mascaras (np.ndarray): Máscaras dos sorteios, em ordem de concurso
+
+    Returns:
+        np.ndarray: ``float32`` com forma (sorteios, 25, len(NOMES_FEATURES))
+    """
+    presente = matriz_incidencia(mascaras)
+    total = len(presente)
+    valores = presente.astype(np.float64)
+    features = np.empty((total, TOTAL_NUMEROS, len(NOMES_FEATURES)), dtype=np.float32)
+
+    for d in range(DEFASAGENS):
+        features[d:, :, d] = valores[:total - d] if d else valores
+        features[:d, :, d] = 0
+
+    coluna = DEFASAGENS
+    features[:, :, coluna] = _atrasos(presente)
+    features[:, :, coluna + 1] = np.cumsum(valores, axis=0) / np.arange(1, total + 1)[:, np.newaxis]
+    coluna += 2
+    for alfa in ALFAS_EWMA:
+        # e[t] = (1 - alfa) * e[t - 1] + alfa * x[t], partindo da frequência esperada
+        inicial = np.full((1, TOTAL_NUMEROS), (1 - alfa) * _P)
+        features[:, :, coluna], _ = signal.lfilter([alfa], [1, alfa - 1], valores, axis=0, zi=inicial)
+        coluna += 1
+    features[:, :, coluna] = _coocorrencias(presente)
+    return features
+
+
+def alvos(mascaras):
+    """
+    Presença de cada número no sorteio seguinte ao de cada linha de atributos.
+
+    Returns:
+        np.ndarray: ``bool`` (sorteios - 1, 25); a última linha de atributos não tem alvo
+    """
+    return matriz_incidencia(mascaras)[1:]
@@ -0,0 +1,297 @@
+# lotofacil_analyzer/ml/modelos.py
+"""
+Classificadores por número treinados sobre a matriz de ``ml.features``.
+
+Tudo é versionado pelo conteúdo dos sorteios (``versao_dados``): cada versão
+tem um diretório em ``LOTOFACIL_DIRETORIO_MODELOS`` com a matriz de
+atributos (``features.npy``) e os modelos ajustados (``modelos.joblib``).
+Republicar os mesmos sorteios (ex.: só os metadados do CSV mudaram) mantém a
+versão, então o treino só se repete quando chega um novo concurso; a
+inferência carrega os modelos persistidos e a última linha de atributos.
+
+O treino nunca roda no caminho de uma requisição: cada geração publicada
+enfileira a tarefa ``treinar_modelos`` do worker (``signals``) e a página de
+estatísticas só carrega os modelos, com um aviso enquanto não existirem.
+"""
+
+from .features import NOMES_FEATURES, alvos, calcular_features
+from ..data.bitmask import NUMEROS_POR_SORTEIO, TOTAL_NUMEROS
+from ..data.store import obter_armazem
+from ..memoria import CacheLimitado
+from ..metrics import medir
+from django.conf import settings
+from joblib import Parallel, delayed
+from pathlib import Path
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss, log_loss, roc_auc_score
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+import hashlib
+import joblib
+import logging
+import os
+import shutil
+import time
+import uuid
+import numpy as np
+
+ARQUIVO_FEATURES = 'features.npy'
+ARQUIVO_MODELOS = 'modelos.joblib'
+VERSOES_MANTIDAS = 3
+
+# Dobras da validação cruzada temporal (cada dobra valida em sorteios posteriores aos do treino)
+DOBRAS = 5
+# Primeiras linhas descartadas do treino: atributos ainda sem histórico
+AQUECIMENTO = 50
+MINIMO_SORTEIOS = AQUECIMENTO + 10 * DOBRAS
+
+# Modelos já carregados, por versão (poucas versões vivas)
+_CARREGADOS = CacheLimitado()
+
+logger = logging.getLogger(__name__)
+
+
+def diretorio_modelos():
+    """Diretório das versões de atributos e modelos."""
+    return Path(getattr(settings, 'LOTOFACIL_DIRETORIO_MODELOS',
+                        Path(settings.BASE_DIR) / 'lotofacil_analyzer' / 'data' / 'modelos'))
+
+
+def versao_dados(concursos, mascaras):
+    """
+    Versão de um histórico: último concurso e impressão digital dos sorteios.
+
+    Returns:
+        str: Nome do diretório da versão (ex.: ``concurso_003344_1a2b3c4d5e6f``)
+    """
+    concursos = np.ascontiguousarray(concursos, dtype=np.int64)
+    impressao = hashlib.blake2b(concursos.tobytes(), digest_size=6)
+    impressao.update(np.ascontiguousarray(mascaras, dtype=np.uint32).tobytes())
+    ultimo = int(concursos[-1]) if len(concursos) else 0
+    return f'concurso_{ultimo:06d}_{impressao.hexdigest()}'
+
+
+def _gravar_atomico(caminho, gravar):
+    """Grava em um arquivo temporário e o renomeia, para leitores nunca verem um arquivo parcial."""
+    temporario = caminho.with_name(f'.{caminho.name}-{os.getpid()}-{uuid.uuid4().hex}')
+    try:
+        with open(temporario, 'wb') as arquivo:
+            gravar(arquivo)
+        os.replace(temporario, caminho)
+    finally:
+        temporario.unlink(missing_ok=True)
+
+
+def obter_features(versao, mascaras):
+    """
+    Matriz de atributos de uma versão, calculada e gravada só na primeira vez.
+
+    Returns:
+        np.ndarray: Matriz mapeada em memória (somente leitura)
+    """
+    caminho = diretorio_modelos() / versao / ARQUIVO_FEATURES
+    if not caminho.exists():
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with medir('ml_features') as medicao:
+            medicao.linhas = len(mascaras)
+            features = calcular_features(mascaras)
+        _gravar_atomico(caminho, lambda arquivo: np.save(arquivo, features))
+    return np.load(caminho, mmap_mode='r')
+
+
+def _novo_modelo():
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+
+
+def treinar_numero(X, y, dobras=DOBRAS):
+    """
+    Valida (validação cruzada temporal) e ajusta o classificador de um número.
+
+    As métricas de cada dobra comparam o modelo à previsão constante com a
+    frequência do número no treino da dobra (``log_loss_base``).
+
+    Args:
+        X (np.ndarray): Atributos do número (linhas, features)
+        y (np.ndarray): Presença do número no sorteio seguinte
+
+    Returns:
+        tuple: (modelo ajustado em todas as linhas, métricas médias das dobras)
+    """
+    metricas = {'auc': [], 'log_loss': [], 'log_loss_base': [], 'brier': []}
+    for treino, validacao in TimeSeriesSplit(n_splits=dobras).split(X):
+        modelo = _novo_modelo().fit(X[treino], y[treino])
+        probabilidade = modelo.predict_proba(X[validacao])[:, 1]
+        base = np.full(len(validacao), y[treino].mean())
+        metricas['auc'].append(roc_auc_score(y[validacao], probabilidade))
+        metricas['log_loss'].append(log_loss(y[validacao], probabilidade, labels=[0, 1]))
+        metricas['log_loss_base'].append(log_loss(y[validacao], base, labels=[0, 1]))
+        metricas['brier'].append(brier_score_loss(y[validacao], probabilidade))
+    return _novo_modelo().fit(X, y), {nome: float(np.mean(v)) for nome, v in metricas.items()}
+
+
+def treinar(concursos, mascaras, processos=None, forcar=False):
+    """
+    Treina os 25 classificadores de um histórico, se a versão ainda não tiver modelos.
+
+    A validação cruzada e o ajuste de cada número rodam em paralelo com
+    ``joblib``; o resultado é gravado em ``modelos.joblib`` da versão.
+
+    Args:
+        concursos (np.ndarray): Concursos, em ordem crescente
+        mascaras (np.ndarray): Máscaras dos sorteios, na mesma ordem
+        processos (int, optional): Processos do ``joblib`` (None = núcleos da CPU)
+        forcar (bool): Treina mesmo que a versão já tenha modelos
+
+    Returns:
+        str: Versão treinada
+
+    Raises:
+        ValueError: Se o histórico tiver menos de ``MINIMO_SORTEIOS`` sorteios
+    """
+    if len(concursos) < MINIMO_SORTEIOS:
+        raise ValueError(f"São necessários pelo menos {MINIMO_SORTEIOS} sorteios para treinar os modelos.")
+    versao = versao_dados(concursos, mascaras)
+    caminho = diretorio_modelos() / versao / ARQUIVO_MODELOS
+    if caminho.exists() and not forcar:
+        return versao
+
+    features = obter_features(versao, mascaras)
+    X = np.asarray(features[AQUECIMENTO:-1])
+    y = alvos(mascaras)[AQUECIMENTO:].astype(np.int8)
+    with medir('ml_treino') as medicao:
+        medicao.linhas = len(X)
+        inicio = time.perf_counter()
+        ajustes = Parallel(n_jobs=processos or -1)(
+            delayed(treinar_numero)(X[:, numero], y[:, numero]) for numero in range(TOTAL_NUMEROS)
+        )
+        duracao = time.perf_counter() - inicio
+
+    pacote = {
+        'versao': versao,
+        'features': NOMES_FEATURES,
+        'ultimo_concurso': int(concursos[-1]),
+        'linhas_treino': len(X),
+        'treinado_em': time.time(),
+        'duracao': duracao,
+        'modelos': [modelo for modelo, _ in ajustes],
+        'metricas': [metricas for _, metricas in ajustes],
+    }
+    _gravar_atomico(caminho, lambda arquivo: joblib.dump(pacote, arquivo))
+    _CARREGADOS.descartar(versao)
+    logger.info("Modelos da versão %s treinados em %.2fs.", versao, duracao)
+    _remover_versoes_antigas(versao)
+    return versao
+
+
+def treinar_armazem(processos=None, forcar=False):
+    """
+    Treina os modelos da geração vigente do armazém (nada faz se já existirem).
+
+    Returns:
+        str: Versão dos modelos vigentes
+    """
+    armazem = obter_armazem()
+    if not armazem.disponivel():
+        raise FileNotFoundError("Nenhuma geração de dados publicada")
+    return treinar(armazem.arrays['concursos'], armazem.arrays['mascaras'], processos, forcar)
+
+
+def carregar_modelos(versao):
+    """
+    Modelos persistidos de uma versão (em cache no processo).
+
+    Raises:
+        FileNotFoundError: Se a versão não foi treinada
+    """
+    def carregar():
+        pasta = diretorio_modelos() / versao
+        pacote = joblib.load(pasta / ARQUIVO_MODELOS)
+        pacote['ultima_linha'] = np.array(np.load(pasta / ARQUIVO_FEATURES, mmap_mode='r')[-1])
+        return pacote
+
+    return _CARREGADOS.obter(versao, carregar)
+
+
+def prever(versao):
+    """
+    Probabilidade de cada número sair no concurso seguinte ao último da versão.
+
+    Returns:
+        dict: ``proximo_concurso``, ``probabilidades`` (25,) e o pacote de modelos
+    """
+    pacote = carregar_modelos(versao)
+    linha = pacote['ultima_linha']
+    probabilidades = np.array([
+        modelo.predict_proba(linha[numero][np.newaxis])[0, 1]
+        for numero, modelo in enumerate(pacote['modelos'])
+    ])
+    return {
+        'proximo_concurso': pacote['ultimo_concurso'] + 1,
+        'probabilidades': probabilidades,
+        'pacote': pacote,
+    }
+
+
+def resumo_modelos():
+    """
+    Monta a previsão da geração vigente para a página de estatísticas, sem treinar.
+
+    Returns:
+        dict: Linhas por número (probabilidade prevista e métricas da
+        validação cruzada), as médias e os dados do treino; ``erro`` se o
+        histórico for curto demais ou os modelos da versão ainda não existirem
+    """
+    armazem = obter_armazem()
+    if not armazem.disponivel():
+        raise FileNotFoundError("Nenhuma geração de dados publicada")
+    concursos, mascaras = armazem.arrays['concursos'], armazem.arrays['mascaras']
+    if len(concursos) < MINIMO_SORTEIOS:
+        return {'erro': f"São necessários pelo menos {MINIMO_SORTEIOS} sorteios para treinar os modelos."}
+    versao = versao_dados(concursos, mascaras)
+    if not (diretorio_modelos() / versao / ARQUIVO_MODELOS).exists():
+        return {'erro': "Os modelos desta versão dos sorteios ainda estão sendo treinados."}
+
+    # Montado uma vez por versão carregada: as requisições seguintes não fazem inferência
+    pacote = carregar_modelos(versao)
+    if 'resumo' not in pacote:
+        pacote['resumo'] = _montar_resumo(versao)
+    return pacote['resumo']
+
+
+def _montar_resumo(versao):
+    """Previsão e métricas de uma versão treinada, no formato de ``resumo_modelos``."""
+    previsao = prever(versao)
+    pacote = previsao['pacote']
+    probabilidades = previsao['probabilidades']
+    linhas = [
+        {
+            'numero': numero + 1,
+            'probabilidade': float(probabilidades[numero]) * 100,
+            **metricas,
+            'ganho': (1 - metricas['log_loss'] / metricas['log_loss_base']) * 100,
+        }
+        for numero, metricas in enumerate(pacote['metricas'])
+    ]
+    linhas.sort(key=lambda linha: (-linha['probabilidade'], linha['numero']))
+    return {
+        'versao': versao,
+        'proximo_concurso': previsao['proximo_concurso'],
+        'linhas_treino': pacote['linhas_treino'],
+        'dobras': DOBRAS,
+        'features': pacote['features'],
+        'esperado': NUMEROS_POR_SORTEIO / TOTAL_NUMEROS * 100,
+        'auc_medio': float(np.mean([linha['auc'] for linha in linhas])),
+        'ganho_medio': float(np.mean([linha['ganho'] for linha in linhas])),
+        'numeros': linhas,
+    }
+
+
+def _remover_versoes_antigas(atual):
+    """Mantém só as ``VERSOES_MANTIDAS`` versões treinadas mais recentes."""
+    pastas = sorted(
+        (p for p in diretorio_modelos().glob('concurso_*') if p.is_dir() and p.name != atual),
+        key=lambda p: p.stat().st_mtime, reverse=True,
+    )
+    for pasta in pastas[VERSOES_MANTIDAS - 1:]:
+        shutil.rmtree(pasta, ignore_errors=True)
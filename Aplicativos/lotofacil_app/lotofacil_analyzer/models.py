@@ -2,18 +2,25 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 import json
+from .data import bitmask
 
 class SorteioLotofacil(models.Model):
     """Armazena resultados dos sorteios da Lotofácil."""
     concurso = models.IntegerField(unique=True)  # Número do concurso
     data = models.DateField()  # Data do sorteio
     numeros = models.CharField(max_length=50)  # Números sorteados (ex: "1,2,3,4,...")
+    mascara = models.IntegerField(default=0)  # Números sorteados como máscara de bits (bit n-1 = número n)
     ganhadores_15_acertos = models.IntegerField(default=0)  # Ganhadores com 15 acertos
 
     def get_numeros_list(self):
         """Retorna os números como lista de inteiros."""
         return [int(n) for n in self.numeros.split(',')]
 
+    def save(self, *args, **kwargs):
+        """Mantém a máscara de bits sincronizada com os números."""
+        self.mascara = bitmask.mascara(self.get_numeros_list())
+        super().save(*args, **kwargs)
+
     def clean(self):
         """Valida os números sorteados."""
         numeros = self.get_numeros_list()
@@ -73,6 +80,9 @@ class ApostaGerada(models.Model):
     usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='apostas_geradas')
     data_geracao = models.DateTimeField(auto_now_add=True)
     numeros = models.CharField(max_length=50)  # "1,2,3,4,..."
+    mascara = models.IntegerField(default=0)  # Números como máscara de bits (bit n-1 = número n)
+    # Preenchida só no modo sem repetição (ver unicidade.py); nulos não colidem
+    chave_unica = models.BigIntegerField(null=True, blank=True, unique=True, editable=False)
     metodo_geracao = models.CharField(max_length=50, choices=METODO_GERACAO_CHOICES)
     parametros = models.JSONField(null=True, blank=True)  # Parâmetros usados para gerar
 
@@ -80,6 +90,11 @@ class ApostaGerada(models.Model):
         """Retorna os números como lista de inteiros."""
         return [int(n) for n in self.numeros.split(',')]
 
+    def save(self, *args, **kwargs):
+        """Mantém a máscara de bits sincronizada com os números."""
+        self.mascara = bitmask.mascara(self.get_numeros_list())
+        super().save(*args, **kwargs)
+
     def clean(self):
         """Valida os números da aposta."""
         numeros = self.get_numeros_list()
@@ -95,4 +110,60 @@ class ApostaGerada(models.Model):
         ordering = ['-data_geracao']
         verbose_name = 'Aposta Gerada'
         verbose_name_plural = 'Apostas Geradas'
+        indexes = [
+            # Histórico do usuário, do mais recente para o mais antigo
+            models.Index(fields=['usuario', 'data_geracao'], name='aposta_usuario_data_idx'),
+            # Busca de apostas repetidas
+            models.Index(fields=['mascara'], name='aposta_mascara_idx'),
+        ]
+
+
+
+class Tarefa(models.Model):
+    """Computação pesada enfileirada para o comando ``worker``."""
+    TIPO_CHOICES = [
+        ('gerar_apostas', 'Geração de Apostas'),
+        ('portfolio', 'Portfólio Otimizado'),
+        ('monte_carlo', 'Simulação Monte Carlo'),
+        ('treinar_modelos', 'Treino dos Modelos'),
+    ]
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('executando', 'Executando'),
+        ('concluida', 'Concluída'),
+        ('falhou', 'Falhou'),
+    ]
 
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='tarefas')
+    # Sessão que criou a tarefa anônima: só ela acompanha a tarefa e baixa o resultado
+    sessao = models.CharField(max_length=40, blank=True, editable=False)
+    tipo = models.CharField(max_length=50, choices=TIPO_CHOICES)
+    parametros = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pendente')
+    progresso = models.FloatField(default=0)  # Fração concluída, de 0 a 1
+    mensagem = models.CharField(max_length=200, blank=True)  # Etapa atual
+    resumo = models.JSONField(null=True, blank=True)  # Resumo pequeno do resultado
+    arquivo_resultado = models.CharField(max_length=255, blank=True)  # Artefato completo em disco
+    erro = models.TextField(blank=True)
+    criada_em = models.DateTimeField(auto_now_add=True)
+    iniciada_em = models.DateTimeField(null=True, blank=True)
+    concluida_em = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def finalizada(self):
+        """Indica se a tarefa já terminou, com sucesso ou não."""
+        return self.status in ('concluida', 'falhou')
+
+    def __str__(self):
+        return f"Tarefa {self.pk} ({self.get_tipo_display()}) - {self.get_status_display()}"
+
+    class Meta:
+        ordering = ['-criada_em']
+        verbose_name = 'Tarefa'
+        verbose_name_plural = 'Tarefas'
+        indexes = [
+            # O worker busca as pendentes mais antigas
+            models.Index(fields=['status', 'criada_em'], name='tarefa_status_criada_idx'),
+            # Limite de tarefas abertas por sessão anônima
+            models.Index(fields=['sessao', 'status'], name='tarefa_sessao_status_idx'),
+        ]
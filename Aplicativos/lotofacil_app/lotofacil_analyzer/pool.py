@@ -0,0 +1,93 @@
+# lotofacil_analyzer/pool.py
+"""
+Pool de processos limitado para o trabalho pesado das views assíncronas.
+
+Requisições simultâneas para a mesma computação (mesma chave) compartilham um
+único ``Future``: apenas a primeira submete o trabalho ao pool e as demais
+aguardam o mesmo resultado. Os futures são de ``concurrent.futures`` (seguros
+entre threads), então o agrupamento funciona tanto sob ASGI quanto sob WSGI,
+onde cada view assíncrona roda no seu próprio loop de eventos.
+
+As operações instrumentadas no pool voltam com o resultado: entram uma vez
+nas métricas do processo web e no ``Server-Timing`` de cada requisição que
+aguardou a computação.
+"""
+
+from . import metrics
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+import asyncio
+import django
+import multiprocessing
+import threading
+
+_pool = None
+_lock = threading.RLock()
+_em_andamento = {}
+
+
+def obter_pool():
+    """
+    Cria sob demanda o pool com ``LOTOFACIL_PROCESSOS_POOL`` processos.
+
+    O pool nasce na thread de uma requisição (servidor WSGI com threads ou
+    thread pool do ASGI), então os processos são iniciados via spawn, como os
+    do comando ``worker``: um fork herdaria travas ocupadas por outras threads.
+    """
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'LOTOFACIL_PROCESSOS_POOL', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            )
+        return _pool
+
+
+def encerrar_pool():
+    """Encerra o pool (usado em testes e no desligamento do processo)."""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+        _em_andamento.clear()
+
+
+def submeter_coalescido(chave, funcao, *args):
+    """
+    Submete ``funcao(*args)`` ao pool, reaproveitando uma execução em andamento.
+
+    Args:
+        chave (hashable): Identifica a computação (ex.: ('estatisticas', geração))
+        funcao (callable): Função de nível de módulo (serializável via pickle)
+
+    Returns:
+        concurrent.futures.Future: Future compartilhado por todas as chamadas
+        com a mesma chave enquanto a execução não terminar. O resultado é a
+        tupla (retorno de ``funcao``, operações medidas) de ``metrics.coletar``.
+    """
+    with _lock:
+        futuro = _em_andamento.get(chave)
+        if futuro is None:
+            futuro = obter_pool().submit(metrics.coletar, funcao, *args)
+            _em_andamento[chave] = futuro
+            futuro.add_done_callback(lambda f: _concluir(chave, f))
+        return futuro
+
+
+def _concluir(chave, futuro):
+    with _lock:
+        if _em_andamento.get(chave) is futuro:
+            del _em_andamento[chave]
+    # Uma vez por execução, mesmo que várias requisições a aguardem
+    if not futuro.cancelled() and futuro.exception() is None:
+        metrics.registrar_no_processo(futuro.result()[1])
+
+
+async def executar_coalescido(chave, funcao, *args):
+    """Versão assíncrona de ``submeter_coalescido`` que aguarda o resultado."""
+    resultado, operacoes = await asyncio.wrap_future(submeter_coalescido(chave, funcao, *args))
+    metrics.anotar_requisicao(operacoes)
+    return resultado
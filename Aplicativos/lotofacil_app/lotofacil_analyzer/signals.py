@@ -0,0 +1,68 @@
+# lotofacil_analyzer/signals.py
+"""
+Envia os sorteios gravados no banco para o armazém de dados processados.
+
+Cada sorteio novo atualiza incrementalmente o estado agregado e publica uma
+nova geração, o que também troca a versão das chaves de cache. Cada geração
+publicada da Lotofácil enfileira o treino dos modelos para o worker.
+"""
+
+from .data.store import geracao_publicada, obter_armazem
+from .jobs import enfileirar_treino
+from .models import SorteioLotofacil
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def ingerir_sorteios(sorteios):
+    """
+    Anexa sorteios ao armazém sem reprocessar o histórico.
+
+    Também é o ponto de entrada das importações em lote, já que
+    ``bulk_create`` não dispara ``post_save``.
+
+    Args:
+        sorteios (iterable): Instâncias de ``SorteioLotofacil``
+
+    Returns:
+        int | None: Geração publicada, ou None se nada foi anexado
+    """
+    sorteios = list(sorteios)
+    if not sorteios or not getattr(settings, 'LOTOFACIL_ANEXAR_SORTEIOS', True):
+        return None
+    try:
+        geracao = obter_armazem().anexar(
+            [s.concurso for s in sorteios], [s.get_numeros_list() for s in sorteios],
+            datas=[s.data for s in sorteios],
+            ganhadores=[s.ganhadores_15_acertos for s in sorteios],
+        )
+    except FileNotFoundError:
+        logger.info("Nenhuma geração atual publicada; os sorteios entram na próxima publicação.")
+        return None
+    if geracao is not None:
+        logger.info("Geração %s publicada com %d sorteio(s) novo(s).", geracao, len(sorteios))
+    return geracao
+
+
+@receiver(post_save, sender=SorteioLotofacil, dispatch_uid='lotofacil_ingerir_sorteio')
+def ingerir_sorteio_salvo(sender, instance, created, raw=False, **kwargs):
+    """Anexa o sorteio criado depois que a transação for confirmada."""
+    if created and not raw:
+        transaction.on_commit(lambda: ingerir_sorteios([instance]))
+
+
+@receiver(geracao_publicada, dispatch_uid='lotofacil_agendar_treino')
+def agendar_treino(sender, armazem, geracao, **kwargs):
+    """Enfileira o treino dos modelos da nova geração (``LOTOFACIL_TREINAR_AO_PUBLICAR``)."""
+    if armazem.jogo.chave != 'lotofacil' or not getattr(settings, 'LOTOFACIL_TREINAR_AO_PUBLICAR', True):
+        return
+    try:
+        enfileirar_treino()
+    except DatabaseError:
+        # Ex.: publicar_sorteios antes do migrate; o treino pode ser feito com treinar_modelos
+        logger.warning("Não foi possível enfileirar o treino dos modelos da geração %s.", geracao)
@@ -0,0 +1,2 @@
+# lotofacil_analyzer/simulation/__init__.py
+from .monte_carlo import SimuladorMonteCarlo
@@ -0,0 +1,162 @@
+# lotofacil_analyzer/simulation/monte_carlo.py
+from ..data.jogos import LOTOFACIL, obter_jogo
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+import numpy as np
+
+FAIXAS_PREMIADAS = LOTOFACIL.faixas_premiadas
+
+
+def probabilidades_teoricas(jogo=LOTOFACIL):
+    """
+    Distribuição hipergeométrica de acertos de uma aposta simples.
+
+    Returns:
+        np.ndarray: Probabilidade de 0..K acertos para uma aposta aleatória
+    """
+    return jogo.probabilidades_acertos()
+
+
+def _simular_bloco(semente, quantidade, estrategias, jogo=LOTOFACIL):
+    """
+    Simula um bloco de sorteios e pontua todas as estratégias contra ele.
+
+    Args:
+        semente (np.random.SeedSequence): Fluxo independente deste bloco
+        quantidade (int): Sorteios simulados no bloco
+        estrategias (dict): Nome da estratégia -> máscaras das apostas
+        jogo (Jogo): Jogo simulado
+
+    Returns:
+        dict: Nome -> {'acertos': histograma por aposta, 'melhor': histograma
+        do melhor acerto do portfólio em cada sorteio}
+    """
+    rng = np.random.default_rng(semente)
+    sorteios = jogo.sortear_mascaras(rng, quantidade)
+    tamanho = jogo.numeros_por_sorteio + 1
+
+    resultados = {}
+    for nome, apostas in estrategias.items():
+        matriz = jogo.acertos(apostas, sorteios)
+        resultados[nome] = {
+            'acertos': np.bincount(matriz.ravel(), minlength=tamanho),
+            'melhor': np.bincount(matriz.max(axis=0), minlength=tamanho),
+        }
+    return resultados
+
+
+class SimuladorMonteCarlo:
+    """
+    Simulador de sorteios uniformes para avaliar estratégias de geração.
+
+    Cada bloco de sorteios recebe um fluxo próprio derivado de uma única
+    ``SeedSequence``, então o resultado para uma semente é o mesmo
+    independentemente de quantos processos executaram os blocos.
+    """
+
+    def __init__(self, estrategias, quantidade_apostas=10, semente=None,
+                 tamanho_bloco=200_000, processos=None, jogo=None):
+        """
+        Inicializa o simulador
+
+        Args:
+            estrategias (dict): Nome -> lista fixa de apostas ou gerador com
+                método ``gerar(quantidade, salvar=False)`` (ex.: ``GeradorFrequencia``)
+            quantidade_apostas (int): Apostas pedidas a cada gerador
+            semente (int, optional): Semente para resultados reprodutíveis
+            tamanho_bloco (int): Sorteios simulados por bloco vetorizado
+            processos (int, optional): Processos de trabalho (padrão: núcleos)
+            jogo (Jogo | str, optional): Jogo simulado (padrão: Lotofácil)
+        """
+        if not estrategias:
+            raise ValueError("É necessária ao menos uma estratégia")
+
+        self.jogo = obter_jogo(jogo)
+        self.semente = semente
+        self.tamanho_bloco = tamanho_bloco
+        self.processos = processos or os.cpu_count() or 1
+        self.apostas = {
+            nome: self._resolver_apostas(estrategia, quantidade_apostas)
+            for nome, estrategia in estrategias.items()
+        }
+        self.resultados = {}
+
+    def _resolver_apostas(self, estrategia, quantidade):
+        """Converte uma estratégia (gerador ou lista de apostas) em máscaras."""
+        if hasattr(estrategia, 'gerar'):
+            estrategia = estrategia.gerar(quantidade=quantidade, salvar=False)
+        apostas = self.jogo.mascaras_de_matriz(estrategia)
+        if len(apostas) == 0:
+            raise ValueError("Estratégia sem apostas")
+        return apostas
+
+    @staticmethod
+    def _acompanhar(parciais, total_blocos, progresso):
+        """Consome os resultados dos blocos informando o progresso."""
+        if progresso is None:
+            return list(parciais)
+        resultados = []
+        for parcial in parciais:
+            resultados.append(parcial)
+            progresso(len(resultados) / total_blocos)
+        return resultados
+
+    def executar(self, total_sorteios=1_000_000, progresso=None):
+        """
+        Executa a simulação e consolida os histogramas de todos os blocos.
+
+        Args:
+            total_sorteios (int): Quantidade de sorteios simulados
+            progresso (callable, optional): Chamado com a fração de blocos
+                concluídos após cada bloco
+
+        Returns:
+            dict: Resultados por estratégia, comparados com o esperado ao acaso
+        """
+        blocos = [self.tamanho_bloco] * (total_sorteios // self.tamanho_bloco)
+        if total_sorteios % self.tamanho_bloco:
+            blocos.append(total_sorteios % self.tamanho_bloco)
+        sementes = np.random.SeedSequence(self.semente).spawn(len(blocos))
+
+        inicio = time.perf_counter()
+        if self.processos == 1 or len(blocos) == 1:
+            parciais = (
+                _simular_bloco(s, q, self.apostas, self.jogo) for s, q in zip(sementes, blocos)
+            )
+            parciais = self._acompanhar(parciais, len(blocos), progresso)
+        else:
+            with ProcessPoolExecutor(max_workers=self.processos) as executor:
+                parciais = self._acompanhar(executor.map(
+                    _simular_bloco, sementes, blocos, [self.apostas] * len(blocos),
+                    [self.jogo] * len(blocos),
+                    chunksize=max(1, len(blocos) // (self.processos * 4)),
+                ), len(blocos), progresso)
+        duracao = time.perf_counter() - inicio
+
+        esperado = probabilidades_teoricas(self.jogo)
+        faixas_premiadas = self.jogo.faixas_premiadas
+        self.resultados = {
+            'total_sorteios': total_sorteios,
+            'duracao_segundos': duracao,
+            'sorteios_por_minuto': total_sorteios / duracao * 60 if duracao else None,
+            'estrategias': {},
+        }
+        for nome, apostas in self.apostas.items():
+            acertos = sum(p[nome]['acertos'] for p in parciais)
+            melhor = sum(p[nome]['melhor'] for p in parciais)
+            total_jogos = acertos.sum()
+            self.resultados['estrategias'][nome] = {
+                'quantidade_apostas': len(apostas),
+                'histograma_acertos': acertos.tolist(),
+                'histograma_melhor': melhor.tolist(),
+                'frequencia_faixas': {
+                    faixa: float(acertos[faixa] / total_jogos) for faixa in faixas_premiadas
+                },
+                'esperado_aleatorio': {
+                    faixa: float(esperado[faixa]) for faixa in faixas_premiadas
+                },
+                'taxa_premiacao': float(acertos[min(faixas_premiadas):].sum() / total_jogos),
+            }
+
+        return self.resultados
@@ -0,0 +1,65 @@
+# lotofacil_analyzer/tests/armazem.py
+"""Armazém de sorteios isolado para os testes, a partir de um recorte do CSV real."""
+
+from django.core.cache import cache
+from django.test import override_settings
+from lotofacil_analyzer import cache as cache_lotofacil
+from lotofacil_analyzer.data import store
+from lotofacil_analyzer.data.processor import LotofacilDataImporter
+from pathlib import Path
+from unittest import mock
+import pandas as pd
+import tempfile
+
+# Caminho original: ``isolar_armazem`` substitui CAMINHO_CSV pelo recorte
+_CSV_REAL = cache_lotofacil.CAMINHO_CSV
+_HISTORICO = None
+
+
+def historico():
+    """DataFrame importado do CSV real (lido uma vez por execução dos testes)."""
+    global _HISTORICO
+    if _HISTORICO is None:
+        _HISTORICO = LotofacilDataImporter(file_path=_CSV_REAL).importar_csv()
+    return _HISTORICO.copy()
+
+
+def isolar_armazem(caso, sorteios=100, **configuracoes):
+    """
+    Aponta o armazém, o CSV de origem, o cache e os artefatos das tarefas para um diretório temporário.
+
+    Tudo é desfeito ao fim do teste (``addCleanup``).
+
+    Args:
+        caso (TestCase): Teste em execução
+        sorteios (int): Primeiros sorteios do CSV real copiados para o recorte
+        **configuracoes: Outras configurações sobrepostas durante o teste (têm
+            precedência sobre as padrão do recorte)
+
+    Returns:
+        Path: Diretório temporário (o CSV fica em ``base_dados.csv``)
+    """
+    temporario = tempfile.TemporaryDirectory()
+    caso.addCleanup(temporario.cleanup)
+    diretorio = Path(temporario.name)
+
+    csv = diretorio / 'base_dados.csv'
+    pd.read_csv(_CSV_REAL).head(sorteios).to_csv(csv, index=False)
+    configuracao = override_settings(**{
+        'LOTOFACIL_DIRETORIO_PROCESSADOS': diretorio / 'processed',
+        'LOTOFACIL_DIRETORIO_TAREFAS': diretorio / 'tarefas',
+        'LOTOFACIL_TREINAR_AO_PUBLICAR': False,
+        'LOTOFACIL_ANEXAR_SORTEIOS': False,
+        **configuracoes,
+    })
+    configuracao.enable()
+    caso.addCleanup(configuracao.disable)
+    for alteracao in (
+        mock.patch.object(cache_lotofacil, 'CAMINHO_CSV', csv),
+        mock.patch.dict(store._ARMAZENS, clear=True),
+    ):
+        alteracao.start()
+        caso.addCleanup(alteracao.stop)
+    cache.clear()
+    caso.addCleanup(cache.clear)
+    return diretorio
@@ -0,0 +1,89 @@
+# lotofacil_analyzer/tests/test_aleatoriedade.py
+from django.test import SimpleTestCase
+from lotofacil_analyzer.analyzers.randomness import (
+    TESTES, AnalisadorAleatoriedade, SomasAcumuladas, testar_janelas,
+)
+from lotofacil_analyzer.data.bitmask import matriz_incidencia, sortear_mascaras
+from lotofacil_analyzer.tests.armazem import historico
+from scipy import stats
+import numpy as np
+import pandas as pd
+
+
+def df_de_mascaras(mascaras):
+    bolas = np.nonzero(matriz_incidencia(mascaras))[1].reshape(len(mascaras), 15) + 1
+    df = pd.DataFrame(bolas, columns=[f'Bola{i}' for i in range(1, 16)])
+    df.insert(0, 'Concurso', np.arange(1, len(mascaras) + 1))
+    return df
+
+
+class JanelasTests(SimpleTestCase):
+    """Testes em janelas deslizantes a partir das somas acumuladas"""
+
+    def setUp(self):
+        self.mascaras = sortear_mascaras(np.random.default_rng(3), 400)
+        self.presente = matriz_incidencia(self.mascaras).astype(np.int64)
+
+    def test_igual_ao_calculo_direto(self):
+        tamanho, passo = 60, 7
+        teste = testar_janelas(SomasAcumuladas(self.mascaras), tamanho, passo)
+        self.assertEqual(teste['fins'][-1], len(self.mascaras))
+        self.assertTrue((np.diff(teste['fins']) == passo).all())
+
+        comuns = stats.hypergeom(25, 15, 15)
+        for janela in range(0, len(teste['fins']), 5):
+            fim = teste['fins'][janela]
+            trecho = self.presente[fim - tamanho:fim]
+            contagem = trecho.sum(axis=0)
+            z = (contagem - tamanho * 0.6) / np.sqrt(tamanho * 0.6 * 0.4)
+            np.testing.assert_allclose(
+                teste['por_numero']['qui_quadrado'][janela], 2 * stats.norm.sf(np.abs(z)),
+            )
+
+            # Wald-Wolfowitz de cada número, contando as sequências diretamente
+            sequencias = (trecho[1:] != trecho[:-1]).sum(axis=0) + 1
+            uns, zeros = contagem, tamanho - contagem
+            media = 2 * uns * zeros / tamanho + 1
+            variancia = (media - 1) * (media - 2) / (tamanho - 1)
+            np.testing.assert_allclose(
+                teste['por_numero']['sequencias'][janela],
+                2 * stats.norm.sf(np.abs(sequencias - media) / np.sqrt(variancia)),
+            )
+
+            # Números em comum entre sorteios seguidos contra a hipergeométrica
+            seguidos = np.bitwise_count(
+                self.mascaras[fim - tamanho + 1:fim] & self.mascaras[fim - tamanho:fim - 1]
+            ).sum()
+            z = (seguidos - comuns.mean() * (tamanho - 1)) / np.sqrt(comuns.var() * (tamanho - 1))
+            self.assertAlmostEqual(teste['geral']['correlacao_serial'][janela], 2 * stats.norm.sf(abs(z)))
+
+    def test_sorteios_aleatorios_rejeitados_perto_de_alfa(self):
+        resultados = AnalisadorAleatoriedade(df=df_de_mascaras(self.mascaras)).analisar(janelas=[50], passo=50)
+        for nome in TESTES:
+            with self.subTest(teste=nome):
+                self.assertLessEqual(resultados['janelas'][50]['rejeicoes'][nome], 0.3)
+
+    def test_sorteio_repetido_rejeitado(self):
+        repetido = np.repeat(self.mascaras[:1], 100)
+        teste = testar_janelas(SomasAcumuladas(repetido), 50)
+        self.assertTrue((teste['geral']['qui_quadrado'] < 1e-6).all())
+        self.assertTrue((teste['geral']['correlacao_serial'] < 1e-6).all())
+
+
+class AnalisadorAleatoriedadeTests(SimpleTestCase):
+    """Parâmetros e formato do resultado"""
+
+    def test_janelas(self):
+        df = historico().head(300)
+        resultados = AnalisadorAleatoriedade(df=df).analisar(janelas=[5, 100, 1000], passo=10)
+        self.assertEqual(resultados['janelas_ignoradas'], [5, 1000])
+        janela = resultados['janelas'][100]
+        self.assertEqual(janela['concursos'][-1], df['Concurso'].iloc[-1])
+        self.assertEqual(len(janela['geral']['qui_quadrado']), len(janela['concursos']))
+        self.assertEqual(set(janela['por_numero']), set(range(1, 26)))
+
+    def test_parametros_invalidos(self):
+        analisador = AnalisadorAleatoriedade(df=historico().head(50))
+        self.assertIn('erro', analisador.analisar(passo=0))
+        self.assertIn('erro', analisador.analisar(alfa=100))
+        self.assertIn('erro', analisador.analisar(janelas=[500]))
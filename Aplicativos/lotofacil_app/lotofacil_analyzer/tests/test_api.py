@@ -0,0 +1,70 @@
+# lotofacil_analyzer/tests/test_api.py
+from django.test import TestCase
+from lotofacil_analyzer import cache as cache_lotofacil
+from lotofacil_analyzer.tests.armazem import isolar_armazem
+
+SORTEIOS = 100
+
+
+class ApiEstatisticasTests(TestCase):
+    """Validação de parâmetros e requisições condicionais de /api/estatisticas/"""
+
+    def setUp(self):
+        isolar_armazem(self, SORTEIOS)
+
+    def url(self, analisador='frequencia'):
+        return f'/api/estatisticas/{analisador}/'
+
+    def preparar(self, analisador, parametros):
+        # Resposta calculada neste processo: a view a encontra em cache sem usar o pool
+        cache_lotofacil.resposta_api(analisador, parametros)
+
+    def test_resposta_e_304(self):
+        self.preparar('frequencia', {})
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        condicional = self.client.get(self.url(), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(condicional.status_code, 304)
+        self.assertEqual(condicional.content, b'')
+        self.assertEqual(condicional['ETag'], response['ETag'])
+
+    def test_etag_por_codificacao(self):
+        self.preparar('frequencia', {})
+        identidade = self.client.get(self.url())
+        gzip = self.client.get(self.url(), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzip['Content-Encoding'], 'gzip')
+        self.assertNotEqual(identidade['ETag'], gzip['ETag'])
+
+        # A ETag da outra codificação não vale: a resposta é completa
+        cruzada = self.client.get(
+            self.url(), HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=identidade['ETag'],
+        )
+        self.assertEqual(cruzada.status_code, 200)
+        self.assertEqual(cruzada['ETag'], gzip['ETag'])
+
+    def test_etag_por_parametros(self):
+        self.preparar('similaridade', {'pares': 5})
+        self.preparar('similaridade', {'pares': 6})
+        cinco = self.client.get(self.url('similaridade'), {'pares': 5})
+        seis = self.client.get(self.url('similaridade'), {'pares': 6}, HTTP_IF_NONE_MATCH=cinco['ETag'])
+        self.assertEqual(seis.status_code, 200)
+        self.assertNotEqual(cinco['ETag'], seis['ETag'])
+
+    def test_parametros_invalidos(self):
+        for analisador, parametros in (
+            ('similaridade', {'pares': '-1'}),
+            ('similaridade', {'pares': 'muitos'}),
+            ('combinacoes', {'tamanhos_combinacoes': '9'}),
+            ('combinacoes', {'tamanhos_combinacoes': ','.join(map(str, range(1, 13)))}),
+        ):
+            with self.subTest(analisador=analisador, parametros=parametros):
+                response = self.client.get(self.url(analisador), parametros)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('erro', response.json())
+
+    def test_analisador_desconhecido(self):
+        self.assertEqual(self.client.get(self.url('inexistente')).status_code, 404)
@@ -0,0 +1,53 @@
+# lotofacil_analyzer/tests/test_combinatoria.py
+from django.test import SimpleTestCase
+from itertools import combinations
+from lotofacil_analyzer.data import combinatoria
+from lotofacil_analyzer.data.jogos import JOGOS
+from math import comb
+import numpy as np
+
+
+class CombinatoriaTests(SimpleTestCase):
+    """Rank e unrank lexicográfico de apostas, por números e por máscaras"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(2024)
+
+    def test_extremos_da_lotofacil(self):
+        self.assertEqual(combinatoria.indice_da_aposta(range(1, 16)), 0)
+        self.assertEqual(combinatoria.indice_da_aposta(range(11, 26)), combinatoria.TOTAL_APOSTAS - 1)
+        self.assertEqual(combinatoria.aposta_do_indice(0), list(range(1, 16)))
+        self.assertEqual(combinatoria.aposta_do_indice(combinatoria.TOTAL_APOSTAS - 1), list(range(11, 26)))
+
+    def test_ida_e_volta(self):
+        for jogo in JOGOS.values():
+            k, n = jogo.numeros_por_sorteio, jogo.total_numeros
+            with self.subTest(jogo=jogo.chave):
+                total = combinatoria.total_apostas(k, n)
+                self.assertEqual(total, comb(n, k))
+                indices = np.concatenate([[0, 1, total - 2, total - 1], self.rng.integers(0, total, 500)])
+
+                apostas = combinatoria.apostas_de_indices(indices, k, n)
+                self.assertTrue((np.diff(apostas, axis=1) > 0).all())
+                np.testing.assert_array_equal(combinatoria.indices_de_apostas(apostas, n), indices)
+
+                mascaras = combinatoria.mascaras_de_indices(indices, k, n)
+                np.testing.assert_array_equal(mascaras, jogo.mascaras_de_matriz(apostas))
+                np.testing.assert_array_equal(combinatoria.indices_de_mascaras(mascaras, k, n), indices)
+
+    def test_ordem_lexicografica(self):
+        # Universo pequeno: os índices seguem a ordem de enumeração das apostas
+        apostas = np.array(list(combinations(range(1, 8), 3)))
+        np.testing.assert_array_equal(combinatoria.indices_de_apostas(apostas, 7), np.arange(len(apostas)))
+
+    def test_entradas_invalidas(self):
+        with self.assertRaises(ValueError):
+            combinatoria.indices_de_apostas([[1, 1, 2]], 25)
+        with self.assertRaises(ValueError):
+            combinatoria.indices_de_apostas([[0, 1, 2]], 25)
+        with self.assertRaises(ValueError):
+            combinatoria.apostas_de_indices([combinatoria.TOTAL_APOSTAS])
+        with self.assertRaises(ValueError):
+            combinatoria.indices_de_mascaras(np.array([0b111], dtype=np.uint32))
+        with self.assertRaises(ValueError):
+            combinatoria.total_apostas(40, 80)
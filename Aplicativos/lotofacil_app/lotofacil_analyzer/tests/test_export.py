@@ -0,0 +1,112 @@
+# lotofacil_analyzer/tests/test_export.py
+from concurrent.futures import Future
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from lotofacil_analyzer import cache as cache_lotofacil
+from lotofacil_analyzer.models import ApostaGerada
+from lotofacil_analyzer.tests.armazem import isolar_armazem
+from math import comb
+from unittest import mock
+import csv
+import gzip
+import io
+import json
+
+SORTEIOS = 100
+
+
+def conteudo(response):
+    return b''.join(response.streaming_content)
+
+
+class ExportacaoEstatisticasTests(TestCase):
+    """Download em streaming das tabelas de análise, com e sem gzip"""
+
+    def setUp(self):
+        isolar_armazem(self, SORTEIOS)
+
+    def exportar(self, tabela, **parametros):
+        return self.client.get(reverse('exportar_estatisticas', args=[tabela]), parametros)
+
+    def calcular(self):
+        # Estatísticas calculadas neste processo, sem usar o pool
+        with self.assertLogs('lotofacil_analyzer.cache', 'INFO'):
+            return cache_lotofacil.computar_estatisticas(1)
+
+    def preparar(self):
+        geracao = cache_lotofacil.geracao_atual()
+        cache.set(cache_lotofacil.chave_estatisticas(geracao), self.calcular())
+
+    def test_gzip_ida_e_volta(self):
+        self.preparar()
+        for formato in ('csv', 'jsonl'):
+            with self.subTest(formato=formato):
+                simples = self.exportar('frequencia', formato=formato)
+                comprimido = self.exportar('frequencia', formato=formato, gzip='1')
+                self.assertEqual(comprimido['Content-Type'], 'application/gzip')
+                self.assertTrue(comprimido['Content-Disposition'].endswith(f'.{formato}.gz"'))
+                self.assertEqual(gzip.decompress(conteudo(comprimido)), conteudo(simples))
+
+    def test_frequencia_csv(self):
+        self.preparar()
+        response = self.exportar('frequencia')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        linhas = list(csv.DictReader(io.StringIO(conteudo(response).decode('utf-8'))))
+        self.assertEqual([int(linha['numero']) for linha in linhas], list(range(1, 26)))
+        self.assertEqual(sum(int(linha['frequencia']) for linha in linhas), SORTEIOS * 15)
+
+    def test_combinacoes_jsonl(self):
+        response = self.exportar('combinacoes', formato='jsonl', tamanho=3)
+        registros = [json.loads(linha) for linha in conteudo(response).decode('utf-8').splitlines()]
+        self.assertEqual(len(registros), comb(25, 3))
+        self.assertEqual(set(registros[0]), {'numero1', 'numero2', 'numero3', 'frequencia'})
+        self.assertEqual(sum(r['frequencia'] for r in registros), SORTEIOS * comb(15, 3))
+
+    def test_parametros_invalidos(self):
+        self.assertEqual(self.exportar('inexistente').status_code, 404)
+        self.assertEqual(self.exportar('combinacoes', tamanho=9).status_code, 400)
+        self.assertEqual(self.exportar('combinacoes', formato='xml').status_code, 400)
+
+    def test_sem_estatisticas_em_cache(self):
+        with mock.patch('lotofacil_analyzer.views.agendar_estatisticas') as agendar:
+            response = self.exportar('atraso')
+            self.assertEqual(response.status_code, 503)
+            self.assertIn('Retry-After', response)
+            agendar.assert_called_once_with()
+
+            # Durante o aquecimento o cálculo já está em andamento
+            with mock.patch('lotofacil_analyzer.views.aquecimento_em_andamento', return_value=True):
+                self.assertEqual(self.exportar('atraso').status_code, 503)
+            agendar.assert_called_once_with()
+
+    def test_agendar_grava_no_cache(self):
+        futuro = Future()
+        with mock.patch.object(cache_lotofacil, 'submeter_coalescido', return_value=futuro):
+            self.assertIs(cache_lotofacil.agendar_estatisticas(), futuro)
+        self.assertIsNone(cache_lotofacil.estatisticas_em_cache())
+
+        futuro.set_result((self.calcular(), []))
+        self.assertIsNotNone(cache_lotofacil.estatisticas_em_cache())
+        self.assertEqual(self.exportar('atraso').status_code, 200)
+
+
+class ExportacaoApostasTests(TestCase):
+    """Download das apostas do usuário"""
+
+    def setUp(self):
+        self.ana = User.objects.create_user('ana')
+        self.bia = User.objects.create_user('bia')
+        for usuario, numeros in ((self.ana, range(1, 16)), (self.ana, range(11, 26)), (self.bia, range(1, 16))):
+            ApostaGerada.objects.create(
+                usuario=usuario, numeros=','.join(map(str, numeros)), metodo_geracao='aleatorio',
+            )
+
+    def test_apostas_do_usuario(self):
+        self.client.force_login(self.ana)
+        response = self.client.get(reverse('exportar_apostas'), {'formato': 'jsonl', 'gzip': '1'})
+        registros = [json.loads(linha) for linha in gzip.decompress(conteudo(response)).splitlines()]
+        # Mais recentes primeiro; o índice é a posição lexicográfica entre todas as apostas
+        self.assertEqual([r['indice'] for r in registros], [comb(25, 15) - 1, 0])
+        self.assertEqual([registros[1][f'Bola{i}'] for i in range(1, 16)], list(range(1, 16)))
@@ -0,0 +1,81 @@
+# lotofacil_analyzer/tests/test_geografia.py
+from django.test import TestCase
+from lotofacil_analyzer.analyzers.geography import AnalisadorGeografico
+from lotofacil_analyzer.cache import geracao_atual
+from lotofacil_analyzer.data.store import obter_armazem
+from lotofacil_analyzer.tests.armazem import historico, isolar_armazem
+import numpy as np
+import pandas as pd
+
+# (concurso, locais, ganhadores, rateio)
+SORTEIOS = [
+    (1, 'BA; PR; SP', 6, 'R$100,00'),
+    (2, 'São Paulo/SP; CANAL ELETRONICO', 2, 'R$50,00'),
+    (3, np.nan, 0, 'R$0,00'),
+    (4, 'SAO PAULO/SP', 3, 'R$10,00'),
+    (5, np.nan, 1, 'R$1.000,00'),
+]
+
+
+def df_sorteios():
+    df = pd.DataFrame(SORTEIOS, columns=['Concurso', 'Cidade / UF', 'Ganhadores 15 acertos', 'Rateio 15 acertos'])
+    for i in range(1, 16):
+        df[f'Bola{i}'] = i
+    return df
+
+
+class GeografiaTests(TestCase):
+    """Ganhadores por UF e cidade em faixas de concursos"""
+
+    def por_chave(self, itens, chave):
+        return {item[chave]: item for item in itens}
+
+    def test_rateio_entre_locais(self):
+        resultados = AnalisadorGeografico(df=df_sorteios()).analisar()
+        self.assertEqual(resultados['periodo'], {
+            'concurso_inicial': 1, 'concurso_final': 5, 'sorteios': 5,
+            'ganhadores': 12, 'premio_total': 1730.0, 'ganhadores_sem_local': 1,
+        })
+
+        # Os 6 ganhadores do concurso 1 são repartidos entre as 3 UFs listadas
+        ufs = self.por_chave(resultados['ufs'], 'uf')
+        self.assertEqual(
+            (ufs['SP']['premiacoes'], ufs['SP']['ganhadores_estimados'], ufs['SP']['premio_estimado']),
+            (3, 6.0, 280.0),
+        )
+        self.assertEqual(ufs['BA']['ganhadores_estimados'], 2.0)
+        self.assertEqual(resultados['ufs'][0]['uf'], 'SP')
+
+        # Nomes com e sem acento são a mesma cidade
+        cidades = self.por_chave(resultados['cidades'], 'cidade')
+        self.assertEqual(set(cidades), {'SAO PAULO/SP', 'CANAL ELETRONICO'})
+        self.assertEqual(
+            (cidades['SAO PAULO/SP']['premiacoes'], cidades['SAO PAULO/SP']['ganhadores_estimados']),
+            (2, 4.0),
+        )
+
+    def test_faixa_de_concursos(self):
+        resultados = AnalisadorGeografico(df=df_sorteios()).analisar(concurso_inicial=2, concurso_final=4)
+        self.assertEqual(resultados['periodo']['sorteios'], 3)
+        self.assertEqual(resultados['periodo']['ganhadores'], 5)
+        ufs = self.por_chave(resultados['ufs'], 'uf')
+        self.assertNotIn('BA', ufs)
+        self.assertEqual(ufs['SP']['ganhadores_estimados'], 4.0)
+
+        vazia = AnalisadorGeografico(df=df_sorteios()).analisar(concurso_inicial=10)
+        self.assertEqual((vazia['periodo']['sorteios'], vazia['ufs']), (0, []))
+
+    def test_armazem_igual_ao_csv(self):
+        # Sem a coluna de locais, o analisador lê a tabela codificada publicada no armazém
+        isolar_armazem(self, 400)
+        geracao_atual()
+        do_armazem = AnalisadorGeografico(df=obter_armazem().dataframe()).analisar(100, 300, limite=0)
+        do_csv = AnalisadorGeografico(df=historico().head(400)).analisar(100, 300, limite=0)
+        self.assertEqual(do_armazem['periodo']['sorteios'], 201)
+        self.assertEqual(do_armazem, do_csv)
+
+    def test_sem_locais(self):
+        isolar_armazem(self)
+        geracao_atual()
+        df = df_sorteios().drop(columns=['Cidade / UF'])
+        self.assertIn('erro', AnalisadorGeografico(df=df).analisar())
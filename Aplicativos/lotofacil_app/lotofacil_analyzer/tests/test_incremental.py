@@ -0,0 +1,51 @@
+# lotofacil_analyzer/tests/test_incremental.py
+from django.test import SimpleTestCase
+from lotofacil_analyzer.data.incremental import (
+    atualizar_estado, calcular_estado, estado_vazio, nomes_estado,
+)
+from lotofacil_analyzer.data.jogos import JOGOS
+from lotofacil_analyzer.tests.test_jogos import sortear
+from math import comb
+import numpy as np
+
+
+class EstadoIncrementalTests(SimpleTestCase):
+    """O estado atualizado sorteio a sorteio coincide com o recalculado do zero"""
+
+    def assertEstadosIguais(self, obtido, esperado, jogo):
+        self.assertEqual(set(obtido), set(nomes_estado(jogo)))
+        for nome in nomes_estado(jogo):
+            with self.subTest(array=nome):
+                if nome == 'ewma':
+                    np.testing.assert_allclose(obtido[nome], esperado[nome], rtol=1e-12, atol=1e-15)
+                else:
+                    np.testing.assert_array_equal(obtido[nome], esperado[nome])
+
+    def test_prefixo_mais_restante(self):
+        rng = np.random.default_rng(2024)
+        for jogo in JOGOS.values():
+            bolas = sortear(jogo, 120, rng)
+            completo = calcular_estado(bolas, jogo)
+            for corte in (0, 1, 60, 119, 120):
+                with self.subTest(jogo=jogo.chave, corte=corte):
+                    estado = atualizar_estado(calcular_estado(bolas[:corte], jogo), bolas[corte:], jogo)
+                    self.assertEstadosIguais(estado, completo, jogo)
+
+    def test_historico_vazio(self):
+        for jogo in JOGOS.values():
+            with self.subTest(jogo=jogo.chave):
+                vazio = np.empty((0, jogo.numeros_por_sorteio), dtype=np.int64)
+                self.assertEstadosIguais(calcular_estado(vazio, jogo), estado_vazio(jogo), jogo)
+
+    def test_contagens(self):
+        jogo = JOGOS['lotofacil']
+        bolas = sortear(jogo, 30, np.random.default_rng(7))
+        estado = calcular_estado(bolas, jogo)
+        np.testing.assert_array_equal(
+            estado['frequencias'], np.bincount(bolas.ravel() - 1, minlength=jogo.total_numeros),
+        )
+        # Cada sorteio tem C(15, k) combinações de k números
+        for k in jogo.tamanhos_combinacoes:
+            self.assertEqual(estado[f'combinacoes_{k}'].sum(), 30 * comb(15, k))
+        # Atraso zero para os números do último sorteio
+        np.testing.assert_array_equal(estado['atrasos'][bolas[-1] - 1], 0)
@@ -0,0 +1,134 @@
+# lotofacil_analyzer/tests/test_jobs.py
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+from io import StringIO
+from lotofacil_analyzer.jobs import (
+    devolver_a_fila, devolver_abandonadas, enfileirar, executar_tarefa, reservar_proxima,
+)
+from lotofacil_analyzer.models import ApostaGerada, Tarefa
+from lotofacil_analyzer.tests.armazem import isolar_armazem
+from unittest import mock
+import json
+import os
+
+
+def _derrubar_processo(tarefa_id):
+    # Executada no pool do worker no lugar de executar_tarefa: o processo morre
+    # como em um OOM ou segfault
+    os._exit(1)
+
+
+class FilaTarefasTests(TestCase):
+    """Reserva, devolução e recuperação de tarefas abandonadas"""
+
+    def test_cada_tarefa_reservada_uma_vez(self):
+        tarefas = [enfileirar('gerar_apostas', {'quantidade': 1}) for _ in range(5)]
+        reservadas = [reservar_proxima() for _ in range(6)]
+        # As mais antigas primeiro; a sexta chamada encontra a fila vazia
+        self.assertEqual(reservadas, [t.pk for t in tarefas] + [None])
+        self.assertEqual(Tarefa.objects.filter(status='executando').count(), 5)
+
+    def test_reserva_concorrente(self):
+        primeira = enfileirar('gerar_apostas')
+        segunda = enfileirar('gerar_apostas')
+        update = QuerySet.update
+        concorrida = []
+
+        def outro_worker_antes(consulta, **campos):
+            # Entre a listagem e o UPDATE, outro worker reserva a primeira candidata
+            if not concorrida:
+                concorrida.append(update(Tarefa.objects.filter(pk=primeira.pk), status='executando'))
+            return update(consulta, **campos)
+
+        with mock.patch.object(QuerySet, 'update', outro_worker_antes):
+            self.assertEqual(reservar_proxima(), segunda.pk)
+        self.assertIsNone(reservar_proxima())
+
+    def test_devolver_a_fila(self):
+        pendente = enfileirar('gerar_apostas')
+        executando = enfileirar('gerar_apostas')
+        concluida = enfileirar('gerar_apostas')
+        Tarefa.objects.filter(pk=executando.pk).update(
+            status='executando', progresso=0.5, iniciada_em=timezone.now(),
+        )
+        Tarefa.objects.filter(pk=concluida.pk).update(status='concluida')
+
+        self.assertEqual(devolver_a_fila([pendente.pk, executando.pk, concluida.pk]), 1)
+        executando.refresh_from_db()
+        self.assertEqual((executando.status, executando.progresso, executando.iniciada_em), ('pendente', 0, None))
+        self.assertEqual(Tarefa.objects.get(pk=concluida.pk).status, 'concluida')
+
+    def test_devolver_abandonadas(self):
+        antiga, recente, propria = (enfileirar('gerar_apostas') for _ in range(3))
+        for tarefa, idade in ((antiga, 7200), (recente, 10), (propria, 7200)):
+            Tarefa.objects.filter(pk=tarefa.pk).update(
+                status='executando', iniciada_em=timezone.now() - timedelta(seconds=idade),
+            )
+
+        self.assertEqual(devolver_abandonadas(tempo_maximo=3600, exceto=[propria.pk]), 1)
+        status = dict(Tarefa.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            [status[antiga.pk], status[recente.pk], status[propria.pk]],
+            ['pendente', 'executando', 'executando'],
+        )
+
+
+class ExecutarTarefaTests(TestCase):
+    """Execução de uma tarefa reservada sobre um armazém isolado"""
+
+    def setUp(self):
+        isolar_armazem(self, LOTOFACIL_APOSTAS_UNICAS=None)
+        self.usuario = User.objects.create_user('ana')
+
+    def executar(self, parametros, usuario=None):
+        tarefa = enfileirar('gerar_apostas', parametros, usuario=usuario)
+        self.assertEqual(reservar_proxima(), tarefa.pk)
+        executar_tarefa(tarefa.pk)
+        tarefa.refresh_from_db()
+        return tarefa
+
+    def test_conclusao(self):
+        tarefa = self.executar({'metodo': 'aleatorio', 'quantidade': 7, 'salvar': True}, self.usuario)
+        self.assertEqual(tarefa.status, 'concluida')
+        self.assertEqual(tarefa.progresso, 1.0)
+        self.assertEqual(tarefa.resumo['quantidade'], 7)
+        with open(tarefa.arquivo_resultado, encoding='utf-8') as arquivo:
+            artefato = json.load(arquivo)
+        self.assertEqual(artefato['tarefa'], tarefa.pk)
+        self.assertEqual(len(artefato['apostas']), 7)
+        self.assertEqual(ApostaGerada.objects.filter(usuario=self.usuario).count(), 7)
+
+    def test_semente_reprodutivel(self):
+        apostas = []
+        for _ in range(2):
+            tarefa = self.executar({'metodo': 'frequencia', 'quantidade': 5, 'semente': 42})
+            with open(tarefa.arquivo_resultado, encoding='utf-8') as arquivo:
+                apostas.append(json.load(arquivo)['apostas'])
+        self.assertEqual(apostas[0], apostas[1])
+
+    def test_falha_registrada(self):
+        with self.assertLogs('lotofacil_analyzer.jobs', 'ERROR'):
+            tarefa = self.executar({'metodo': 'inexistente'})
+        self.assertEqual(tarefa.status, 'falhou')
+        self.assertIn("Método de geração desconhecido", tarefa.erro)
+        self.assertIsNotNone(tarefa.concluida_em)
+
+
+class WorkerTests(TestCase):
+    """Recuperação do comando worker quando um processo do pool morre"""
+
+    def test_queda_do_pool(self):
+        tarefa = enfileirar('gerar_apostas')
+        saida = StringIO()
+        with mock.patch('lotofacil_analyzer.management.commands.worker.executar_tarefa', _derrubar_processo):
+            call_command('worker', processos=1, intervalo=0.05, uma_vez=True, stdout=saida)
+
+        # A primeira queda devolve a tarefa à fila; a segunda a dá como falha
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, 'falhou')
+        self.assertIn("encerrado abruptamente", tarefa.erro)
+        self.assertEqual(saida.getvalue().count("Pool de processos reiniciado"), 2)
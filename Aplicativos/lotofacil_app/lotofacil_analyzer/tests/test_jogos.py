@@ -0,0 +1,67 @@
+# lotofacil_analyzer/tests/test_jogos.py
+from django.test import SimpleTestCase
+from lotofacil_analyzer.data.jogos import JOGOS
+import numpy as np
+
+
+def sortear(jogo, quantidade, rng):
+    """Matriz (quantidade, K) de sorteios aleatórios do jogo."""
+    chaves = rng.random((quantidade, jogo.total_numeros))
+    return np.argsort(chaves, axis=1)[:, :jogo.numeros_por_sorteio] + 1
+
+
+class JogoTests(SimpleTestCase):
+    """Máscaras, incidência e acertos em universos de uma e de várias palavras"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(2024)
+
+    def test_formato_das_mascaras(self):
+        esperados = {'lotofacil': (np.uint32, ()), 'mega_sena': (np.uint64, ()), 'quina': (np.uint64, (2,))}
+        for chave, (dtype, palavras) in esperados.items():
+            with self.subTest(jogo=chave):
+                mascaras = JOGOS[chave].mascaras_de_matriz(sortear(JOGOS[chave], 7, self.rng))
+                self.assertEqual(mascaras.dtype, dtype)
+                self.assertEqual(mascaras.shape, (7,) + palavras)
+
+    def test_mascara_ida_e_volta(self):
+        for jogo in JOGOS.values():
+            with self.subTest(jogo=jogo.chave):
+                bolas = sortear(jogo, 50, self.rng)
+                # Inclui os extremos do universo (bits 0 e N - 1)
+                bolas[0, :2] = [1, jogo.total_numeros]
+                bolas[0, 2:] = np.arange(2, jogo.numeros_por_sorteio) + 1
+                mascaras = jogo.mascaras_de_matriz(bolas)
+                for linha, mascara in zip(bolas, mascaras):
+                    self.assertEqual(jogo.numeros_da_mascara(mascara), sorted(linha.tolist()))
+                textos = [','.join(map(str, linha)) for linha in bolas]
+                np.testing.assert_array_equal(jogo.mascaras_de_textos(textos), mascaras)
+
+    def test_incidencia_e_contagem(self):
+        for jogo in JOGOS.values():
+            with self.subTest(jogo=jogo.chave):
+                bolas = sortear(jogo, 50, self.rng)
+                esperada = np.zeros((len(bolas), jogo.total_numeros), dtype=bool)
+                np.put_along_axis(esperada, bolas - 1, True, axis=1)
+                mascaras = jogo.mascaras_de_matriz(bolas)
+                np.testing.assert_array_equal(jogo.matriz_incidencia(mascaras), esperada)
+                np.testing.assert_array_equal(jogo.contar_numeros(mascaras), jogo.numeros_por_sorteio)
+
+    def test_acertos(self):
+        for jogo in JOGOS.values():
+            with self.subTest(jogo=jogo.chave):
+                apostas = sortear(jogo, 20, self.rng)
+                sorteios = sortear(jogo, 30, self.rng)
+                esperados = np.array([
+                    [len(set(aposta) & set(sorteio)) for sorteio in sorteios.tolist()]
+                    for aposta in apostas.tolist()
+                ])
+                acertos = jogo.acertos(jogo.mascaras_de_matriz(apostas), jogo.mascaras_de_matriz(sorteios))
+                self.assertEqual(acertos.dtype, np.uint8)
+                np.testing.assert_array_equal(acertos, esperados)
+
+    def test_sortear_mascaras(self):
+        for jogo in JOGOS.values():
+            with self.subTest(jogo=jogo.chave):
+                mascaras = jogo.sortear_mascaras(self.rng, 100)
+                np.testing.assert_array_equal(jogo.contar_numeros(mascaras), jogo.numeros_por_sorteio)
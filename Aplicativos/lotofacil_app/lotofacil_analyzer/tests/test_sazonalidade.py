@@ -0,0 +1,44 @@
+# lotofacil_analyzer/tests/test_sazonalidade.py
+from django.test import SimpleTestCase
+from lotofacil_analyzer.analyzers.seasonality import AGRUPAMENTOS, AnalisadorSazonalidade, IndiceTemporal
+from lotofacil_analyzer.tests.armazem import historico
+from unittest import mock
+import datetime
+
+
+class SazonalidadeTests(SimpleTestCase):
+    """Agrupamentos por período sobre o índice temporal"""
+
+    def setUp(self):
+        self.df = historico().head(600)
+        self.analisador = AnalisadorSazonalidade(df=self.df)
+
+    def test_indice_obtido_uma_vez(self):
+        with mock.patch.object(IndiceTemporal, 'obter', wraps=IndiceTemporal.obter) as obter:
+            self.analisador.analisar()
+            self.analisador.agrupar('ano')
+            self.assertEqual(obter.call_count, 1)
+
+            # Um novo DataFrame invalida o índice da instância
+            self.analisador.df = self.df.head(300)
+            self.assertEqual(sum(g['sorteios'] for g in self.analisador.agrupar('ano')), 300)
+            self.assertEqual(obter.call_count, 2)
+
+    def test_grupos_iguais_a_contagem_direta(self):
+        inicio, fim = datetime.date(2005, 3, 1), datetime.date(2008, 7, 31)
+        resultados = self.analisador.analisar(inicio, fim)
+        periodo = self.df[self.df['data'].dt.date.between(inicio, fim)]
+        self.assertEqual(resultados['periodo']['sorteios'], len(periodo))
+        for agrupamento in AGRUPAMENTOS:
+            with self.subTest(agrupamento=agrupamento):
+                self.assertEqual(sum(g['sorteios'] for g in resultados[agrupamento]), len(periodo))
+
+        bolas = self.analisador.jogo.colunas_bolas
+        for grupo in resultados['ano']:
+            do_ano = periodo[periodo['data'].dt.year == grupo['grupo']]
+            contagem = do_ano[bolas].stack().value_counts()
+            self.assertEqual(grupo['sorteios'], len(do_ano))
+            self.assertEqual(grupo['frequencia'], {n: int(contagem.get(n, 0)) for n in range(1, 26)})
+
+    def test_periodo_invalido(self):
+        self.assertIn('erro', self.analisador.analisar(inicio='31/02/2020'))
@@ -0,0 +1,67 @@
+# lotofacil_analyzer/tests/test_similaridade.py
+from django.test import SimpleTestCase
+from lotofacil_analyzer.analyzers.similarity import (
+    AnalisadorSimilaridade, calcular_sobreposicoes, distribuicao_esperada,
+)
+from lotofacil_analyzer.data.bitmask import mascaras_de_matriz
+from lotofacil_analyzer.tests.armazem import historico
+import numpy as np
+
+
+def forca_bruta(mascaras, maiores):
+    """Matriz completa de sobreposições, para conferir o cálculo em blocos."""
+    matriz = np.bitwise_count(mascaras[:, np.newaxis] & mascaras[np.newaxis, :]).astype(np.int64)
+    np.fill_diagonal(matriz, -1)
+    i, j = np.triu_indices(len(mascaras), k=1)
+    sobreposicao = matriz[i, j]
+    ordem = np.lexsort((j, i, -sobreposicao))[:maiores]
+    return {
+        'histograma': np.bincount(sobreposicao, minlength=16),
+        'soma': matriz.sum(axis=1) + 1,
+        'maxima': matriz.max(axis=1),
+        'mais_similar': matriz.argmax(axis=1),
+        'pares': (sobreposicao[ordem], i[ordem], j[ordem]),
+    }
+
+
+class SobreposicoesTests(SimpleTestCase):
+    """Cálculo em blocos das sobreposições entre todos os pares de sorteios"""
+
+    def sorteios(self, total, semente=7):
+        rng = np.random.default_rng(semente)
+        bolas = np.sort(np.array([rng.choice(25, 15, replace=False) + 1 for _ in range(total)]), axis=1)
+        # Sorteios repetidos forçam empates na sobreposição máxima
+        bolas[total // 2] = bolas[3]
+        bolas[-1] = bolas[3]
+        return mascaras_de_matriz(bolas)
+
+    def test_igual_a_forca_bruta(self):
+        mascaras = self.sorteios(301)
+        esperado = forca_bruta(mascaras, 40)
+        # Blocos que não dividem o total, um só bloco e blocos pequenos
+        for bloco in (64, 1000, 7):
+            with self.subTest(bloco=bloco):
+                calculo = calcular_sobreposicoes(mascaras, bloco=bloco, maiores=40)
+                for chave in ('histograma', 'soma', 'maxima', 'mais_similar'):
+                    np.testing.assert_array_equal(calculo[chave], esperado[chave], err_msg=chave)
+                for obtido, referencia in zip(calculo['pares'], esperado['pares']):
+                    np.testing.assert_array_equal(obtido, referencia)
+
+    def test_analisar(self):
+        df = historico().head(500)
+        resultados = AnalisadorSimilaridade(df=df).analisar(pares=5)
+        self.assertEqual(resultados['pares'], 500 * 499 // 2)
+        self.assertEqual(sum(resultados['histograma'].values()), resultados['pares'])
+        self.assertEqual(len(resultados['mais_parecidos']), 5)
+        np.testing.assert_allclose(sum(resultados['esperado'].values()), 100)
+        self.assertAlmostEqual(resultados['media'], resultados['media_esperada'], delta=0.2)
+
+    def test_distribuicao_esperada(self):
+        esperado = distribuicao_esperada()
+        self.assertAlmostEqual(esperado.sum(), 1.0)
+        # Dois sorteios de 15 entre 25 números têm pelo menos 5 em comum
+        self.assertTrue((esperado[:5] == 0).all())
+        self.assertAlmostEqual((esperado * np.arange(16)).sum(), 9.0)
+
+    def test_um_sorteio(self):
+        self.assertIn('erro', AnalisadorSimilaridade(df=historico().head(1)).analisar())
@@ -0,0 +1,185 @@
+# lotofacil_analyzer/tests/test_store.py
+from django.test import TestCase, override_settings
+from lotofacil_analyzer.cache import CAMINHO_CSV
+from lotofacil_analyzer.data.incremental import nomes_estado
+from lotofacil_analyzer.data.store import (
+    GERACOES_MANTIDAS, PREFIXO_GERACAO, ArmazemSorteios, geracao_publicada, obter_armazem,
+)
+from lotofacil_analyzer.models import SorteioLotofacil
+from lotofacil_analyzer.signals import ingerir_sorteios
+from lotofacil_analyzer.tests.armazem import historico, isolar_armazem
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import tempfile
+
+@override_settings(LOTOFACIL_TREINAR_AO_PUBLICAR=False, LOTOFACIL_ANEXAR_SORTEIOS=False)
+class ArmazemTestCase(TestCase):
+
+    def setUp(self):
+        temporario = tempfile.TemporaryDirectory()
+        self.addCleanup(temporario.cleanup)
+        self.diretorio = Path(temporario.name)
+        self.armazem = ArmazemSorteios(diretorio=self.diretorio)
+
+
+class GeracoesTests(ArmazemTestCase):
+    """Publicação de gerações e leitura mapeada em memória por outros processos"""
+
+    def test_publicar_e_ler_de_outro_armazem(self):
+        df = historico().head(200)
+        self.assertEqual(self.armazem.publicar(df), 1)
+
+        # Outro worker abre o mesmo diretório
+        leitor = ArmazemSorteios(diretorio=self.diretorio)
+        self.assertTrue(leitor.atualizar())
+        self.assertEqual(leitor.geracao, 1)
+        self.assertEqual(leitor.meta['total_sorteios'], 200)
+        self.assertEqual(leitor.meta['ultimo_concurso'], int(df['Concurso'].max()))
+        self.assertIsInstance(leitor.arrays['bolas'], np.memmap)
+        np.testing.assert_array_equal(leitor.arrays['concursos'], df['Concurso'])
+
+        lido = leitor.dataframe()
+        colunas = ['Concurso'] + leitor.jogo.colunas_bolas
+        np.testing.assert_array_equal(lido[colunas].to_numpy(), df[colunas].to_numpy())
+        np.testing.assert_array_equal(lido['data'].to_numpy(), df['data'].to_numpy(dtype='datetime64[D]'))
+
+        # Uma nova publicação é vista na próxima consulta do leitor
+        self.armazem.publicar(historico().head(250))
+        self.assertTrue(leitor.atualizar())
+        self.assertEqual((leitor.geracao, leitor.meta['total_sorteios']), (2, 250))
+
+    def test_geracoes_antigas_removidas(self):
+        df = historico().head(50)
+        for _ in range(GERACOES_MANTIDAS + 2):
+            geracao = self.armazem.publicar(df)
+        restantes = sorted(p.name for p in self.diretorio.glob(f'{PREFIXO_GERACAO}*'))
+        self.assertEqual(restantes, [
+            f'{PREFIXO_GERACAO}{n:06d}' for n in range(geracao - GERACOES_MANTIDAS + 1, geracao + 1)
+        ])
+
+    def test_sem_geracao(self):
+        self.assertFalse(self.armazem.disponivel())
+        with self.assertRaises(FileNotFoundError):
+            self.armazem.dataframe()
+
+    def test_sincronizar(self):
+        csv = self.diretorio / 'base_dados.csv'
+        pd.read_csv(CAMINHO_CSV).head(100).to_csv(csv, index=False)
+        geracao = self.armazem.sincronizar(csv)
+        # CSV inalterado: nada é republicado
+        self.assertEqual(self.armazem.sincronizar(csv), geracao)
+
+        pd.read_csv(CAMINHO_CSV).head(120).to_csv(csv, index=False)
+        self.assertEqual(self.armazem.sincronizar(csv), geracao + 1)
+        self.assertEqual(self.armazem.meta['total_sorteios'], 120)
+
+
+class AnexarTests(ArmazemTestCase):
+    """Sorteios novos anexados com o estado agregado atualizado incrementalmente"""
+
+    def setUp(self):
+        super().setUp()
+        self.df = historico().head(130)
+        self.armazem.publicar(self.df.head(100))
+
+    def anexar(self, inicio, fim, **kwargs):
+        novos = self.df.iloc[inicio:fim]
+        return self.armazem.anexar(
+            novos['Concurso'], novos[self.armazem.jogo.colunas_bolas],
+            datas=novos['data'], **kwargs,
+        )
+
+    def assertIgualAoRecalculo(self, total):
+        completo = ArmazemSorteios(diretorio=self.diretorio / 'completo')
+        completo.publicar(self.df.head(total))
+        # Os locais e o rateio dos sorteios anexados sem ``locais`` ficam desconhecidos
+        for nome in ('concursos', 'bolas', 'mascaras') + nomes_estado(self.armazem.jogo):
+            with self.subTest(array=nome):
+                np.testing.assert_allclose(self.armazem.arrays[nome], completo.arrays[nome])
+
+    def test_estado_igual_ao_recalculo(self):
+        self.assertEqual(self.anexar(100, 130), 2)
+        self.assertEqual(self.armazem.meta['total_sorteios'], 130)
+        self.assertIgualAoRecalculo(130)
+
+    def test_concursos_publicados_ignorados(self):
+        # Sobreposição: só os concursos acima do último publicado entram
+        with self.assertLogs('lotofacil_analyzer.data.store', 'WARNING'):
+            self.assertEqual(self.anexar(90, 110), 2)
+        self.assertEqual(self.armazem.meta['total_sorteios'], 110)
+        self.assertEqual(len(np.unique(self.armazem.arrays['concursos'])), 110)
+        self.assertIgualAoRecalculo(110)
+
+        # Nada novo: nenhuma geração é publicada
+        self.assertIsNone(self.anexar(50, 110))
+        self.assertEqual(self.armazem.geracao, 2)
+
+    def test_sem_geracao(self):
+        vazio = ArmazemSorteios(diretorio=self.diretorio / 'vazio')
+        with self.assertRaises(FileNotFoundError):
+            vazio.anexar([1], [list(range(1, 16))])
+
+    def test_republicar_mantem_anexados(self):
+        self.anexar(100, 130)
+        # Um CSV defasado não faz o último concurso retroceder
+        self.armazem.publicar(self.df.head(100))
+        self.assertEqual(self.armazem.meta['ultimo_concurso'], int(self.df['Concurso'].iloc[129]))
+        self.assertIgualAoRecalculo(130)
+
+    def test_sinal_da_geracao(self):
+        recebidos = []
+
+        def receptor(sender, armazem, geracao, **kwargs):
+            recebidos.append((armazem, geracao))
+
+        geracao_publicada.connect(receptor)
+        self.addCleanup(geracao_publicada.disconnect, receptor)
+        self.anexar(100, 101)
+        self.assertIsNone(self.anexar(100, 101))
+        self.assertEqual(recebidos, [(self.armazem, 2)])
+
+
+class SorteiosDoBancoTests(TestCase):
+    """Sorteios gravados em ``SorteioLotofacil`` chegam ao armazém"""
+
+    def setUp(self):
+        isolar_armazem(self, sorteios=100, LOTOFACIL_ANEXAR_SORTEIOS=True)
+        self.df = historico().head(103)
+        self.armazem = obter_armazem()
+        self.armazem.publicar(self.df.head(100))
+
+    def criar_sorteio(self, posicao):
+        linha = self.df.iloc[posicao]
+        return SorteioLotofacil.objects.create(
+            concurso=int(linha['Concurso']), data=linha['data'].date(),
+            numeros=','.join(str(int(n)) for n in linha[self.armazem.jogo.colunas_bolas]),
+        )
+
+    def test_sorteio_salvo_anexado_apos_commit(self):
+        with self.assertLogs('lotofacil_analyzer.signals', 'INFO'), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.criar_sorteio(100)
+            # Antes do commit nada é publicado
+            self.assertEqual(self.armazem.meta['total_sorteios'], 100)
+        self.assertEqual(self.armazem.meta['ultimo_concurso'], int(self.df['Concurso'].iloc[100]))
+
+    def test_ingerir_sorteios_repetidos(self):
+        sorteios = [self.criar_sorteio(100), self.criar_sorteio(101)]
+        with self.assertLogs('lotofacil_analyzer.signals', 'INFO'):
+            self.assertEqual(ingerir_sorteios(sorteios), 2)
+        self.assertIsNone(ingerir_sorteios(sorteios))
+        self.assertEqual(self.armazem.meta['total_sorteios'], 102)
+
+    def test_publicar_inclui_sorteios_do_banco(self):
+        # Gravados sem passar pelo on_commit, como se ainda não houvesse geração
+        for posicao in (100, 101, 102):
+            self.criar_sorteio(posicao)
+        self.armazem.publicar(self.df.head(101))
+        self.assertEqual(self.armazem.meta['total_sorteios'], 103)
+        np.testing.assert_array_equal(self.armazem.arrays['concursos'], self.df['Concurso'])
+
+        with override_settings(LOTOFACIL_ANEXAR_SORTEIOS=False):
+            outro = ArmazemSorteios(diretorio=self.armazem.diretorio / 'outro')
+            outro.publicar(self.df.head(101))
+        self.assertEqual(outro.meta['total_sorteios'], 101)
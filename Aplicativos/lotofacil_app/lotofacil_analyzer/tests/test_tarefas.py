@@ -0,0 +1,85 @@
+# lotofacil_analyzer/tests/test_tarefas.py
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from lotofacil_analyzer.jobs import enfileirar
+from lotofacil_analyzer.models import Tarefa
+import json
+
+
+@override_settings(LOTOFACIL_TAREFAS_ABERTAS_POR_CLIENTE=2)
+class EndpointsTarefasTests(TestCase):
+    """Visibilidade das tarefas por dono e limite de tarefas abertas por cliente"""
+
+    def setUp(self):
+        self.ana = User.objects.create_user('ana')
+        self.bia = User.objects.create_user('bia')
+        self.admin = User.objects.create_user('admin', is_staff=True)
+
+    def gerar_anonimo(self, cliente):
+        return cliente.post(reverse('gerar_jogo_rapido'), {'quantidade': 2})
+
+    def status_tarefa(self, cliente, tarefa):
+        return cliente.get(reverse('api_tarefa', args=[tarefa.pk])).status_code
+
+    def test_tarefa_anonima_pertence_a_sessao(self):
+        response = self.gerar_anonimo(self.client)
+        self.assertEqual(response.status_code, 302)
+        tarefa = Tarefa.objects.get()
+        self.assertIsNone(tarefa.usuario)
+        self.assertEqual(tarefa.sessao, self.client.session.session_key)
+        self.assertFalse(tarefa.parametros['salvar'])
+
+        self.assertEqual(self.status_tarefa(self.client, tarefa), 200)
+        self.assertEqual(self.client.get(reverse('tarefa', args=[tarefa.pk])).status_code, 200)
+
+        # Outra sessão não enxerga a tarefa nem o resultado
+        outro = Client()
+        self.assertEqual(self.status_tarefa(outro, tarefa), 404)
+        self.assertEqual(outro.get(reverse('tarefa', args=[tarefa.pk])).status_code, 404)
+        self.assertEqual(outro.get(reverse('api_tarefa_resultado', args=[tarefa.pk])).status_code, 404)
+
+    def test_tarefa_de_usuario(self):
+        tarefa = enfileirar('gerar_apostas', {'quantidade': 1}, usuario=self.ana)
+        self.client.force_login(self.ana)
+        self.assertEqual(self.status_tarefa(self.client, tarefa), 200)
+        self.client.force_login(self.bia)
+        self.assertEqual(self.status_tarefa(self.client, tarefa), 404)
+        self.client.logout()
+        self.assertEqual(self.status_tarefa(self.client, tarefa), 404)
+
+    def test_tarefa_do_sistema(self):
+        tarefa = enfileirar('treinar_modelos')
+        self.assertEqual(self.status_tarefa(self.client, tarefa), 404)
+        self.client.force_login(self.ana)
+        self.assertEqual(self.status_tarefa(self.client, tarefa), 404)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.status_tarefa(self.client, tarefa), 200)
+
+    def test_limite_por_sessao(self):
+        self.assertEqual(self.gerar_anonimo(self.client).status_code, 302)
+        self.assertEqual(self.gerar_anonimo(self.client).status_code, 302)
+        self.assertEqual(self.gerar_anonimo(self.client).status_code, 429)
+        # O limite é por sessão
+        self.assertEqual(self.gerar_anonimo(Client()).status_code, 302)
+
+        Tarefa.objects.filter(sessao=self.client.session.session_key).update(status='concluida')
+        self.assertEqual(self.gerar_anonimo(self.client).status_code, 302)
+        self.assertEqual(Tarefa.objects.count(), 4)
+
+    def test_limite_na_api(self):
+        self.client.force_login(self.ana)
+        corpo = json.dumps({'tipo': 'gerar_apostas', 'parametros': {'quantidade': 1}})
+        for status in (202, 202, 429):
+            response = self.client.post(reverse('api_criar_tarefa'), corpo, content_type='application/json')
+            self.assertEqual(response.status_code, status)
+        self.assertEqual(Tarefa.objects.filter(usuario=self.ana).count(), 2)
+
+    def test_tarefa_interna_restrita(self):
+        corpo = json.dumps({'tipo': 'treinar_modelos'})
+        self.client.force_login(self.ana)
+        response = self.client.post(reverse('api_criar_tarefa'), corpo, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('api_criar_tarefa'), corpo, content_type='application/json')
+        self.assertEqual(response.status_code, 202)
@@ -0,0 +1,34 @@
+# lotofacil_analyzer/tests/test_treinar_modelos.py
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from lotofacil_analyzer.cache import geracao_atual
+from lotofacil_analyzer.ml.modelos import MINIMO_SORTEIOS
+from lotofacil_analyzer.tests.armazem import isolar_armazem
+from unittest import mock
+
+
+class TreinarModelosTests(TestCase):
+    """Erros do comando treinar_modelos"""
+
+    def test_sem_geracao(self):
+        isolar_armazem(self)
+        with self.assertRaisesMessage(CommandError, "publicar_sorteios"):
+            call_command('treinar_modelos')
+
+    def test_historico_curto(self):
+        isolar_armazem(self, MINIMO_SORTEIOS - 1)
+        geracao_atual()
+        with mock.patch('lotofacil_analyzer.management.commands.treinar_modelos.treinar_armazem') as treinar:
+            with self.assertRaisesMessage(CommandError, str(MINIMO_SORTEIOS)):
+                call_command('treinar_modelos')
+        treinar.assert_not_called()
+
+    def test_outros_erros_propagam(self):
+        isolar_armazem(self, MINIMO_SORTEIOS)
+        geracao_atual()
+        erro = ValueError("Entrada inválida no estimador")
+        with mock.patch(
+            'lotofacil_analyzer.management.commands.treinar_modelos.treinar_armazem', side_effect=erro,
+        ):
+            with self.assertRaisesMessage(ValueError, "estimador"):
+                call_command('treinar_modelos')
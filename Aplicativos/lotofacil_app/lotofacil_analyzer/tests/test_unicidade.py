@@ -0,0 +1,64 @@
+# lotofacil_analyzer/tests/test_unicidade.py
+from django.contrib.auth.models import User
+from django.test import TestCase
+from lotofacil_analyzer.models import ApostaGerada
+from lotofacil_analyzer.unicidade import IndiceApostas
+
+APOSTA_A = list(range(1, 16))
+APOSTA_B = list(range(11, 26))
+APOSTA_C = list(range(2, 17))
+
+
+def salvar(usuario, numeros):
+    return ApostaGerada.objects.create(
+        usuario=usuario, numeros=','.join(map(str, numeros)), metodo_geracao='aleatorio',
+    )
+
+
+class IndiceApostasTests(TestCase):
+    """Filtragem de apostas repetidas por usuário e entre todos os usuários"""
+
+    def setUp(self):
+        self.ana = User.objects.create_user('ana')
+        self.bia = User.objects.create_user('bia')
+
+    def test_repetidas_no_mesmo_lote(self):
+        indice = IndiceApostas('usuario', self.ana)
+        # A ordem dos números dentro da aposta não importa
+        self.assertEqual(
+            indice.filtrar([APOSTA_A, APOSTA_B, APOSTA_A[::-1], APOSTA_B]),
+            [APOSTA_A, APOSTA_B],
+        )
+        self.assertEqual(len(indice), 2)
+        self.assertEqual(indice.filtrar([APOSTA_B, APOSTA_C]), [APOSTA_C])
+
+    def test_apostas_salvas(self):
+        salvar(self.ana, APOSTA_A)
+        indice = IndiceApostas('usuario', self.ana)
+        self.assertEqual(len(indice), 1)
+        self.assertEqual(indice.filtrar([APOSTA_A, APOSTA_B]), [APOSTA_B])
+
+        # Gravadas depois da criação só entram após ``atualizar``
+        salvar(self.ana, APOSTA_C)
+        self.assertEqual(indice.atualizar(), 1)
+        self.assertEqual(indice.filtrar([APOSTA_C]), [])
+
+    def test_escopos(self):
+        salvar(self.bia, APOSTA_A)
+        self.assertEqual(IndiceApostas('usuario', self.ana).filtrar([APOSTA_A]), [APOSTA_A])
+        self.assertEqual(IndiceApostas('global').filtrar([APOSTA_A]), [])
+
+    def test_desmarcar(self):
+        indice = IndiceApostas('global')
+        self.assertEqual(indice.filtrar([APOSTA_A]), [APOSTA_A])
+        indice.desmarcar([APOSTA_A])
+        self.assertEqual(len(indice), 0)
+        self.assertEqual(indice.filtrar([APOSTA_A]), [APOSTA_A])
+
+    def test_escopo_invalido(self):
+        with self.assertRaises(ValueError):
+            IndiceApostas(None)
+        with self.assertRaises(ValueError):
+            IndiceApostas('usuario')
+        with self.assertRaises(ValueError):
+            IndiceApostas('todos')
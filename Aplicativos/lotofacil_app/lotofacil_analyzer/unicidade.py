@@ -0,0 +1,153 @@
+# lotofacil_analyzer/unicidade.py
+"""
+Geração de apostas sem repetição, por usuário ou entre todos os usuários.
+
+Cada ``ApostaGerada`` guarda a máscara de bits dos números (indexada). As
+apostas salvas no modo sem repetição também gravam ``chave_unica``, coberta
+por uma restrição ``UNIQUE``: a máscara no escopo global, ou
+``usuario_id << 25 | máscara`` no escopo do usuário. Apostas salvas sem o
+modo ficam com a chave nula e não entram na restrição.
+
+Antes de inserir, os candidatos são filtrados em memória por um
+``IndiceApostas``: um mapa de bits exato com uma posição por aposta possível
+(o índice lexicográfico de ``data.combinatoria``, 3.268.760 posições),
+carregado do banco uma vez por tarefa. A cada lote, uma única consulta traz
+só as apostas gravadas no escopo desde a última leitura; a restrição do
+banco cobre a janela restante entre essa consulta e a inserção.
+"""
+
+from .data.bitmask import TOTAL_NUMEROS, mascaras_de_matriz
+from .data.combinatoria import TOTAL_APOSTAS, indices_de_mascaras
+from .models import ApostaGerada
+from django.conf import settings
+from django.db.models import Max
+import numpy as np
+
+ESCOPOS = ('usuario', 'global')
+
+# Máscaras lidas do banco por vez ao carregar o índice
+TAMANHO_LOTE_CONSULTA = 10_000
+
+
+def escopo_padrao():
+    """Escopo de ``LOTOFACIL_APOSTAS_UNICAS`` (None = apostas repetidas permitidas)."""
+    return validar_escopo(getattr(settings, 'LOTOFACIL_APOSTAS_UNICAS', None))
+
+
+def validar_escopo(escopo):
+    """
+    Normaliza um escopo informado pelo usuário ou pela configuração.
+
+    Raises:
+        ValueError: Se o escopo não for vazio nem um de ``ESCOPOS``
+    """
+    if not escopo:
+        return None
+    if escopo not in ESCOPOS:
+        raise ValueError(f"Escopo de apostas únicas inválido: {escopo} (use {' ou '.join(ESCOPOS)})")
+    return escopo
+
+
+def chaves_unicas(escopo, usuario_id, mascaras):
+    """
+    Valores de ``chave_unica`` para máscaras salvas em um escopo.
+
+    Os ids de usuário começam em 1, então as chaves por usuário nunca
+    coincidem com as globais (menores que ``1 << 25``).
+
+    Returns:
+        np.ndarray: Vetor ``int64``
+    """
+    mascaras = np.asarray(mascaras, dtype=np.int64)
+    if escopo == 'global':
+        return mascaras
+    return (np.int64(usuario_id) << TOTAL_NUMEROS) | mascaras
+
+
+class IndiceApostas:
+    """Apostas já salvas em um escopo, como mapa de bits pelo índice lexicográfico"""
+
+    def __init__(self, escopo, usuario=None):
+        """
+        Carrega as apostas do escopo.
+
+        Args:
+            escopo (str): 'usuario' (apostas do usuário) ou 'global' (de todos)
+            usuario (User, optional): Obrigatório no escopo 'usuario'
+        """
+        self.escopo = validar_escopo(escopo)
+        if self.escopo is None:
+            raise ValueError("O índice de apostas exige um escopo")
+        if self.escopo == 'usuario' and usuario is None:
+            raise ValueError("O escopo 'usuario' exige um usuário")
+        self.usuario = usuario
+        self.presentes = np.zeros(TOTAL_APOSTAS, dtype=bool)
+        self.ultimo_pk = 0
+        self.atualizar()
+
+    def _consulta(self):
+        consulta = ApostaGerada.objects.all()
+        if self.escopo == 'usuario':
+            consulta = consulta.filter(usuario=self.usuario)
+        return consulta
+
+    def _marcar(self, mascaras):
+        mascaras = np.asarray(mascaras, dtype=np.uint32)
+        if len(mascaras):
+            self.presentes[indices_de_mascaras(mascaras)] = True
+
+    def atualizar(self):
+        """
+        Incorpora as apostas gravadas no escopo desde a última leitura.
+
+        Na criação lê o escopo inteiro em lotes; depois, cada chamada é uma
+        consulta pelos ids acima do último visto (normalmente vazia ou com as
+        apostas que a própria tarefa acabou de inserir).
+
+        Returns:
+            int: Apostas lidas
+        """
+        consulta = self._consulta().filter(pk__gt=self.ultimo_pk)
+        # O máximo é lido antes das máscaras: o que for gravado entre as duas
+        # consultas é lido de novo na próxima chamada, o que é inofensivo
+        ultimo = consulta.aggregate(ultimo=Max('pk'))['ultimo']
+        if ultimo is None:
+            return 0
+        lidas = 0
+        lote = []
+        for mascara in consulta.values_list('mascara', flat=True).iterator(chunk_size=TAMANHO_LOTE_CONSULTA):
+            lote.append(mascara)
+            if len(lote) == TAMANHO_LOTE_CONSULTA:
+                self._marcar(lote)
+                lidas += len(lote)
+                lote = []
+        self._marcar(lote)
+        self.ultimo_pk = max(self.ultimo_pk, ultimo)
+        return lidas + len(lote)
+
+    def __len__(self):
+        return int(self.presentes.sum())
+
+    def filtrar(self, apostas):
+        """
+        Mantém só as apostas inéditas no escopo (e sem repetição entre si) e as marca.
+
+        Args:
+            apostas (list): Apostas candidatas (listas de 15 números)
+
+        Returns:
+            list: Apostas inéditas, na ordem original
+        """
+        if not apostas:
+            return []
+        indices = indices_de_mascaras(mascaras_de_matriz(apostas))
+        _, primeiras = np.unique(indices, return_index=True)
+        novas = np.sort(primeiras)
+        novas = novas[~self.presentes[indices[novas]]]
+        self.presentes[indices[novas]] = True
+        return [apostas[i] for i in novas]
+
+    def desmarcar(self, apostas):
+        """Libera apostas filtradas que acabaram não sendo salvas."""
+        if apostas:
+            self.presentes[indices_de_mascaras(mascaras_de_matriz(apostas))] = False
@@ -5,8 +5,19 @@ urlpatterns = [
     path('', views.home, name='home'),  # Rota para a view home
     path('criar_jogo/', views.criar_jogo, name='criar_jogo'),
     path('gerar-jogo-rapido/', views.gerar_jogo_rapido, name='gerar_jogo_rapido'),
+    path('tarefas/<int:pk>/', views.acompanhar_tarefa, name='tarefa'),
+    path('api/tarefas/', views.api_criar_tarefa, name='api_criar_tarefa'),
+    path('api/tarefas/<int:pk>/', views.api_tarefa, name='api_tarefa'),
+    path('api/tarefas/<int:pk>/resultado/', views.api_tarefa_resultado, name='api_tarefa_resultado'),
     path('resultados/', views.resultados, name='resultados'),
+    path('api/resultados/', views.api_resultados, name='api_resultados'),
+    path('api/universo/', views.api_universo, name='api_universo'),
     path('estatisticas/', views.estatisticas, name='estatisticas'),
+    path('api/conferir/', views.api_conferir, name='api_conferir'),
+    path('api/estatisticas/<str:analisador>/', views.api_estatisticas, name='api_estatisticas'),
+    path('exportar/apostas/', views.exportar_apostas, name='exportar_apostas'),
+    path('exportar/estatisticas/<str:tabela>/', views.exportar_estatisticas, name='exportar_estatisticas'),
+    path('metrics', views.metricas, name='metricas'),
     path('planos/', views.planos, name='planos'),
     path('newsletter/', views.newsletter_signup, name='newsletter_signup'),
 ]
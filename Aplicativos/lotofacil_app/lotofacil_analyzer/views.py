@@ -1,15 +1,40 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from .models import ApostaGerada, SorteioLotofacil
-from django.http import HttpResponse
+from .models import ApostaGerada, SorteioLotofacil, Tarefa
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_http_methods
+from django.views.decorators.csrf import csrf_exempt
+from asgiref.sync import sync_to_async
 from bs4 import BeautifulSoup
 from django.utils import timezone
-from lotofacil_analyzer.data.processor import LotofacilDataImporter
-from .analyzers.frequency import AnalisadorFrequencia
-from .analyzers.gap import AnalisadorAtraso
+from .data import bitmask, combinatoria
+from .cache import (
+    acalcular_estatisticas, agendar_estatisticas, aresposta_api, estatisticas_em_cache,
+    geracao_atual, parametros_api, versao_api,
+)
+from .conferencia import conferir_historico, validar_apostas
+from .data.store import obter_armazem
+from .export import (
+    TABELAS_ESTATISTICAS, resposta_exportacao, tabela_apostas, tabela_atraso,
+    tabela_combinacoes, tabela_frequencia,
+)
+from .jobs import (
+    LIMITE_APOSTAS, METODOS_GERACAO, TIPOS_INTERNOS, enfileirar, limite_tarefas_atingido,
+)
+from .metrics import exposicao
+from .ml import resumo_modelos
+from .unicidade import ESCOPOS, escopo_padrao, validar_escopo
+from .pool import executar_coalescido
+from .warmup import aquecimento_em_andamento
 from pathlib import Path
-from .analyzers.combinations import AnalisadorCombinacoes
+import hashlib
+import hmac
 import json
 import requests
 import logging
@@ -18,86 +43,498 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# render() pode acessar a sessão/usuário no template, então roda fora do loop de eventos
+arender = sync_to_async(render)
+
+MENSAGEM_LIMITE_TAREFAS = "Você já tem tarefas em andamento. Aguarde a conclusão delas."
+# Segundos sugeridos (Retry-After) enquanto as estatísticas são calculadas
+ESPERA_ESTATISTICAS = 5
+
 
 
 
 def home(request):
     return render(request, 'lotofacil_analyzer/home.html')
 
-from django.http import HttpResponse
+
+def _ler_quantidade(request, padrao, limite):
+    try:
+        quantidade = int(request.POST.get('quantidade', padrao))
+    except ValueError:
+        raise ValidationError("Quantidade inválida.")
+    if not 1 <= quantidade <= limite:
+        raise ValidationError(f"A quantidade deve estar entre 1 e {limite}.")
+    return quantidade
+
+
 @login_required
 def criar_jogo(request):
-    
-    return HttpResponse("Página de criação de jogo")
+    """Formulário de geração de apostas; a geração roda na fila de tarefas."""
+    contexto = {
+        'metodos': METODOS_GERACAO, 'limite': LIMITE_APOSTAS,
+        'escopos': ESCOPOS, 'escopo_padrao': escopo_padrao() or '',
+    }
+    if request.method != 'POST':
+        return render(request, 'lotofacil_analyzer/criar_jogo.html', contexto)
+
+    metodo = request.POST.get('metodo', 'frequencia')
+    try:
+        if metodo not in METODOS_GERACAO:
+            raise ValidationError("Método de geração inválido.")
+        quantidade = _ler_quantidade(request, 1, LIMITE_APOSTAS)
+        unicas = validar_escopo(request.POST.get('unicas', ''))
+    except ValueError as e:
+        contexto['erro'] = str(e)
+        return render(request, 'lotofacil_analyzer/criar_jogo.html', contexto, status=400)
+    except ValidationError as e:
+        contexto['erro'] = e.messages[0]
+        return render(request, 'lotofacil_analyzer/criar_jogo.html', contexto, status=400)
+
+    if limite_tarefas_atingido(request.user):
+        contexto['erro'] = MENSAGEM_LIMITE_TAREFAS
+        return render(request, 'lotofacil_analyzer/criar_jogo.html', contexto, status=429)
+
+    tarefa = enfileirar(
+        'gerar_apostas',
+        {'metodo': metodo, 'quantidade': quantidade, 'salvar': True, 'unicas': unicas},
+        usuario=request.user,
+    )
+    return redirect('tarefa', pk=tarefa.pk)
+
+
+def _dono_tarefas(request):
+    """
+    Dono das tarefas criadas pela requisição.
+
+    Returns:
+        tuple: (usuário, '') para usuários logados ou (None, chave da sessão)
+        para anônimos, criando a sessão se preciso
+    """
+    if request.user.is_authenticated:
+        return request.user, ''
+    if request.session.session_key is None:
+        request.session.create()
+    return None, request.session.session_key
 
+
+@require_http_methods(['POST'])
 def gerar_jogo_rapido(request):
-    return HttpResponse("Jogo rápido gerado!")
+    """Enfileira a geração com o algoritmo padrão (salva para usuários logados)."""
+    try:
+        quantidade = _ler_quantidade(request, 1, 10)
+    except ValidationError as e:
+        return render(request, 'lotofacil_analyzer/erro.html', {'mensagem': e.messages[0]}, status=400)
+
+    usuario, sessao = _dono_tarefas(request)
+    if limite_tarefas_atingido(usuario, sessao):
+        return render(request, 'lotofacil_analyzer/erro.html', {'mensagem': MENSAGEM_LIMITE_TAREFAS}, status=429)
+    tarefa = enfileirar(
+        'gerar_apostas',
+        {'metodo': 'frequencia', 'quantidade': quantidade, 'salvar': usuario is not None},
+        usuario=usuario, sessao=sessao,
+    )
+    return redirect('tarefa', pk=tarefa.pk)
+
+
+def _obter_tarefa(usuario, sessao, pk):
+    """
+    Busca uma tarefa visível para o usuário ou a sessão da requisição.
+
+    Tarefas com dono só são visíveis para ele; tarefas anônimas, para a sessão
+    que as criou; as enfileiradas pelo próprio sistema, para administradores.
+
+    Raises:
+        Tarefa.DoesNotExist: Se não existir ou não for visível
+    """
+    tarefa = Tarefa.objects.get(pk=pk)
+    if tarefa.usuario_id is not None:
+        visivel = tarefa.usuario_id == usuario.pk
+    elif tarefa.sessao:
+        visivel = tarefa.sessao == sessao
+    else:
+        visivel = usuario.is_staff
+    if not visivel:
+        raise Tarefa.DoesNotExist
+    return tarefa
+
+
+def _estado_tarefa(tarefa):
+    return {
+        'id': tarefa.pk,
+        'tipo': tarefa.tipo,
+        'status': tarefa.status,
+        'progresso': tarefa.progresso,
+        'mensagem': tarefa.mensagem,
+        'resumo': tarefa.resumo,
+        'erro': tarefa.erro.strip().splitlines()[-1] if tarefa.erro else None,
+        'criada_em': tarefa.criada_em,
+        'concluida_em': tarefa.concluida_em,
+        'resultado': reverse('api_tarefa_resultado', args=[tarefa.pk])
+        if tarefa.status == 'concluida' else None,
+    }
+
+
+def acompanhar_tarefa(request, pk):
+    try:
+        tarefa = _obter_tarefa(request.user, request.session.session_key, pk)
+    except Tarefa.DoesNotExist:
+        raise Http404("Tarefa não encontrada.")
+    return render(request, 'lotofacil_analyzer/tarefa.html', {'tarefa': tarefa})
+
+
+@login_required
+@require_http_methods(['POST'])
+def api_criar_tarefa(request):
+    """
+    Enfileira uma tarefa a partir de JSON ``{"tipo": ..., "parametros": {...}}``.
+
+    Responde 202 com o estado inicial; o progresso é consultado em ``api_tarefa``.
+    """
+    try:
+        corpo = json.loads(request.body)
+        if corpo['tipo'] in TIPOS_INTERNOS and not request.user.is_staff:
+            return JsonResponse({'erro': "Tarefa restrita a administradores."}, status=403)
+        if limite_tarefas_atingido(request.user):
+            return JsonResponse({'erro': MENSAGEM_LIMITE_TAREFAS}, status=429)
+        tarefa = enfileirar(corpo['tipo'], corpo.get('parametros') or {}, usuario=request.user)
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'erro': str(e) or "Requisição inválida."}, status=400)
+    return JsonResponse(_estado_tarefa(tarefa), status=202)
+
+
+async def api_tarefa(request, pk):
+    """Estado e progresso de uma tarefa, consultado periodicamente pelo cliente."""
+    usuario = await request.auser()
+    try:
+        tarefa = await sync_to_async(_obter_tarefa)(usuario, request.session.session_key, pk)
+    except Tarefa.DoesNotExist:
+        return JsonResponse({'erro': "Tarefa não encontrada."}, status=404)
+    return JsonResponse(_estado_tarefa(tarefa))
+
+
+def api_tarefa_resultado(request, pk):
+    """Artefato JSON completo de uma tarefa concluída."""
+    try:
+        tarefa = _obter_tarefa(request.user, request.session.session_key, pk)
+    except Tarefa.DoesNotExist:
+        return JsonResponse({'erro': "Tarefa não encontrada."}, status=404)
+    if tarefa.status != 'concluida':
+        return JsonResponse({'erro': "A tarefa ainda não foi concluída."}, status=409)
+    try:
+        arquivo = open(tarefa.arquivo_resultado, 'rb')
+    except OSError:
+        return JsonResponse({'erro': "Resultado não disponível."}, status=410)
+    return FileResponse(
+        arquivo, content_type='application/json',
+        as_attachment=True, filename=f'tarefa_{tarefa.pk}.json',
+    )
+
+def _consulta_resultados(request):
+    """
+    Monta a consulta de uma página de resultados por paginação keyset sobre ``concurso``.
+
+    Parâmetros GET: ``antes`` (concurso a partir do qual continuar, exclusivo)
+    e ``tamanho`` (itens por página, limitado a ``LOTOFACIL_RESULTADOS_MAXIMO``).
+
+    Returns:
+        tuple: (queryset de tuplas com um item a mais que a página, tamanho)
+    """
+    tamanho_padrao = getattr(settings, 'LOTOFACIL_RESULTADOS_POR_PAGINA', 50)
+    maximo = getattr(settings, 'LOTOFACIL_RESULTADOS_MAXIMO', 200)
+    try:
+        tamanho = min(max(int(request.GET.get('tamanho', tamanho_padrao)), 1), maximo)
+        antes = int(request.GET['antes']) if request.GET.get('antes') else None
+    except ValueError:
+        raise ValidationError("Parâmetros de paginação inválidos.")
+
+    consulta = SorteioLotofacil.objects.order_by('-concurso')
+    if antes is not None:
+        consulta = consulta.filter(concurso__lt=antes)
+
+    # Busca um item a mais apenas para saber se existe próxima página
+    consulta = consulta.values_list(
+        'concurso', 'data', 'mascara', 'ganhadores_15_acertos'
+    )[:tamanho + 1]
+    return consulta, tamanho
+
+
+def _montar_pagina(linhas, tamanho):
+    """
+    Decodifica as linhas de uma página de resultados.
+
+    Returns:
+        dict: Itens da página e o cursor ``proximo`` (None na última página)
+    """
+    tem_proxima = len(linhas) > tamanho
+    itens = [
+        {
+            'concurso': concurso,
+            'data': data,
+            'numeros': bitmask.numeros_da_mascara(mascara),
+            'ganhadores_15_acertos': ganhadores,
+        }
+        for concurso, data, mascara, ganhadores in linhas[:tamanho]
+    ]
+    return {
+        'itens': itens,
+        'tamanho': tamanho,
+        'proximo': itens[-1]['concurso'] if tem_proxima else None,
+    }
+
+
+def _pagina_resultados(request):
+    consulta, tamanho = _consulta_resultados(request)
+    return _montar_pagina(list(consulta), tamanho)
+
 
 def resultados(request):
-    # Obtém todos os concursos (ou filtra conforme necessário)
-    concursos = SorteioLotofacil.objects.all().order_by('-numero')
+    try:
+        pagina = _pagina_resultados(request)
+    except ValidationError as e:
+        return render(request, 'lotofacil_analyzer/erro.html', {'mensagem': e.messages[0]}, status=400)
+
+    return render(request, 'lotofacil_analyzer/resultados.html', {'pagina': pagina})
+
+
+async def api_resultados(request):
+    try:
+        consulta, tamanho = _consulta_resultados(request)
+    except ValidationError as e:
+        return JsonResponse({'erro': e.messages[0]}, status=400)
+
+    pagina = _montar_pagina([linha async for linha in consulta], tamanho)
+    for item in pagina['itens']:
+        item['data'] = item['data'].isoformat()
+    return JsonResponse(pagina)
+
+
+def _pagina_universo(request):
+    """
+    Fatia do universo de apostas em ordem lexicográfica, gerada sob demanda.
+
+    Parâmetros GET: ``inicio`` (índice da primeira aposta) ou ``numeros``
+    (aposta a partir da qual listar, separada por vírgulas; define ``k``),
+    ``k`` (números por aposta, padrão 15) e ``tamanho`` (limitado a
+    ``LOTOFACIL_RESULTADOS_MAXIMO``).
+
+    Returns:
+        dict: Itens (índice e números), total de apostas e o índice ``proximo``
+        (None na última página)
+    """
+    tamanho_padrao = getattr(settings, 'LOTOFACIL_RESULTADOS_POR_PAGINA', 50)
+    maximo = getattr(settings, 'LOTOFACIL_RESULTADOS_MAXIMO', 200)
+    try:
+        tamanho = min(max(int(request.GET.get('tamanho', tamanho_padrao)), 1), maximo)
+        numeros = [int(n) for n in request.GET['numeros'].split(',')] if request.GET.get('numeros') else None
+        k = len(numeros) if numeros else int(request.GET.get('k', bitmask.NUMEROS_POR_SORTEIO))
+        inicio = int(request.GET.get('inicio', 0))
+    except ValueError:
+        raise ValidationError("Parâmetros de paginação inválidos.")
+    try:
+        total = combinatoria.total_apostas(k)
+        if numeros:
+            inicio = combinatoria.indice_da_aposta(numeros)
+    except ValueError as e:
+        raise ValidationError(str(e))
+    if not 0 <= inicio < total:
+        raise ValidationError(f"O início deve estar entre 0 e {total - 1}.")
+
+    indices, apostas = combinatoria.fatia_universo(inicio, tamanho, k)
+    fim = inicio + len(indices)
+    return {
+        'k': k,
+        'total': total,
+        'inicio': inicio,
+        'tamanho': tamanho,
+        'itens': [
+            {'indice': indice, 'numeros': numeros}
+            for indice, numeros in zip(indices.tolist(), apostas.tolist())
+        ],
+        'proximo': fim if fim < total else None,
+    }
 
-    # Passa os concursos para o template
-    return render(request, 'lotofacil_analyzer/resultados.html', {'concursos': concursos})
+
+def api_universo(request):
+    """Navegação paginada por todas as apostas possíveis, sem materializar o universo."""
+    try:
+        return JsonResponse(_pagina_universo(request))
+    except ValidationError as e:
+        return JsonResponse({'erro': e.messages[0]}, status=400)
 
 
-def estatisticas(request):
+async def estatisticas(request):
     try:
         # Caminho relativo ao arquivo CSV
         caminho_arquivo_csv = Path(__file__).parent / 'data' / 'files' / 'base_dados.csv'
         
-        # Debug: Exibe informações detalhadas
-        print(f"Caminho do arquivo CSV: {caminho_arquivo_csv}")
-        print(f"Arquivo existe: {caminho_arquivo_csv.exists()}")
-        
         # Verifica se o arquivo existe
         if not caminho_arquivo_csv.exists():
             logger.error(f"Arquivo não encontrado: {caminho_arquivo_csv}")
-            return render(request, 'lotofacil_analyzer/erro.html', {'mensagem': 'Arquivo de dados não encontrado.'})
-        
-        # Usa o LotofacilDataImporter para carregar e processar os dados
-        print("Tentando criar LotofacilDataImporter...")
-        importer = LotofacilDataImporter(file_path=caminho_arquivo_csv)
-        
-        print("Tentando importar CSV...")
-        df = importer.importar_csv()  # Importa diretamente do CSV
+            return await arender(request, 'lotofacil_analyzer/erro.html', {'mensagem': 'Arquivo de dados não encontrado.'})
         
-        # Processa os dados usando os analisadores
-        analisador_frequencia = AnalisadorFrequencia(df=df)
-        resultados_frequencia = analisador_frequencia.analisar()
-        logger.info("Análise de frequência concluída.")
-        
-        analisador_atraso = AnalisadorAtraso(df=df)
-        resultados_atraso = analisador_atraso.analisar()
-        logger.info("Análise de atraso concluída.")
-        
-        analisador_combinacoes = AnalisadorCombinacoes(df=df)
-        resultados_combinacoes = analisador_combinacoes.analisar()
-        probabilidades_combinacoes = analisador_combinacoes.calcular_probabilidades()
-        logger.info("Análise de combinções concluída.")
-        
-        # Debug: Exibe os resultados no console
-        print("Resultados Frequência:", resultados_frequencia)
-        print("Resultados Atraso:", resultados_atraso)
-        
-        # Passa os resultados completos para o template
-        context = {
-            'frequencia': resultados_frequencia,
-            'atraso': resultados_atraso,
-            'combinacoes': {
-                'resultados': resultados_combinacoes,
-                'probabilidades': probabilidades_combinacoes
-            }
-        }
-        return render(request, 'lotofacil_analyzer/estatisticas.html', context)
+        # Usa o resultado em cache; durante o aquecimento exibe um aviso em vez de recalcular
+        context = await sync_to_async(estatisticas_em_cache)()
+        if context is None:
+            if aquecimento_em_andamento():
+                return await arender(request, 'lotofacil_analyzer/calculando.html')
+            # Calcula no pool de processos; requisições simultâneas compartilham o cálculo
+            context = await acalcular_estatisticas()
+
+        # Os modelos são treinados pelo worker a cada geração: aqui só são carregados
+        context = {**context, 'ml': await sync_to_async(resumo_modelos)()}
+        return await arender(request, 'lotofacil_analyzer/estatisticas.html', context)
     
     except FileNotFoundError:
         logger.error("Arquivo de dados não encontrado.")
-        return render(request, 'lotofacil_analyzer/erro.html', {'mensagem': 'Arquivo de dados não encontrado.'})
+        return await arender(request, 'lotofacil_analyzer/erro.html', {'mensagem': 'Arquivo de dados não encontrado.'})
     
     except Exception as e:
         logger.error(f"Erro ao processar os dados: {str(e)}")
-        return render(request, 'lotofacil_analyzer/erro.html', {'mensagem': f"Erro ao processar os dados: {str(e)}"})
+        return await arender(request, 'lotofacil_analyzer/erro.html', {'mensagem': f"Erro ao processar os dados: {str(e)}"})
+
+def _codificacao_api(request):
+    """Codificação da resposta da API: gzip quando o cliente aceita."""
+    return 'gzip' if 'gzip' in request.headers.get('Accept-Encoding', '') else 'identity'
+
+
+async def api_estatisticas(request, analisador):
+    # A versão é consultada uma vez, fora do loop de eventos; requisições
+    # condicionais válidas recebem 304 sem executar o analisador
+    try:
+        parametros = parametros_api(analisador, request.GET)
+    except KeyError:
+        return JsonResponse({'erro': f"Analisador desconhecido: {analisador}"}, status=404)
+    except ValueError:
+        return JsonResponse({'erro': "Parâmetros inválidos."}, status=400)
+
+    try:
+        versao, modificacao = await sync_to_async(versao_api)(analisador, parametros)
+    except FileNotFoundError:
+        return JsonResponse({'erro': "Arquivo de dados não encontrado."}, status=503)
+
+    # Os bytes diferem por codificação, então cada uma tem a própria ETag
+    codificacao = _codificacao_api(request)
+    etag = quote_etag(f'{versao}-{codificacao}')
+    modificacao = int(modificacao.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=modificacao)
+    if response is None:
+        corpos = await aresposta_api(analisador, parametros, versao)
+        response = HttpResponse(corpos[codificacao], content_type='application/json')
+        if codificacao != 'identity':
+            response['Content-Encoding'] = codificacao
+
+    if request.method in ('GET', 'HEAD'):
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(modificacao))
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+# Sem efeitos colaterais: o POST só transporta as apostas a conferir
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+async def api_conferir(request):
+    """
+    Confere apostas contra todo o histórico de sorteios.
+
+    GET ``?numeros=1,2,...,15`` confere uma aposta; POST com JSON
+    ``{"apostas": [[...], ...]}`` confere várias de uma vez.
+    """
+    try:
+        if request.method == 'POST':
+            apostas = json.loads(request.body)['apostas']
+        else:
+            apostas = [[int(n) for n in request.GET.get('numeros', '').split(',') if n]]
+        mascaras = validar_apostas(apostas)
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'erro': str(e) or "Apostas inválidas."}, status=400)
+
+    try:
+        geracao = await sync_to_async(geracao_atual)()
+    except FileNotFoundError:
+        return JsonResponse({'erro': "Arquivo de dados não encontrado."}, status=503)
+
+    chave = ('conferir', geracao, hashlib.sha1(mascaras.tobytes()).hexdigest())
+    resultado = await executar_coalescido(chave, conferir_historico, mascaras)
+    return JsonResponse(resultado)
+
+
+def _sob_asgi(request):
+    """Se a requisição chegou pelo servidor ASGI (streaming precisa de iterador assíncrono)."""
+    return isinstance(request, ASGIRequest)
+
+
+def _opcoes_exportacao(request):
+    """Formato (``?formato=csv|jsonl``) e compressão (``?gzip=1``) pedidos."""
+    return request.GET.get('formato', 'csv'), request.GET.get('gzip') in ('1', 'true')
+
+
+@login_required
+def exportar_apostas(request):
+    """Download em streaming de todas as apostas geradas pelo usuário."""
+    formato, comprimir = _opcoes_exportacao(request)
+    cabecalho, linhas = tabela_apostas(request.user.apostas_geradas.order_by('-data_geracao', '-pk'))
+    try:
+        return resposta_exportacao(cabecalho, linhas, formato, 'apostas', comprimir, _sob_asgi(request))
+    except ValueError as e:
+        return JsonResponse({'erro': str(e)}, status=400)
+
+
+def exportar_estatisticas(request, tabela):
+    """
+    Download em streaming de uma tabela de análise.
+
+    ``frequencia`` e ``atraso`` vêm das estatísticas em cache; ``combinacoes``
+    traz a contagem de todas as combinações de ``?tamanho=`` números.
+
+    Sem estatísticas em cache a view não calcula na thread da requisição:
+    agenda o cálculo no pool (ou deixa o aquecimento terminá-lo) e responde
+    503 com ``Retry-After``.
+    """
+    if tabela not in TABELAS_ESTATISTICAS:
+        return JsonResponse({'erro': f"Tabela desconhecida: {tabela}"}, status=404)
+    formato, comprimir = _opcoes_exportacao(request)
+
+    try:
+        geracao_atual()
+        armazem = obter_armazem()
+        if tabela == 'combinacoes':
+            cabecalho, linhas = tabela_combinacoes(armazem.arrays, int(request.GET.get('tamanho', 3)))
+        else:
+            contexto = estatisticas_em_cache()
+            if contexto is None:
+                if not aquecimento_em_andamento():
+                    agendar_estatisticas()
+                response = JsonResponse(
+                    {'erro': "As estatísticas estão sendo calculadas. Tente novamente em instantes."},
+                    status=503,
+                )
+                response['Retry-After'] = str(ESPERA_ESTATISTICAS)
+                return response
+            construtor = tabela_frequencia if tabela == 'frequencia' else tabela_atraso
+            cabecalho, linhas = construtor(contexto[tabela])
+        nome = f"{tabela}_{armazem.meta['ultimo_concurso']}"
+        return resposta_exportacao(cabecalho, linhas, formato, nome, comprimir, _sob_asgi(request))
+    except ValueError as e:
+        return JsonResponse({'erro': str(e)}, status=400)
+    except FileNotFoundError:
+        return JsonResponse({'erro': "Arquivo de dados não encontrado."}, status=503)
+
+
+@require_http_methods(['GET'])
+def metricas(request):
+    """
+    Métricas do processo no formato texto do Prometheus.
+
+    Exige o cabeçalho ``Authorization: Bearer <LOTOFACIL_METRICAS_TOKEN>``;
+    sem token configurado o endpoint fica fechado.
+    """
+    token = getattr(settings, 'LOTOFACIL_METRICAS_TOKEN', None)
+    if not token:
+        return HttpResponse(status=403)
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(exposicao(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 
 def planos(request):
     return render(request, 'planos.html')  # Certifique-se de que esse template existe
@@ -0,0 +1,76 @@
+# lotofacil_analyzer/warmup.py
+"""
+Aquecimento das estatísticas em segundo plano na inicialização do worker.
+
+O aquecimento começa na primeira requisição do processo (sinal
+``request_started``), então só processos que servem requisições o executam:
+comandos de gerenciamento, o ``worker`` e os processos dos pools nunca
+recebem requisições. A thread daemon só aguarda o cálculo, submetido ao pool
+de ``pool.py`` (limitado a ``LOTOFACIL_PROCESSOS_POOL`` processos e
+compartilhado com as requisições da mesma geração), para que o worker
+responda imediatamente; enquanto isso a view consulta
+``aquecimento_em_andamento()`` e exibe uma página de "calculando" em vez de
+repetir o cálculo.
+"""
+
+from django.core.signals import request_started
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_em_andamento = threading.Event()
+_concluido = threading.Event()
+_lock = threading.Lock()
+
+
+def aquecimento_em_andamento():
+    """Indica se o aquecimento foi iniciado e ainda não terminou."""
+    return _em_andamento.is_set()
+
+
+def estatisticas_prontas():
+    """Indica se o aquecimento deste processo já terminou."""
+    return _concluido.is_set()
+
+
+def _aquecer():
+    """Carrega a geração de dados vigente e popula o cache das estatísticas."""
+    from .cache import calcular_estatisticas
+
+    try:
+        calcular_estatisticas()
+        logger.info("Aquecimento das estatísticas concluído.")
+    except Exception:
+        logger.exception("Falha no aquecimento das estatísticas.")
+    finally:
+        _concluido.set()
+        _em_andamento.clear()
+
+
+def iniciar_aquecimento():
+    """
+    Dispara o aquecimento em uma thread daemon, uma única vez por processo.
+
+    Returns:
+        bool: True se uma nova thread foi iniciada
+    """
+    with _lock:
+        if _em_andamento.is_set() or _concluido.is_set():
+            return False
+        _em_andamento.set()
+
+    threading.Thread(target=_aquecer, name='lotofacil-aquecimento', daemon=True).start()
+    return True
+
+
+def _aquecer_na_primeira_requisicao(sender, **kwargs):
+    request_started.disconnect(dispatch_uid='lotofacil_aquecimento')
+    iniciar_aquecimento()
+
+
+def aquecer_na_primeira_requisicao():
+    """Agenda o aquecimento para a primeira requisição atendida pelo processo."""
+    request_started.connect(
+        _aquecer_na_primeira_requisicao, dispatch_uid='lotofacil_aquecimento', weak=False,
+    )
@@ -50,6 +50,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'lotofacil_analyzer.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'lotofacil_web.urls'
@@ -139,3 +140,71 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Lotofácil
+# Diretório das gerações de dados processados, mapeadas em memória pelos workers
+LOTOFACIL_DIRETORIO_PROCESSADOS = BASE_DIR / 'lotofacil_analyzer' / 'data' / 'processed'
+
+# Atributos e modelos de ml.modelos, um diretório por versão dos sorteios
+LOTOFACIL_DIRETORIO_MODELOS = BASE_DIR / 'lotofacil_analyzer' / 'data' / 'modelos'
+
+# Enfileira o treino dos modelos (tarefa do worker) a cada geração publicada
+LOTOFACIL_TREINAR_AO_PUBLICAR = True
+
+# Calcula as estatísticas em segundo plano a partir da primeira requisição de cada worker
+LOTOFACIL_AQUECER_NA_INICIALIZACAO = False
+
+# Paginação da página e da API de resultados
+LOTOFACIL_RESULTADOS_POR_PAGINA = 50
+LOTOFACIL_RESULTADOS_MAXIMO = 200
+
+# Apostas por página no histórico do usuário
+LOTOFACIL_HISTORICO_POR_PAGINA = 50
+
+# Processos do pool usado pelas views assíncronas e pelo aquecimento para análises e conferências
+LOTOFACIL_PROCESSOS_POOL = 2
+
+# Fila de tarefas: processos do comando worker e diretório dos artefatos de resultado
+LOTOFACIL_PROCESSOS_WORKER = 2
+LOTOFACIL_DIRETORIO_TAREFAS = BASE_DIR / 'media' / 'tarefas'
+
+# Segundos após os quais uma tarefa em execução é considerada abandonada e volta para a fila
+LOTOFACIL_TEMPO_MAXIMO_TAREFA = 6 * 3600
+
+# Tarefas pendentes ou em execução por usuário (ou por sessão anônima); além disso a view responde 429
+LOTOFACIL_TAREFAS_ABERTAS_POR_CLIENTE = 3
+
+# Geração sem repetição por padrão: None, 'usuario' (apostas do próprio usuário) ou 'global'
+LOTOFACIL_APOSTAS_UNICAS = None
+
+# Anexa ao armazém os sorteios gravados no banco, sem reprocessar o histórico
+LOTOFACIL_ANEXAR_SORTEIOS = True
+
+# Jogos "K de N" além dos embutidos (lotofacil, mega_sena, quina), como
+# {chave: argumentos de data.jogos.Jogo}, ex.:
+# {'dupla_sena': {'nome': 'Dupla Sena', 'total_numeros': 50, 'numeros_por_sorteio': 6,
+#                 'faixas_premiadas': (3, 4, 5, 6)}}
+LOTOFACIL_JOGOS = {}
+
+# Instrumentação: cabeçalho Server-Timing e métricas do Prometheus em /metrics
+LOTOFACIL_METRICAS = True
+# /metrics exige "Authorization: Bearer <token>"; sem token o endpoint responde 403
+LOTOFACIL_METRICAS_TOKEN = os.environ.get('LOTOFACIL_METRICAS_TOKEN')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simples': {'format': '{asctime} {levelname} {name}: {message}', 'style': '{'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simples'},
+    },
+    'loggers': {
+        # DEBUG habilita as mensagens de diagnóstico dos analisadores e do importador
+        'lotofacil_analyzer': {
+            'handlers': ['console'],
+            'level': os.environ.get('LOTOFACIL_LOG_LEVEL', 'INFO'),
+        },
+        'usuarios': {'handlers': ['console'], 'level': os.environ.get('LOTOFACIL_LOG_LEVEL', 'INFO')},
+    },
+}
@@ -1,3 +1,66 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from lotofacil_analyzer.models import ApostaGerada
+from lotofacil_analyzer.tests.armazem import isolar_armazem
 
-# Create your tests here.
+
+@override_settings(LOTOFACIL_HISTORICO_POR_PAGINA=3)
+class HistoricoJogosTests(TestCase):
+    """Paginação keyset do histórico de apostas"""
+
+    def setUp(self):
+        isolar_armazem(self)
+        self.ana = User.objects.create_user('ana')
+        self.bia = User.objects.create_user('bia')
+        self.apostas = [self.criar(self.ana, inicio) for inicio in range(1, 9)]
+        self.criar(self.bia, 1)
+        # Datas repetidas: o desempate pelo id precisa manter a ordem entre as páginas
+        ApostaGerada.objects.filter(pk__in=[a.pk for a in self.apostas[2:6]]).update(data_geracao=timezone.now())
+        self.client.force_login(self.ana)
+
+    def criar(self, usuario, inicio):
+        return ApostaGerada.objects.create(
+            usuario=usuario, numeros=','.join(map(str, range(inicio, inicio + 15))),
+            metodo_geracao='aleatorio',
+        )
+
+    def pagina(self, antes=None):
+        response = self.client.get(reverse('historico'), {'antes': antes} if antes else {})
+        self.assertEqual(response.status_code, 200)
+        return [jogo['pk'] for jogo in response.context['jogos']], response.context['proximo']
+
+    def todas_as_paginas(self):
+        vistas, proximo = self.pagina()
+        while proximo:
+            pks, proximo = self.pagina(proximo)
+            vistas += pks
+        return vistas
+
+    def test_percorre_todas_as_apostas(self):
+        esperadas = list(
+            self.ana.apostas_geradas.order_by('-data_geracao', '-pk').values_list('pk', flat=True)
+        )
+        self.assertEqual(self.todas_as_paginas(), esperadas)
+        self.assertEqual(len(esperadas), len(self.apostas))
+
+    def test_aposta_de_referencia_apagada(self):
+        primeira, proximo = self.pagina()
+        ApostaGerada.objects.filter(pk=primeira[-1]).delete()
+        segunda, _ = self.pagina(proximo)
+        # Continua de onde parou em vez de voltar à primeira página
+        self.assertTrue(segunda)
+        self.assertFalse(set(primeira) & set(segunda))
+
+    def test_cursor_de_outro_usuario(self):
+        _, proximo = self.pagina()
+        self.client.force_login(self.bia)
+        pks, _ = self.pagina(proximo)
+        self.assertTrue(set(pks) <= set(self.bia.apostas_geradas.values_list('pk', flat=True)))
+
+    def test_cursor_invalido(self):
+        for cursor in ('123', 'abc_1', '1_2_3', '9' * 30 + '_1'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('historico'), {'antes': cursor})
+                self.assertEqual(response.status_code, 400)
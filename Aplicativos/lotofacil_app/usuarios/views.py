@@ -2,9 +2,22 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.decorators import login_required
-from lotofacil_analyzer.models import ApostaGerada  # Importe o modelo correto do seu app
+from django.conf import settings
+from django.db.models import Q
+from django.http import HttpResponseBadRequest
+from lotofacil_analyzer.cache import geracao_atual
+from lotofacil_analyzer.conferencia import conferir_historico
+from lotofacil_analyzer.data.bitmask import NUMEROS_POR_SORTEIO, TOTAL_NUMEROS
 from django.contrib import messages
 from .forms import RegistroForm
+from datetime import datetime, timedelta, timezone
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_EPOCA = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSSEGUNDO = timedelta(microseconds=1)
 
 def registrar_usuario(request):
     if request.method == "POST":
@@ -35,7 +48,7 @@ def login_usuario(request):
             return redirect("home")
         else:
             messages.error(request, "Usuário ou senha incorretos. Tente novamente.")
-            print("Erro de login: Usuário ou senha incorretos")  # Debug
+            logger.info("Falha de login para o usuário %r", request.POST.get('username'))
 
     else:
         form = AuthenticationForm()
@@ -46,7 +59,94 @@ def logout_usuario(request):
     logout(request)
     return redirect("login")
 
+def _codificar_cursor(data_geracao, pk):
+    """Cursor da paginação: ``<microssegundos desde a época>_<id>`` da última aposta da página."""
+    return f'{(data_geracao - _EPOCA) // _MICROSSEGUNDO}_{pk}'
+
+
+def _decodificar_cursor(cursor):
+    """
+    Converte o cursor de ``_codificar_cursor`` de volta em (data_geracao, id).
+
+    Raises:
+        ValueError: Se o cursor for malformado
+    """
+    microssegundos, pk = cursor.split('_')
+    return _EPOCA + int(microssegundos) * _MICROSSEGUNDO, int(pk)
+
+
+def _pagina_historico(usuario, antes, tamanho):
+    """
+    Busca uma página do histórico por paginação keyset sobre (data_geracao, id).
+
+    O cursor carrega a própria chave, então continua válido mesmo que a aposta
+    de referência tenha sido apagada.
+
+    Args:
+        usuario (User): Dono das apostas
+        antes (tuple, optional): (data_geracao, id) da última aposta da página anterior
+        tamanho (int): Apostas por página
+
+    Returns:
+        tuple: (lista de apostas da página, cursor da próxima página ou None)
+    """
+    consulta = usuario.apostas_geradas.order_by('-data_geracao', '-pk')
+    if antes is not None:
+        referencia, pk = antes
+        consulta = consulta.filter(
+            Q(data_geracao__lt=referencia) | Q(data_geracao=referencia, pk__lt=pk)
+        )
+
+    # Um item a mais indica se existe próxima página
+    linhas = list(consulta.values('pk', 'data_geracao', 'numeros', 'mascara', 'metodo_geracao')[:tamanho + 1])
+    if len(linhas) > tamanho:
+        ultima = linhas[tamanho - 1]
+        proximo = _codificar_cursor(ultima['data_geracao'], ultima['pk'])
+    else:
+        proximo = None
+    return linhas[:tamanho], proximo
+
+
+def _anotar_acertos(jogos):
+    """
+    Anota os acertos de cada aposta da página contra o histórico de sorteios.
+
+    A página inteira é conferida em uma única operação vetorizada sobre as
+    máscaras gravadas em ``ApostaGerada.mascara``. Apostas com máscara
+    inválida ficam sem anotação em vez de derrubar a página.
+
+    Returns:
+        int | None: Último concurso considerado, ou None sem dados publicados
+    """
+    validos = [
+        jogo for jogo in jogos
+        if 0 < jogo['mascara'] < 1 << TOTAL_NUMEROS and jogo['mascara'].bit_count() == NUMEROS_POR_SORTEIO
+    ]
+    if not validos:
+        return None
+    try:
+        geracao_atual()
+        resultado = conferir_historico(np.array([jogo['mascara'] for jogo in validos], dtype=np.uint32))
+    except FileNotFoundError:
+        return None
+
+    for jogo, conferencia in zip(validos, resultado['apostas']):
+        jogo.update(conferencia)
+    return resultado['ultimo_concurso']
+
+
 @login_required
 def historico_jogos(request):
-    jogos = JogoGerado.objects.filter(usuario=request.user).order_by("-data_geracao")  # Pega os jogos do usuário logado
-    return render(request, "usuarios/historico.html", {"jogos": jogos})
+    tamanho = getattr(settings, 'LOTOFACIL_HISTORICO_POR_PAGINA', 50)
+    try:
+        antes = _decodificar_cursor(request.GET['antes']) if request.GET.get('antes') else None
+    except (ValueError, OverflowError):
+        return HttpResponseBadRequest("Cursor de paginação inválido.")
+
+    jogos, proximo = _pagina_historico(request.user, antes, tamanho)
+    ultimo_concurso = _anotar_acertos(jogos)
+    return render(request, "usuarios/historico.html", {
+        "jogos": jogos,
+        "proximo": proximo,
+        "ultimo_concurso": ultimo_concurso,
+    })